@@ -1,7 +1,11 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import sqlite3
 import os
+import sys
+
+# Módulos compartilhados com app.py e backend/app.py (pool de conexões)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from comum import banco  # noqa: E402
 
 app = Flask(__name__)
 CORS(app)
@@ -9,10 +13,12 @@ CORS(app)
 # Database path
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'gestao_escolar.db')
 
+db_pool = banco.ConnectionPool(DB_PATH, banco.DB_POOL_SIZE)
+banco.init_app(app)
+
 def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    # Uma conexão por requisição, devolvida ao pool no teardown (comum/banco.py)
+    return banco.request_connection(db_pool)
 
 # ============ ALUNOS (STUDENTS) ROUTES ============
 
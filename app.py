@@ -5,21 +5,21 @@ Servidor único que combina API Flask + Servidor de arquivos estáticos
 """
 
 import os
+import re
 import sys
 import time
 import threading
+import email.utils
 import webbrowser
 from pathlib import Path
 import subprocess
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-import socketserver
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 
 # Importar Flask e dependências
 try:
     from flask import Flask, jsonify, request, send_from_directory
     from flask_cors import CORS
     from functools import wraps
-    import sqlite3
     from datetime import datetime
 except ImportError:
     print("📦 Instalando dependências...")
@@ -27,9 +27,11 @@ except ImportError:
     from flask import Flask, jsonify, request, send_from_directory
     from flask_cors import CORS
     from functools import wraps
-    import sqlite3
     from datetime import datetime
 
+from comum import banco, compressao
+from comum.filtros import month_args
+
 app = Flask(__name__)
 CORS(app)
 
@@ -40,10 +42,16 @@ API_PORT = 5000
 
 # ============ CONFIGURAÇÃO DO BANCO DE DADOS ============
 
+db_pool = banco.ConnectionPool(DATABASE, banco.DB_POOL_SIZE)
+banco.init_app(app)
+
 def get_db():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    return conn
+    # Uma conexão por requisição, devolvida ao pool no teardown (comum/banco.py)
+    return banco.request_connection(db_pool)
+
+# ============ COMPRESSÃO DAS RESPOSTAS ============
+
+compressao.init_app(app)
 
 def init_db():
     """Inicializa o banco de dados se não existir"""
@@ -481,12 +489,15 @@ def get_atividades():
 # CRUD Eventos
 @app.route('/api/eventos', methods=['GET'])
 def get_eventos():
+    try:
+        intervalo = month_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     conn = get_db()
     cursor = conn.cursor()
     
     # Parâmetros de filtro
-    mes = request.args.get('mes')
-    ano = request.args.get('ano')
     tipo = request.args.get('tipo')
     
     query = '''
@@ -498,9 +509,9 @@ def get_eventos():
     '''
     params = []
     
-    if mes and ano:
-        query += ' AND strftime("%m", e.data_inicio) = ? AND strftime("%Y", e.data_inicio) = ?'
-        params.extend([f'{int(mes):02d}', ano])
+    if intervalo:
+        query += ' AND e.data_inicio >= ? AND e.data_inicio < ?'
+        params.extend(intervalo)
     
     if tipo:
         query += ' AND e.tipo = ?'
@@ -527,7 +538,7 @@ def get_eventos_proximos():
                FROM eventos e 
                LEFT JOIN turmas t ON e.turma_id = t.id 
                LEFT JOIN professores p ON e.professor_id = p.id 
-               WHERE e.status = "ativo" AND date(e.data_inicio) >= date('now')
+               WHERE e.status = "ativo" AND e.data_inicio >= date('now')
                ORDER BY e.data_inicio, e.hora_inicio 
                LIMIT 5'''
         ).fetchall()
@@ -648,19 +659,204 @@ def serve_static(filename):
 
 # ============ SERVIDOR INTEGRADO ============
 
-class QuietHTTPRequestHandler(SimpleHTTPRequestHandler):
-    """Handler HTTP que não imprime logs desnecessários"""
+# Build de produção gerado por gerar-assets.py; quando existe, tem prioridade sobre a raiz
+STATIC_BUILD_DIR = os.environ.get('STATIC_BUILD_DIR', 'dist')
+STATIC_BUILD_MANIFEST = 'manifest.json'
+# Arquivos com hash no nome (ex.: app.3f9a2c1b.js) nunca mudam: cache de longa duração
+FINGERPRINT_RE = re.compile(r'\.[0-9a-f]{8,}\.[A-Za-z0-9]+$')
+STATIC_IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+# Demais arquivos são revalidados a cada uso (ETag/Last-Modified, resposta 304)
+STATIC_DEFAULT_CACHE = 'no-cache'
+# Versões pré-comprimidas procuradas ao lado do original, por ordem de preferência
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+class StaticFileHandler(SimpleHTTPRequestHandler):
+    """Arquivos estáticos com cache HTTP, versões .br/.gz, Range e sendfile"""
+    protocol_version = 'HTTP/1.1'  # conexões persistentes
+
     def log_message(self, format, *args):
         pass  # Silenciar logs do servidor de arquivos
 
+    def translate_path(self, path):
+        caminho = super().translate_path(path)
+        build = os.path.join(self.directory, STATIC_BUILD_DIR)
+        if os.path.isfile(os.path.join(build, STATIC_BUILD_MANIFEST)):
+            gerado = os.path.join(build, os.path.relpath(caminho, self.directory))
+            if os.path.exists(gerado):
+                return gerado
+        return caminho
+
+    def do_GET(self):
+        self.serve_file(send_body=True)
+
+    def do_HEAD(self):
+        self.serve_file(send_body=False)
+
+    def serve_file(self, send_body):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split('?', 1)[0].endswith('/'):
+            for indice in ('index.html', 'index.htm'):
+                if os.path.isfile(os.path.join(path, indice)):
+                    path = os.path.join(path, indice)
+                    break
+        if not os.path.isfile(path):
+            # Diretórios (redirecionamento, index.html) e 404 ficam com o handler padrão
+            arquivo = self.send_head()
+            if arquivo:
+                try:
+                    if send_body:
+                        self.copyfile(arquivo, self.wfile)
+                finally:
+                    arquivo.close()
+            return
+
+        content_type = self.guess_type(path)
+        encoding = None
+        aceitas = self.headers.get('Accept-Encoding', '')
+        if 'Range' not in self.headers:
+            for nome, sufixo in PRECOMPRESSED:
+                # Só usa a versão comprimida se ela for mais nova que o original
+                if (nome in aceitas and os.path.isfile(path + sufixo)
+                        and os.path.getmtime(path + sufixo) >= os.path.getmtime(path)):
+                    encoding, path = nome, path + sufixo
+                    break
+
+        try:
+            arquivo = open(path, 'rb')
+        except OSError:
+            self.send_error(404, "File not found")
+            return
+
+        with arquivo:
+            stat = os.fstat(arquivo.fileno())
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{"-" + encoding if encoding else ""}"'
+            last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+            nome = os.path.basename(path if encoding is None else path[:path.rfind('.')])
+            cache = STATIC_IMMUTABLE_CACHE if FINGERPRINT_RE.search(nome) else STATIC_DEFAULT_CACHE
+
+            if self.not_modified(etag, stat.st_mtime):
+                self.send_response(304)
+                self.send_cache_headers(etag, last_modified, cache)
+                self.end_headers()
+                return
+
+            inicio, tamanho = 0, stat.st_size
+            intervalo = self.parse_range(stat.st_size, etag, stat.st_mtime)
+            if intervalo == 'invalido':
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{stat.st_size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if intervalo:
+                inicio, fim = intervalo
+                tamanho = fim - inicio + 1
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {inicio}-{fim}/{stat.st_size}')
+            else:
+                self.send_response(200)
+
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(tamanho))
+            self.send_header('Accept-Ranges', 'bytes')
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.send_cache_headers(etag, last_modified, cache)
+            self.end_headers()
+
+            if send_body and tamanho:
+                # socket.sendfile usa os.sendfile quando disponível (cópia pelo kernel)
+                self.connection.sendfile(arquivo, inicio, tamanho)
+
+    def send_cache_headers(self, etag, last_modified, cache):
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.send_header('Cache-Control', cache)
+        self.send_header('Vary', 'Accept-Encoding')
+
+    def not_modified(self, etag, mtime):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+            return etag in tags or '*' in tags
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                desde = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= desde
+        return False
+
+    def parse_range(self, tamanho_total, etag, mtime):
+        """Retorna (início, fim) de um Range de intervalo único, 'invalido' ou None"""
+        cabecalho = self.headers.get('Range')
+        if not cabecalho:
+            return None
+        if_range = self.headers.get('If-Range')
+        if if_range and if_range.strip() != etag and if_range.strip() != email.utils.formatdate(mtime, usegmt=True):
+            return None  # Arquivo mudou: envia o arquivo inteiro
+        match = RANGE_RE.match(cabecalho.strip())
+        if not match or match.groups() == ('', ''):
+            return None  # Múltiplos intervalos ou formato desconhecido: arquivo inteiro
+        primeiro, ultimo = match.groups()
+        if primeiro == '':
+            inicio = max(tamanho_total - int(ultimo), 0)
+            fim = tamanho_total - 1
+        else:
+            inicio = int(primeiro)
+            fim = min(int(ultimo), tamanho_total - 1) if ultimo else tamanho_total - 1
+        if inicio >= tamanho_total or inicio > fim:
+            return 'invalido'
+        return inicio, fim
+
+class StaticServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
 def start_static_server():
-    """Inicia servidor de arquivos estáticos em thread separada"""
+    """Inicia servidor de arquivos estáticos em thread separada (uma thread por conexão)"""
     try:
-        with socketserver.TCPServer(("", STATIC_PORT), QuietHTTPRequestHandler) as httpd:
+        with StaticServer(("", STATIC_PORT), StaticFileHandler) as httpd:
             httpd.serve_forever()
     except Exception as e:
         print(f"⚠️  Erro no servidor estático: {e}")
 
+# ============ SERVIDOR DE PRODUÇÃO ============
+
+# `python app.py --producao`: esta mesma API, sobre o mesmo escola.db, com gunicorn
+# (vários processos com threads). Ela roda em um processo à parte: os workers do
+# gunicorn não herdam a thread nem o socket do servidor estático deste processo.
+# As variáveis são as mesmas do `backend/app.py serve`
+SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', min((os.cpu_count() or 1) * 2 + 1, 8)))
+SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 4))
+
+def run_production_server():
+    """Serve `app:app` com gunicorn na porta da API até ele terminar"""
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        print("⚠️  gunicorn não encontrado (pip install gunicorn): usando um único processo com threads")
+        app.run(debug=False, port=API_PORT, host='0.0.0.0', threaded=True)
+        return
+    
+    comando = [
+        sys.executable, '-m', 'gunicorn', 'app:app',
+        '--bind', os.environ.get('SERVER_BIND', f'0.0.0.0:{API_PORT}'),
+        '--workers', str(SERVER_WORKERS), '--threads', str(SERVER_THREADS)
+    ]
+    print(f"🏭 Modo de produção: {SERVER_WORKERS} workers × {SERVER_THREADS} threads")
+    # No diretório deste arquivo: o mesmo app.py e o mesmo escola.db do modo normal
+    processo = subprocess.Popen(comando, cwd=Path(__file__).resolve().parent)
+    try:
+        processo.wait()
+    except KeyboardInterrupt:
+        # Encerramento gracioso do gunicorn (SIGTERM), que também recebe o Ctrl+C do terminal
+        processo.terminate()
+        processo.wait()
+        raise
+
 def main():
     print("🎓 Iniciando Sistema de Gestão Escolar Integrado...")
     
@@ -690,8 +886,11 @@ def main():
     print("\n⚠️  Pressione Ctrl+C para parar o sistema")
     
     try:
-        # Iniciar servidor Flask (API)
-        app.run(debug=False, port=API_PORT, host='0.0.0.0')
+        # Iniciar servidor Flask (API); --producao usa vários processos
+        if '--producao' in sys.argv:
+            run_production_server()
+        else:
+            app.run(debug=False, port=API_PORT, host='0.0.0.0')
     except KeyboardInterrupt:
         print("\n🛑 Parando sistema...")
         print("✅ Sistema parado com sucesso!")
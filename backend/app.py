@@ -1,9 +1,30 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, g, has_request_context, stream_with_context
 from flask_cors import CORS
 from functools import wraps
 import sqlite3
-from datetime import datetime
+from datetime import MAXYEAR, date, datetime, timedelta, timezone
 import os
+import re
+import sys
+import json
+import logging
+import logging.handlers
+import base64
+import hashlib
+import hmac
+import itertools
+import random
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+# Módulos compartilhados com app.py e api/app.py (pool de conexões, compressão, filtros)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from comum import banco, compressao  # noqa: E402
+from comum.banco import DB_POOL_SIZE  # noqa: E402
+from comum.filtros import month_args, month_range  # noqa: E402,F401
 
 app = Flask(__name__)
 CORS(app)
@@ -43,19 +64,200 @@ PERMISSIONS = {
     ]
 }
 
+# ============ TOKENS DE SESSÃO ============
+
+# O login emite um token assinado (HMAC-SHA256) com id, cargo e expiração;
+# as rotas conferem a assinatura sem consultar o banco
+AUTH_TOKEN_TTL = int(os.environ.get('AUTH_TOKEN_TTL', 12 * 60 * 60))
+# Situação (status, cargo) dos usuários autenticados, mantida em memória
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', 1024))
+AUTH_CACHE_TTL = float(os.environ.get('AUTH_CACHE_TTL', 30))
+
+_auth_secret = None
+_auth_secret_lock = threading.Lock()
+
+def get_auth_secret():
+    """Chave dos tokens: AUTH_SECRET ou um arquivo gerado ao lado do banco.
+
+    O arquivo é criado uma única vez (os workers do servidor de produção
+    disputam a criação e todos acabam lendo a mesma chave), então os tokens
+    continuam válidos entre processos e depois de reiniciar a API.
+    """
+    global _auth_secret
+    if _auth_secret is not None:
+        return _auth_secret
+    
+    with _auth_secret_lock:
+        if _auth_secret is not None:
+            return _auth_secret
+        if os.environ.get('AUTH_SECRET'):
+            _auth_secret = os.environ['AUTH_SECRET'].encode('utf-8')
+            return _auth_secret
+        
+        caminho = DATABASE + '.secret'
+        if not os.path.exists(caminho):
+            temporario = f'{caminho}.{os.getpid()}.tmp'
+            with open(temporario, 'w', encoding='ascii') as f:
+                f.write(os.urandom(32).hex())
+            try:
+                os.chmod(temporario, 0o600)
+                os.link(temporario, caminho)  # Falha se outro processo criou antes
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(temporario)
+        with open(caminho, 'r', encoding='ascii') as f:
+            _auth_secret = f.read().strip().encode('ascii')
+        return _auth_secret
+
+def _b64url(dados):
+    return base64.urlsafe_b64encode(dados).rstrip(b'=').decode('ascii')
+
+def _b64url_decode(texto):
+    return base64.urlsafe_b64decode(texto + '=' * (-len(texto) % 4))
+
+def _sign(payload):
+    return hmac.new(get_auth_secret(), payload.encode('ascii'), hashlib.sha256).digest()
+
+def issue_token(user_id, cargo, ttl=None):
+    """Retorna '<payload>.<assinatura>' em base64url"""
+    dados = {'sub': user_id, 'cargo': cargo, 'exp': int(time.time()) + (ttl or AUTH_TOKEN_TTL)}
+    payload = _b64url(json.dumps(dados, separators=(',', ':')).encode('utf-8'))
+    return f'{payload}.{_b64url(_sign(payload))}'
+
+def verify_token(token):
+    """Retorna o conteúdo do token, ou None se a assinatura não confere ou ele expirou"""
+    try:
+        payload, assinatura = token.split('.')
+        if not hmac.compare_digest(_sign(payload), _b64url_decode(assinatura)):
+            return None
+        dados = json.loads(_b64url_decode(payload))
+    except ValueError:
+        return None
+    if dados.get('exp', 0) < time.time():
+        return None
+    return dados
+
+class LRUCache:
+    """Cache LRU em memória com validade por entrada, seguro entre threads.
+
+    Cada processo do servidor de produção tem o seu: invalidações feitas num
+    processo chegam aos demais quando a entrada expira (após `ttl` segundos).
+    """
+
+    def __init__(self, tamanho, ttl):
+        self.tamanho = tamanho
+        self.ttl = ttl
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        agora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return None
+            if entrada[0] <= agora:
+                del self._entradas[chave]
+                return None
+            self._entradas.move_to_end(chave)
+            return entrada[1]
+
+    def put(self, chave, valor):
+        with self._lock:
+            self._entradas[chave] = (time.monotonic() + self.ttl, valor)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.tamanho:
+                self._entradas.popitem(last=False)
+
+    def invalidate(self, chave):
+        with self._lock:
+            self._entradas.pop(chave, None)
+
+    def clear(self):
+        with self._lock:
+            self._entradas.clear()
+
+# Situação (status, cargo) por usuário: evita consultar `usuarios` a cada requisição;
+# update_usuario e delete_usuario invalidam a entrada
+user_status_cache = LRUCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+# Turmas de cada professor (por id de usuário): limpo quando turmas.professor_id
+# ou o vínculo usuário/professor (e-mail) pode ter mudado
+professor_turmas_cache = LRUCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+
+def user_status(user_id):
+    """(status, cargo) do usuário; ('removido', None) se ele não existe mais"""
+    situacao = user_status_cache.get(user_id)
+    if situacao is None:
+        conn = get_db()
+        usuario = conn.execute('SELECT status, cargo FROM usuarios WHERE id = ?', (user_id,)).fetchone()
+        conn.close()
+        situacao = (usuario['status'], usuario['cargo']) if usuario else ('removido', None)
+        user_status_cache.put(user_id, situacao)
+    return situacao
+
+def authenticate():
+    """Confere o token Bearer da requisição; retorna (user_id, cargo) ou None.
+
+    O token deixa de valer se o usuário foi desativado, excluído ou mudou de cargo.
+    """
+    if 'auth_user' in g:
+        return g.auth_user
+    
+    usuario = None
+    cabecalho = request.headers.get('Authorization', '')
+    if cabecalho.startswith('Bearer '):
+        dados = verify_token(cabecalho[7:].strip())
+        if dados:
+            status, cargo = user_status(dados['sub'])
+            if status == 'ativo' and cargo == dados['cargo']:
+                usuario = (dados['sub'], cargo)
+    g.auth_user = usuario
+    return usuario
+
+# Cargos que só enxergam as turmas em que lecionam ("Apenas de suas turmas")
+SCOPED_CARGOS = {'professor'}
+
+def professor_turmas(user_id):
+    """Ids das turmas do professor ligado ao usuário (mesmo e-mail em `professores`)"""
+    turmas = professor_turmas_cache.get(user_id)
+    if turmas is None:
+        conn = get_db()
+        rows = conn.execute(
+            '''SELECT t.id FROM usuarios u
+               JOIN professores p ON p.email = u.email
+               JOIN turmas t ON t.professor_id = p.id
+               WHERE u.id = ?''',
+            (user_id,)
+        ).fetchall()
+        conn.close()
+        turmas = frozenset(row[0] for row in rows)
+        professor_turmas_cache.put(user_id, turmas)
+    return turmas
+
+def turma_scope(coluna):
+    """Condição que limita `coluna` às turmas permitidas na requisição: (sql, params).
+
+    Vazia para cargos sem restrição; require_permission define as turmas.
+    """
+    turmas = g.get('turmas_permitidas')
+    if turmas is None:
+        return '', []
+    if not turmas:
+        return ' AND 0', []
+    return f" AND {coluna} IN ({', '.join('?' * len(turmas))})", sorted(turmas)
+
 # Decorator para verificar autenticação
 def require_auth(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        user_id = request.headers.get('X-User-Id')
-        user_cargo = request.headers.get('X-User-Cargo')
+        usuario = authenticate()
         
-        if not user_id or not user_cargo:
+        if not usuario:
             return jsonify({'error': 'Autenticação necessária'}), 401
         
         # Adicionar informações do usuário ao request
-        request.user_id = user_id
-        request.user_cargo = user_cargo
+        request.user_id, request.user_cargo = usuario
         
         return f(*args, **kwargs)
     return decorated_function
@@ -65,10 +267,11 @@ def require_permission(permission):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            user_cargo = request.headers.get('X-User-Cargo')
+            usuario = authenticate()
             
-            if not user_cargo:
+            if not usuario:
                 return jsonify({'error': 'Autenticação necessária'}), 401
+            user_cargo = usuario[1]
             
             # Admin e diretor têm acesso total
             if user_cargo in ['admin', 'diretor']:
@@ -79,36 +282,256 @@ def require_permission(permission):
             if permission not in user_permissions:
                 return jsonify({'error': 'Acesso negado. Você não tem permissão para esta ação.'}), 403
             
+            # Professores: as rotas filtram pelas turmas dele (turma_scope)
+            if user_cargo in SCOPED_CARGOS:
+                g.turmas_permitidas = professor_turmas(usuario[0])
+            
             return f(*args, **kwargs)
         return decorated_function
     return decorator
 
 DATABASE = 'escola.db'
 
+# Log de consultas lentas: comandos acima de SLOW_QUERY_MS (negativo desativa), com o
+# plano de execução, em JSON (um por linha) num arquivo rotativo
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+SLOW_QUERY_SECONDS = SLOW_QUERY_MS / 1000
+SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG', 'slow-queries.log')
+SLOW_QUERY_LOG_BYTES = int(os.environ.get('SLOW_QUERY_LOG_BYTES', 5 * 1024 * 1024))
+SLOW_QUERY_LOG_BACKUPS = int(os.environ.get('SLOW_QUERY_LOG_BACKUPS', 3))
+# Varreduras completas destas tabelas (as maiores) são marcadas com alerta
+SLOW_QUERY_SCAN_TABLES = ('notas', 'frequencia', 'matriculas')
+
+_SQL_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SQL_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)', re.IGNORECASE)
+_PLAN_SCAN_RE = re.compile(r'^SCAN (\w+)')
+_SQL_TABLE_ALIAS_RE = re.compile(
+    r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!(?:WHERE|ON|USING|JOIN|LEFT|INNER|CROSS|NATURAL'
+    r'|GROUP|ORDER|LIMIT|UNION|HAVING|WINDOW)\b)(\w+))?',
+    re.IGNORECASE
+)
+
+def normalize_sql(sql):
+    """SQL sem literais e espaços extras: variantes que só mudam nos valores se agrupam"""
+    sql = ' '.join(_SQL_LITERAL_RE.sub('?', sql).split())
+    return _SQL_IN_LIST_RE.sub('IN (?, ...)', sql)
+
+def table_aliases(sql):
+    """{apelido: tabela} do FROM/JOIN de `sql` (o plano de execução cita as tabelas pelo apelido)"""
+    return {apelido or tabela: tabela for tabela, apelido in _SQL_TABLE_ALIAS_RE.findall(sql)}
+
+def parameter_shapes(params):
+    """Tipos dos parâmetros (os valores não vão para o log)"""
+    if isinstance(params, dict):
+        return {nome: type(valor).__name__ for nome, valor in params.items()}
+    return [type(valor).__name__ for valor in params]
+
+class SlowQueryLog:
+    """Comandos lentos com SQL normalizado, parâmetros, duração, rota e plano"""
+
+    def __init__(self, caminho, max_bytes, backups):
+        self.caminho = caminho
+        self.backups = backups
+        self.recentes = deque(maxlen=1000)  # Deste processo, se não houver arquivo
+        self._logger = logging.getLogger('escola.slow_queries')
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        if caminho and not self._logger.handlers:
+            handler = logging.handlers.RotatingFileHandler(
+                caminho, maxBytes=max_bytes, backupCount=backups, encoding='utf-8', delay=True
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self._logger.addHandler(handler)
+
+    def record(self, conn, sql, params, segundos):
+        try:
+            # Connection.execute da classe base: cursor comum, fora da instrumentação
+            plano = [row[3] for row in sqlite3.Connection.execute(conn, 'EXPLAIN QUERY PLAN ' + sql, params)]
+        except sqlite3.Error as e:
+            plano = [f'(plano indisponível: {e})']
+        # Tabelas percorridas por inteiro (direto ou por um índice inteiro)
+        apelidos = table_aliases(sql)
+        varreduras = sorted({
+            apelidos.get(match.group(1), match.group(1)) for match in map(_PLAN_SCAN_RE.match, plano) if match
+        })
+        rota = None
+        if has_request_context() and request.url_rule is not None:
+            rota = f'{request.method} {request.url_rule.rule}'
+        
+        entrada = {
+            'quando': datetime.now().isoformat(timespec='seconds'),
+            'duracao_ms': round(segundos * 1000, 2),
+            'sql': normalize_sql(sql),
+            'parametros': parameter_shapes(params),
+            'rota': rota,
+            'plano': plano,
+            'varreduras': varreduras,
+            'alerta': any(tabela in SLOW_QUERY_SCAN_TABLES for tabela in varreduras),
+            'pid': os.getpid()
+        }
+        self.recentes.append(entrada)
+        self._logger.info(json.dumps(entrada, ensure_ascii=False))
+
+    def read(self):
+        """Registros do arquivo (comum a todos os workers), do mais antigo ao mais novo"""
+        if not self.caminho:
+            return list(self.recentes)
+        
+        entradas = []
+        arquivos = [f'{self.caminho}.{n}' for n in range(self.backups, 0, -1)] + [self.caminho]
+        for arquivo in arquivos:
+            try:
+                with open(arquivo, 'r', encoding='utf-8') as f:
+                    for linha in f:
+                        try:
+                            entradas.append(json.loads(linha))
+                        except ValueError:
+                            continue  # Linha cortada por uma rotação concorrente
+            except FileNotFoundError:
+                continue
+        return entradas
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_LOG, SLOW_QUERY_LOG_BYTES, SLOW_QUERY_LOG_BACKUPS)
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor que soma na conexão quantos comandos SQL rodaram e o tempo gasto.
+
+    O tempo inclui execute e fetch*; linhas lidas iterando o cursor não entram.
+    Comandos acima de SLOW_QUERY_MS vão para o log de consultas lentas.
+    """
+    _sql = None
+    _params = None
+    _segundos = 0.0
+
+    def _medir(self, inicio, concluido=True):
+        segundos = time.perf_counter() - inicio
+        self.connection.sql_seconds += segundos
+        if self._sql is not None:
+            self._segundos += segundos
+            if concluido or self._segundos >= SLOW_QUERY_SECONDS:
+                self._concluir()
+
+    def _concluir(self):
+        sql, self._sql = self._sql, None
+        if 0 <= SLOW_QUERY_SECONDS <= self._segundos:
+            slow_query_log.record(self.connection, sql, self._params, self._segundos)
+
+    def execute(self, sql, parameters=()):
+        if self._sql is not None:
+            self._concluir()  # Comando anterior lido iterando o cursor
+        self._sql, self._params, self._segundos = sql, parameters, 0.0
+        self.connection.sql_statements += 1
+        inicio = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            # Um SELECT termina quando as linhas são lidas (fetch*)
+            self._medir(inicio, concluido=self.description is None)
+
+    def executemany(self, sql, seq_of_parameters):
+        if self._sql is not None:
+            self._concluir()
+        # O primeiro conjunto de parâmetros serve de amostra para o log
+        seq_of_parameters = iter(seq_of_parameters)
+        primeiro = next(seq_of_parameters, None)
+        if primeiro is not None:
+            seq_of_parameters = itertools.chain([primeiro], seq_of_parameters)
+        self._sql, self._params, self._segundos = sql, primeiro or (), 0.0
+        self.connection.sql_statements += 1
+        inicio = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._medir(inicio)
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._medir(inicio)
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        linhas = []
+        inicio = time.perf_counter()
+        try:
+            linhas = super().fetchmany(size)
+            return linhas
+        finally:
+            # Leitura em lotes: o comando termina quando um lote vem incompleto
+            self._medir(inicio, concluido=len(linhas) < size)
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._medir(inicio)
+
+class PooledConnection(banco.PooledConnection):
+    """Conexão do pool (comum/banco.py) com os cursores instrumentados"""
+    versoes_cache = None
+    # Custo do SQL desde o início da requisição atual (InstrumentedCursor)
+    sql_statements = 0
+    sql_seconds = 0.0
+
+    def start_request(self):
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or InstrumentedCursor)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+class ConnectionPool(banco.ConnectionPool):
+    connection_class = PooledConnection
+    # Recebe o SQL executado por todas as conexões abertas a partir daí (explain_route_queries)
+    trace_callback = None
+
+    def _connect(self):
+        conn = super()._connect()
+        if self.trace_callback is not None:
+            conn.set_trace_callback(self.trace_callback)
+        return conn
+
+db_pool = ConnectionPool(DATABASE, DB_POOL_SIZE)
+banco.init_app(app)
+
 def get_db():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    return conn
+    # Uma conexão por requisição, devolvida ao pool no teardown (comum/banco.py)
+    return banco.request_connection(db_pool)
 
-def init_db():
-    # Só remove o banco se não existir ou se for explicitamente solicitado
-    # Para preservar dados existentes
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # Verificar se as tabelas já existem
-    tables_exist = cursor.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='alunos'"
-    ).fetchone()
-    
-    if tables_exist:
-        print("📊 Banco de dados já existe. Mantendo dados existentes.")
-        conn.close()
-        return
-    
-    # Criar tabelas
+# ============ COMPRESSÃO DAS RESPOSTAS ============
+
+compressao.init_app(app)
+
+# ============ MIGRAÇÕES DO ESQUEMA ============
+# Cada alteração de esquema é um passo numerado aplicado uma única vez por banco.
+# A versão atual fica registrada na tabela schema_version.
+
+MIGRATIONS = []
+
+def migration(version, descricao):
+    """Registra um passo de migração; as versões devem ser crescentes e únicas"""
+    def decorator(f):
+        if any(v == version for v, _, _ in MIGRATIONS):
+            raise ValueError(f'Migração {version} registrada mais de uma vez')
+        MIGRATIONS.append((version, descricao, f))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return f
+    return decorator
+
+@migration(1, 'Esquema inicial')
+def migration_001(cursor):
+    # IF NOT EXISTS: bancos criados antes das migrações já possuem estas tabelas
     cursor.execute('''
-        CREATE TABLE alunos (
+        CREATE TABLE IF NOT EXISTS alunos (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nome TEXT NOT NULL,
             email TEXT UNIQUE NOT NULL,
@@ -119,10 +542,10 @@ def init_db():
             status TEXT DEFAULT 'ativo',
             created_at TEXT DEFAULT CURRENT_TIMESTAMP
         )
-    ''')
+        ''')
     
     cursor.execute('''
-        CREATE TABLE professores (
+        CREATE TABLE IF NOT EXISTS professores (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nome TEXT NOT NULL,
             email TEXT UNIQUE NOT NULL,
@@ -132,10 +555,10 @@ def init_db():
             status TEXT DEFAULT 'ativo',
             created_at TEXT DEFAULT CURRENT_TIMESTAMP
         )
-    ''')
+        ''')
     
     cursor.execute('''
-        CREATE TABLE turmas (
+        CREATE TABLE IF NOT EXISTS turmas (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nome TEXT NOT NULL,
             ano TEXT NOT NULL,
@@ -147,10 +570,10 @@ def init_db():
             created_at TEXT DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (professor_id) REFERENCES professores(id)
         )
-    ''')
+        ''')
     
     cursor.execute('''
-        CREATE TABLE matriculas (
+        CREATE TABLE IF NOT EXISTS matriculas (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             aluno_id INTEGER NOT NULL,
             turma_id INTEGER NOT NULL,
@@ -159,10 +582,10 @@ def init_db():
             FOREIGN KEY (aluno_id) REFERENCES alunos(id),
             FOREIGN KEY (turma_id) REFERENCES turmas(id)
         )
-    ''')
+        ''')
     
     cursor.execute('''
-        CREATE TABLE notas (
+        CREATE TABLE IF NOT EXISTS notas (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             matricula_id INTEGER NOT NULL,
             disciplina TEXT NOT NULL,
@@ -171,10 +594,10 @@ def init_db():
             created_at TEXT DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (matricula_id) REFERENCES matriculas(id)
         )
-    ''')
+        ''')
     
     cursor.execute('''
-        CREATE TABLE frequencia (
+        CREATE TABLE IF NOT EXISTS frequencia (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             matricula_id INTEGER NOT NULL,
             data TEXT NOT NULL,
@@ -182,10 +605,10 @@ def init_db():
             created_at TEXT DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (matricula_id) REFERENCES matriculas(id)
         )
-    ''')
+        ''')
     
     cursor.execute('''
-        CREATE TABLE eventos (
+        CREATE TABLE IF NOT EXISTS eventos (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             titulo TEXT NOT NULL,
             descricao TEXT,
@@ -202,10 +625,10 @@ def init_db():
             FOREIGN KEY (turma_id) REFERENCES turmas(id),
             FOREIGN KEY (professor_id) REFERENCES professores(id)
         )
-    ''')
+        ''')
     
     cursor.execute('''
-        CREATE TABLE usuarios (
+        CREATE TABLE IF NOT EXISTS usuarios (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nome TEXT NOT NULL,
             email TEXT UNIQUE NOT NULL,
@@ -219,49 +642,600 @@ def init_db():
             reset_token TEXT,
             reset_expires TEXT
         )
-    ''')
+        ''')
     
-    print("📊 Criando banco de dados inicial...")
+    # Usuário administrador padrão apenas em bancos novos
+    if cursor.execute('SELECT COUNT(*) FROM usuarios').fetchone()[0] == 0:
+        cursor.execute(
+            'INSERT INTO usuarios (nome, email, cpf, telefone, cargo, senha, status) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            ('Administrador', 'admin@escola.com', '000.000.000-00', '(61) 99999-0000', 'admin', 'admin123', 'ativo')
+        )
+
+@migration(2, 'Índices secundários para junções, filtros e ordenações da API')
+def migration_002(cursor):
+    indices = [
+        # Junções matrícula -> turma/aluno (notas, frequência, boletins, relatórios)
+        'CREATE INDEX IF NOT EXISTS idx_matriculas_turma ON matriculas (turma_id, status)',
+        'CREATE INDEX IF NOT EXISTS idx_matriculas_aluno ON matriculas (aluno_id)',
+        'CREATE INDEX IF NOT EXISTS idx_matriculas_data ON matriculas (data_matricula)',
+        'CREATE INDEX IF NOT EXISTS idx_turmas_professor ON turmas (professor_id)',
+        'CREATE INDEX IF NOT EXISTS idx_turmas_nome ON turmas (nome)',
+        'CREATE INDEX IF NOT EXISTS idx_turmas_status ON turmas (status)',
+        # Notas por matrícula/disciplina/bimestre; incluir a nota torna o índice
+        # cobridor para médias e rankings, que deixam de ler a tabela
+        'CREATE INDEX IF NOT EXISTS idx_notas_matricula ON notas (matricula_id, disciplina, bimestre, nota)',
+        'CREATE INDEX IF NOT EXISTS idx_notas_disciplina ON notas (disciplina, bimestre, nota)',
+        'CREATE INDEX IF NOT EXISTS idx_notas_created ON notas (created_at)',
+        # Chamada de uma turma em um dia e filtros por período
+        'CREATE INDEX IF NOT EXISTS idx_frequencia_matricula_data ON frequencia (matricula_id, data, presente)',
+        'CREATE INDEX IF NOT EXISTS idx_frequencia_data ON frequencia (data)',
+        'CREATE INDEX IF NOT EXISTS idx_eventos_data ON eventos (data_inicio, hora_inicio)',
+        # Listagens ordenadas por nome e contagens por status do dashboard
+        'CREATE INDEX IF NOT EXISTS idx_alunos_nome ON alunos (nome)',
+        'CREATE INDEX IF NOT EXISTS idx_alunos_status ON alunos (status)',
+        'CREATE INDEX IF NOT EXISTS idx_professores_nome ON professores (nome)',
+        'CREATE INDEX IF NOT EXISTS idx_professores_status ON professores (status)',
+        'CREATE INDEX IF NOT EXISTS idx_usuarios_nome ON usuarios (nome)',
+    ]
+    for sql in indices:
+        cursor.execute(sql)
+
+# Colunas pesquisáveis pelo parâmetro search de cada listagem
+FTS_TABLES = {
+    'alunos': ['nome', 'email', 'cpf'],
+    'professores': ['nome', 'email', 'cpf', 'especializacao'],
+    'turmas': ['nome', 'ano', 'turno'],
+    'usuarios': ['nome', 'email', 'cargo'],
+}
+
+def fts_value(coluna, ref):
+    # CPF também é indexado só com dígitos, para achar "12345678900" e "123.456.789-00"
+    if coluna == 'cpf':
+        return f"{ref}.cpf || ' ' || replace(replace({ref}.cpf, '.', ''), '-', '')"
+    return f'{ref}.{coluna}'
+
+@migration(3, 'Índice de busca textual (FTS5) para alunos, professores, turmas e usuários')
+def migration_003(cursor):
+    if not cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')").fetchone()[0]:
+        print("⚠️  SQLite sem suporte a FTS5: a busca continuará usando LIKE.")
+        return
     
-    # Inserir apenas dados mínimos necessários para funcionamento
-    # Usuário administrador padrão
+    for tabela, colunas in FTS_TABLES.items():
+        fts = f'{tabela}_fts'
+        lista = ', '.join(colunas)
+        novos = ', '.join(fts_value(coluna, 'new') for coluna in colunas)
+        
+        # remove_diacritics: "Joao" encontra "João"; prefix acelera a busca enquanto se digita
+        cursor.execute(
+            f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {lista}, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+            )"""
+        )
+        cursor.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {tabela}_fts_insert AFTER INSERT ON {tabela} BEGIN
+                INSERT INTO {fts} (rowid, {lista}) VALUES (new.id, {novos});
+            END"""
+        )
+        cursor.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {tabela}_fts_update AFTER UPDATE ON {tabela} BEGIN
+                DELETE FROM {fts} WHERE rowid = old.id;
+                INSERT INTO {fts} (rowid, {lista}) VALUES (new.id, {novos});
+            END"""
+        )
+        cursor.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {tabela}_fts_delete AFTER DELETE ON {tabela} BEGIN
+                DELETE FROM {fts} WHERE rowid = old.id;
+            END"""
+        )
+        
+        # Indexar os registros já existentes
+        cursor.execute(f'DELETE FROM {fts}')
+        cursor.execute(
+            f"INSERT INTO {fts} (rowid, {lista}) SELECT id, {', '.join(fts_value(c, tabela) for c in colunas)} FROM {tabela}"
+        )
+
+# Contadores do dashboard: (coluna, tabela, expressão que vale 1 para a linha contada)
+DASHBOARD_COUNTERS = [
+    ('alunos_ativos', 'alunos', "{ref}.status IS 'ativo'"),
+    ('professores_ativos', 'professores', "{ref}.status IS 'ativo'"),
+    ('turmas_ativas', 'turmas', "{ref}.status IS 'ativa'"),
+    ('notas_total', 'notas', '1'),
+    ('notas_aprovadas', 'notas', '{ref}.nota >= 7'),
+]
+
+def rebuild_dashboard_counters(cursor):
+    """Recalcula os contadores a partir das tabelas (usado na criação e na verificação)"""
+    valores = {
+        coluna: cursor.execute(
+            f"SELECT COUNT(*) FROM {tabela} WHERE {expressao.format(ref=tabela)}"
+        ).fetchone()[0]
+        for coluna, tabela, expressao in DASHBOARD_COUNTERS
+    }
     cursor.execute(
-        'INSERT INTO usuarios (nome, email, cpf, telefone, cargo, senha, status) VALUES (?, ?, ?, ?, ?, ?, ?)',
-        ('Administrador', 'admin@escola.com', '000.000.000-00', '(61) 99999-0000', 'admin', 'admin123', 'ativo')
+        f"UPDATE contadores_dashboard SET {', '.join(f'{coluna} = ?' for coluna in valores)} WHERE id = 1",
+        list(valores.values())
     )
+    return valores
+
+@migration(4, 'Contadores do dashboard mantidos por gatilhos')
+def migration_004(cursor):
+    cursor.execute(
+        f"""CREATE TABLE IF NOT EXISTS contadores_dashboard (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            {', '.join(f'{coluna} INTEGER NOT NULL DEFAULT 0' for coluna, _, _ in DASHBOARD_COUNTERS)}
+        )"""
+    )
+    cursor.execute('INSERT OR IGNORE INTO contadores_dashboard (id) VALUES (1)')
     
-    print("✅ Banco de dados criado! Pronto para receber dados dinâmicos.")
+    tabelas = {}
+    for coluna, tabela, expressao in DASHBOARD_COUNTERS:
+        tabelas.setdefault(tabela, []).append((coluna, expressao))
+    
+    for tabela, contadores in tabelas.items():
+        inserir = ', '.join(f"{c} = {c} + ({e.format(ref='new')})" for c, e in contadores)
+        excluir = ', '.join(f"{c} = {c} - ({e.format(ref='old')})" for c, e in contadores)
+        alterar = ', '.join(
+            f"{c} = {c} + ({e.format(ref='new')}) - ({e.format(ref='old')})" for c, e in contadores
+        )
+        cursor.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {tabela}_contadores_insert AFTER INSERT ON {tabela} BEGIN
+                UPDATE contadores_dashboard SET {inserir} WHERE id = 1;
+            END"""
+        )
+        cursor.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {tabela}_contadores_delete AFTER DELETE ON {tabela} BEGIN
+                UPDATE contadores_dashboard SET {excluir} WHERE id = 1;
+            END"""
+        )
+        cursor.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {tabela}_contadores_update AFTER UPDATE ON {tabela} BEGIN
+                UPDATE contadores_dashboard SET {alterar} WHERE id = 1;
+            END"""
+        )
+    
+    rebuild_dashboard_counters(cursor)
+
+@migration(5, 'Snapshots dos relatórios')
+def migration_005(cursor):
+    cursor.execute(
+        '''CREATE TABLE IF NOT EXISTS relatorios_snapshots (
+            chave TEXT PRIMARY KEY,
+            nome TEXT NOT NULL,
+            parametros TEXT NOT NULL,
+            dados TEXT NOT NULL,
+            gerado_em TEXT NOT NULL
+        )'''
+    )
+
+DUPLICATES_LISTING_LIMIT = 20
+
+def remove_duplicates(cursor, tabela, chave):
+    """Apaga as linhas repetidas de `tabela` por `chave`, mantendo a mais recente (MAX(id)).
+
+    Lista no console o que foi removido (também no --dry-run, em que a exclusão é desfeita).
+    Retorna o número de linhas removidas.
+    """
+    colunas = ', '.join(chave)
+    duplicadas = cursor.execute(
+        f'''SELECT {colunas}, GROUP_CONCAT(id) AS removidos, MAX(id) AS mantido, COUNT(*) - 1 AS total
+            FROM (SELECT * FROM {tabela} ORDER BY id)
+            GROUP BY {colunas} HAVING COUNT(*) > 1
+            ORDER BY {colunas}'''
+    ).fetchall()
+    removidas = sum(row['total'] for row in duplicadas)
+    if not removidas:
+        return 0
+    
+    print(f"⚠️  {removidas} registro(s) duplicado(s) em {tabela} por ({colunas}); mantido o de maior id:")
+    for row in duplicadas[:DUPLICATES_LISTING_LIMIT]:
+        valores = ', '.join(f'{c}={row[c]!r}' for c in chave)
+        ids = [i for i in row['removidos'].split(',') if int(i) != row['mantido']]
+        print(f"   {valores}: mantido id {row['mantido']}, removido(s) id {', '.join(ids)}")
+    if len(duplicadas) > DUPLICATES_LISTING_LIMIT:
+        print(f"   ... e mais {len(duplicadas) - DUPLICATES_LISTING_LIMIT} grupo(s)")
+    
+    cursor.execute(
+        f'''DELETE FROM {tabela} WHERE id NOT IN (
+            SELECT MAX(id) FROM {tabela} GROUP BY {colunas}
+        )'''
+    )
+    return removidas
+
+@migration(6, 'Frequência única por matrícula e data')
+def migration_006(cursor):
+    # Mantém o registro mais recente de cada (matrícula, data) antes de criar a restrição
+    remove_duplicates(cursor, 'frequencia', ('matricula_id', 'data'))
+    cursor.execute(
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_frequencia_unica ON frequencia (matricula_id, data)'
+    )
+
+@migration(7, 'Nota única por matrícula, disciplina e bimestre')
+def migration_007(cursor):
+    remove_duplicates(cursor, 'notas', ('matricula_id', 'disciplina', 'bimestre'))
+    cursor.execute(
+        '''CREATE UNIQUE INDEX IF NOT EXISTS idx_notas_unica
+           ON notas (matricula_id, disciplina, bimestre)'''
+    )
+    # O índice único cobre o mesmo prefixo (matrícula, disciplina, bimestre)
+    cursor.execute('DROP INDEX IF EXISTS idx_notas_matricula')
+
+VERSIONED_TABLES = (
+    'alunos', 'professores', 'turmas', 'matriculas', 'notas',
+    'frequencia', 'eventos', 'usuarios', 'relatorios_snapshots'
+)
+
+@migration(8, 'Versões das tabelas (ETag)')
+def migration_008(cursor):
+    cursor.execute(
+        '''CREATE TABLE IF NOT EXISTS versoes_tabelas (
+            tabela TEXT PRIMARY KEY,
+            versao INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID'''
+    )
+    for tabela in VERSIONED_TABLES:
+        cursor.execute('INSERT OR IGNORE INTO versoes_tabelas (tabela) VALUES (?)', (tabela,))
+        for evento in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(
+                f'''CREATE TRIGGER IF NOT EXISTS {tabela}_versao_{evento.lower()}
+                    AFTER {evento} ON {tabela} BEGIN
+                    UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = '{tabela}';
+                END'''
+            )
+
+# Linha de versoes_tabelas com um número aleatório por banco: num banco novo
+# (reset-db) as versões recomeçam do zero e a ETag não pode repetir a do anterior
+DATABASE_ID_ROW = '_banco'
+
+@migration(9, 'Identidade do banco (ETag)')
+def migration_009(cursor):
+    cursor.execute(
+        'INSERT OR IGNORE INTO versoes_tabelas (tabela, versao) VALUES (?, ?)',
+        (DATABASE_ID_ROW, random.SystemRandom().getrandbits(62))
+    )
+
+def get_schema_version(cursor):
+    cursor.execute(
+        '''CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            descricao TEXT NOT NULL,
+            applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )'''
+    )
+    return cursor.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+
+def migrate_db(dry_run=False):
+    """Aplica as migrações pendentes, cada uma em sua própria transação.
+
+    Com dry_run=True todos os passos pendentes são executados em uma única
+    transação desfeita ao final, sem alterar o banco.
+    Retorna a lista de (versão, descrição) processadas.
+    """
+    conn = get_db()
+    cursor = conn.cursor()
+    processadas = []
+    
+    try:
+        # BEGIN IMMEDIATE serializa a migração entre processos que sobem juntos
+        cursor.execute('BEGIN IMMEDIATE')
+        for version, descricao, step in MIGRATIONS:
+            # Relido a cada passo: outro processo pode ter avançado a versão
+            if version <= get_schema_version(cursor):
+                continue
+            
+            try:
+                step(cursor)
+                cursor.execute(
+                    'INSERT INTO schema_version (version, descricao) VALUES (?, ?)',
+                    (version, descricao)
+                )
+            except Exception:
+                conn.rollback()
+                print(f"❌ Falha na migração {version:03d} - {descricao}")
+                raise
+            
+            if dry_run:
+                print(f"🔎 [dry-run] Migração {version:03d} - {descricao}")
+            else:
+                conn.commit()
+                print(f"🔧 Migração {version:03d} aplicada - {descricao}")
+                cursor.execute('BEGIN IMMEDIATE')
+            processadas.append((version, descricao))
+        
+        if dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+    finally:
+        conn.close()
+    
+    return processadas
+
+def init_db():
+    # Preserva os dados existentes: apenas as migrações pendentes são aplicadas
+    aplicadas = migrate_db()
+    
+    if aplicadas:
+        print(f"✅ Banco de dados atualizado para a versão {aplicadas[-1][0]}.")
+    else:
+        print("📊 Banco de dados já está atualizado. Mantendo dados existentes.")
+
+# Situação das migrações
+@app.route('/api/admin/migrations', methods=['GET'])
+@require_auth
+@require_permission('all')
+def get_migrations():
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    get_schema_version(cursor)
+    aplicadas = cursor.execute(
+        'SELECT version, descricao, applied_at FROM schema_version ORDER BY version'
+    ).fetchall()
+    versoes = {row['version'] for row in aplicadas}
     
-    conn.commit()
     conn.close()
+    return jsonify({
+        'versao_atual': max(versoes) if versoes else 0,
+        'aplicadas': [dict(row) for row in aplicadas],
+        'pendentes': [
+            {'version': version, 'descricao': descricao}
+            for version, descricao, _ in MIGRATIONS if version not in versoes
+        ]
+    })
+
+# ============ PAGINAÇÃO POR CURSOR ============
+# Listagens aceitam ?limit=N&after=<cursor>&total=1. O cursor é opaco para o
+# cliente e guarda os valores da chave de ordenação do último item da página,
+# de modo que a próxima página começa direto no índice (sem OFFSET).
+# Sem esses parâmetros as rotas mantêm a resposta original (lista completa).
+
+PAGE_DEFAULT_LIMIT = 50
+PAGE_MAX_LIMIT = 500
+
+class PaginationError(ValueError):
+    pass
+
+@app.errorhandler(PaginationError)
+def handle_pagination_error(e):
+    return jsonify({'error': str(e)}), 400
+
+def encode_cursor(values):
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise PaginationError('Cursor de paginação inválido')
+    if not isinstance(values, list):
+        raise PaginationError('Cursor de paginação inválido')
+    return values
+
+def get_page_args():
+    """Lê limit/after/total da query string; None quando a paginação não foi pedida"""
+    if 'limit' not in request.args and 'after' not in request.args:
+        return None
+    
+    try:
+        limit = int(request.args.get('limit', PAGE_DEFAULT_LIMIT))
+    except ValueError:
+        raise PaginationError('Parâmetro limit deve ser um número inteiro')
+    if limit < 1:
+        raise PaginationError('Parâmetro limit deve ser maior que zero')
+    
+    after = request.args.get('after')
+    return {
+        'limit': min(limit, PAGE_MAX_LIMIT),
+        'after': decode_cursor(after) if after else None,
+        'total': request.args.get('total') in ('1', 'true')
+    }
+
+def fetch_page(cursor, query, params, order_by, page, descending=False):
+    """Executa uma página de `query` ordenada pela chave `order_by`.
+
+    `query` deve terminar em uma cláusula WHERE (use WHERE 1=1) e `order_by` é
+    uma lista de (expressão SQL, campo do resultado) que identifica a linha de
+    forma única, por exemplo [('nome', 'nome'), ('id', 'id')].
+    """
+    columns = [column for column, _ in order_by]
+    fields = [field for _, field in order_by]
+    sql = query
+    sql_params = list(params)
+    
+    if page['after'] is not None:
+        if len(page['after']) != len(columns):
+            raise PaginationError('Cursor de paginação inválido')
+        operador = '<' if descending else '>'
+        sql += f" AND ({', '.join(columns)}) {operador} ({', '.join('?' * len(columns))})"
+        sql_params.extend(page['after'])
+    
+    direcao = ' DESC' if descending else ''
+    sql += ' ORDER BY ' + ', '.join(column + direcao for column in columns) + ' LIMIT ?'
+    # Um item a mais indica se existe próxima página
+    sql_params.append(page['limit'] + 1)
+    
+    rows = cursor.execute(sql, sql_params).fetchall()
+    has_more = len(rows) > page['limit']
+    rows = rows[:page['limit']]
+    
+    resultado = {
+        'items': [dict(row) for row in rows],
+        'next': encode_cursor([rows[-1][field] for field in fields]) if has_more else None
+    }
+    if page['total']:
+        resultado['total'] = cursor.execute(f'SELECT COUNT(*) FROM ({query})', params).fetchone()[0]
+    return resultado
+
+# ============ FORMATO COLUNAR ============
+
+# orjson é opcional (pip install orjson); sem ele o formato colunar usa o json padrão
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_fast(obj):
+    """JSON compacto em bytes, com orjson quando disponível"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+
+def list_response(cursor, query, params=()):
+    """Resposta das rotas de listagem.
+
+    Por padrão, uma lista de objetos. Com ?format=columnar, um objeto
+    {"columns": [...], "rows": [[...], ...]}: as linhas saem do cursor como
+    tuplas, sem um dicionário por linha e sem repetir os nomes das colunas.
+    """
+    if request.args.get('format') != 'columnar':
+        return jsonify([dict(row) for row in cursor.execute(query, params).fetchall()])
+    
+    cursor.row_factory = None
+    cursor.execute(query, params)
+    corpo = dumps_fast({'columns': [col[0] for col in cursor.description], 'rows': cursor.fetchall()})
+    return app.response_class(corpo, mimetype='application/json')
+
+# ============ BUSCA TEXTUAL ============
+
+_fts_enabled = None
+
+def fts_enabled(cursor):
+    global _fts_enabled
+    if _fts_enabled is None:
+        _fts_enabled = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'alunos_fts'"
+        ).fetchone() is not None
+    return _fts_enabled
+
+def search_filter(cursor, tabela, alias, search):
+    """Monta o filtro do parâmetro search para `tabela` (referenciada como `alias`).
+
+    Retorna (join, condição, parâmetros, ordenação por relevância ou None).
+    Usa o índice FTS5 quando disponível: cada palavra digitada é tratada como
+    prefixo e a comparação ignora acentos. Sem FTS5, volta ao LIKE original.
+    """
+    termos = re.findall(r'\w+', search)
+    
+    if termos and fts_enabled(cursor):
+        fts = f'{tabela}_fts'
+        consulta = ' '.join(f'"{termo}"*' for termo in termos)
+        return f' JOIN {fts} ON {fts}.rowid = {alias}.id', f' AND {fts} MATCH ?', [consulta], f'{fts}.rank'
+    
+    colunas = FTS_TABLES[tabela]
+    condicao = ' AND (' + ' OR '.join(f'{alias}.{coluna} LIKE ?' for coluna in colunas) + ')'
+    return '', condicao, [f'%{search}%'] * len(colunas), None
+
+# ============ ETAG E RESPOSTAS 304 ============
+
+# Muda quando o código do servidor muda, para não validar respostas de outra versão
+ETAG_SALT = os.environ.get('ETAG_SALT') or str(int(os.path.getmtime(os.path.abspath(__file__))))
+
+def table_versions(conn):
+    """Versões atuais de VERSIONED_TABLES, mantidas por gatilhos (migração 008).
+
+    A leitura da tabela é reaproveitada enquanto PRAGMA data_version (escritas
+    de outras conexões) e total_changes (escritas desta conexão) não mudarem.
+    """
+    chave = (conn.execute('PRAGMA data_version').fetchone()[0], conn.total_changes)
+    if conn.versoes_cache is None or conn.versoes_cache[0] != chave:
+        versoes = dict(conn.execute('SELECT tabela, versao FROM versoes_tabelas').fetchall())
+        conn.versoes_cache = (chave, versoes)
+    return conn.versoes_cache[1]
+
+def versioned(*tabelas, por_dia=False):
+    """ETag derivada das versões de `tabelas`: responde 304 sem executar a rota.
+
+    A ETag também depende do banco (DATABASE_ID_ROW), da URL completa, do
+    usuário autenticado (quando a rota exige login) e das turmas que ele
+    enxerga; com por_dia=True, da data atual (rotas que comparam com date('now')).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            versoes = table_versions(get_db())
+            partes = [ETAG_SALT, f'banco:{versoes.get(DATABASE_ID_ROW)}', request.full_path]
+            # Definido por require_auth/require_permission, que rodam antes deste decorator
+            partes.append('usuario:' + ','.join(map(str, g.get('auth_user') or ())))
+            partes += [f'{tabela}:{versoes.get(tabela)}' for tabela in tabelas]
+            if g.get('turmas_permitidas') is not None:
+                partes.append('turmas:' + ','.join(map(str, sorted(g.turmas_permitidas))))
+            if por_dia:
+                partes.append(datetime.now(timezone.utc).date().isoformat())
+            etag = hashlib.sha1('\n'.join(partes).encode()).hexdigest()[:20]
+            
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = app.make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            # ETag fraca: o mesmo conteúdo pode ser enviado com ou sem compressão
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return decorated_function
+    return decorator
 
 # Estatísticas do Dashboard
 @app.route('/api/stats', methods=['GET'])
+@versioned('alunos', 'professores', 'turmas', 'notas')
 def get_stats():
     conn = get_db()
     cursor = conn.cursor()
     
-    total_alunos = cursor.execute('SELECT COUNT(*) FROM alunos WHERE status = "ativo"').fetchone()[0]
-    total_professores = cursor.execute('SELECT COUNT(*) FROM professores WHERE status = "ativo"').fetchone()[0]
-    total_turmas = cursor.execute('SELECT COUNT(*) FROM turmas WHERE status = "ativa"').fetchone()[0]
+    # Contadores mantidos por gatilhos (migração 004): leitura de uma única linha
+    contadores = cursor.execute('SELECT * FROM contadores_dashboard WHERE id = 1').fetchone()
     
-    # Calcular taxa de aprovação real baseada nas notas
-    aprovacao_result = cursor.execute(
-        'SELECT COUNT(CASE WHEN nota >= 7 THEN 1 END) * 100.0 / COUNT(*) FROM notas'
-    ).fetchone()
-    taxa_aprovacao = round(aprovacao_result[0] if aprovacao_result[0] else 0, 1)
+    # Taxa de aprovação real baseada nas notas
+    taxa_aprovacao = 0
+    if contadores['notas_total']:
+        taxa_aprovacao = round(contadores['notas_aprovadas'] * 100.0 / contadores['notas_total'], 1)
     
     conn.close()
     
     return jsonify({
-        'total_alunos': total_alunos,
-        'total_professores': total_professores,
-        'total_turmas': total_turmas,
+        'total_alunos': contadores['alunos_ativos'],
+        'total_professores': contadores['professores_ativos'],
+        'total_turmas': contadores['turmas_ativas'],
         'taxa_aprovacao': taxa_aprovacao
     })
 
+# Verificação dos contadores do dashboard
+@app.route('/api/admin/contadores', methods=['GET', 'POST'])
+@require_auth
+@require_permission('all')
+def check_dashboard_counters():
+    """GET compara os contadores com as tabelas; POST também os reconstrói"""
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    cursor.execute('BEGIN IMMEDIATE')
+    armazenados = dict(cursor.execute('SELECT * FROM contadores_dashboard WHERE id = 1').fetchone())
+    armazenados.pop('id')
+    reais = rebuild_dashboard_counters(cursor)
+    divergentes = {
+        coluna: {'armazenado': armazenados[coluna], 'real': valor}
+        for coluna, valor in reais.items() if armazenados[coluna] != valor
+    }
+    
+    if request.method == 'POST':
+        conn.commit()
+    else:
+        conn.rollback()
+    conn.close()
+    
+    return jsonify({
+        'consistente': not divergentes,
+        'divergentes': divergentes,
+        'reconstruido': request.method == 'POST',
+        'contadores': reais
+    })
+
 # Atividades recentes
 @app.route('/api/atividades', methods=['GET'])
+@versioned('matriculas', 'alunos', 'turmas', 'notas')
 def get_atividades():
     conn = get_db()
     cursor = conn.cursor()
@@ -310,24 +1284,44 @@ def get_atividades():
 
 # CRUD Alunos
 @app.route('/api/alunos', methods=['GET'])
+@require_auth
+@require_permission('view_alunos')
+@versioned('alunos', 'matriculas')
 def get_alunos():
     conn = get_db()
     cursor = conn.cursor()
     
     search = request.args.get('search', '')
+    page = get_page_args()
+    
+    query = 'SELECT alunos.* FROM alunos'
+    params = []
+    ordem = 'alunos.nome'
     
     if search:
-        alunos = cursor.execute(
-            'SELECT * FROM alunos WHERE nome LIKE ? OR email LIKE ? OR cpf LIKE ? ORDER BY nome',
-            (f'%{search}%', f'%{search}%', f'%{search}%')
-        ).fetchall()
+        join, condicao, params, relevancia = search_filter(cursor, 'alunos', 'alunos', search)
+        query += join + ' WHERE 1=1' + condicao
+        ordem = f'{relevancia}, alunos.nome' if relevancia else ordem
     else:
-        alunos = cursor.execute('SELECT * FROM alunos ORDER BY nome').fetchall()
+        query += ' WHERE 1=1'
+    
+    # Professor: apenas alunos matriculados nas suas turmas
+    condicao, escopo = turma_scope('m.turma_id')
+    if condicao:
+        query += f' AND alunos.id IN (SELECT m.aluno_id FROM matriculas m WHERE 1=1{condicao})'
+        params = list(params) + escopo
     
+    if page:
+        resultado = fetch_page(cursor, query, params, [('alunos.nome', 'nome'), ('alunos.id', 'id')], page)
+        conn.close()
+        return jsonify(resultado)
+    
+    response = list_response(cursor, query + ' ORDER BY ' + ordem, params)
     conn.close()
-    return jsonify([dict(aluno) for aluno in alunos])
+    return response
 
 @app.route('/api/alunos/<int:id>', methods=['GET'])
+@versioned('alunos')
 def get_aluno(id):
     conn = get_db()
     cursor = conn.cursor()
@@ -394,24 +1388,36 @@ def delete_aluno(id):
 
 # CRUD Professores
 @app.route('/api/professores', methods=['GET'])
+@versioned('professores')
 def get_professores():
     conn = get_db()
     cursor = conn.cursor()
     
     search = request.args.get('search', '')
+    page = get_page_args()
+    
+    query = 'SELECT professores.* FROM professores'
+    params = []
+    ordem = 'professores.nome'
     
     if search:
-        professores = cursor.execute(
-            'SELECT * FROM professores WHERE nome LIKE ? OR email LIKE ? OR cpf LIKE ? OR especializacao LIKE ? ORDER BY nome',
-            (f'%{search}%', f'%{search}%', f'%{search}%', f'%{search}%')
-        ).fetchall()
+        join, condicao, params, relevancia = search_filter(cursor, 'professores', 'professores', search)
+        query += join + ' WHERE 1=1' + condicao
+        ordem = f'{relevancia}, professores.nome' if relevancia else ordem
     else:
-        professores = cursor.execute('SELECT * FROM professores ORDER BY nome').fetchall()
+        query += ' WHERE 1=1'
+    
+    if page:
+        resultado = fetch_page(cursor, query, params, [('professores.nome', 'nome'), ('professores.id', 'id')], page)
+        conn.close()
+        return jsonify(resultado)
     
+    response = list_response(cursor, query + ' ORDER BY ' + ordem, params)
     conn.close()
-    return jsonify([dict(professor) for professor in professores])
+    return response
 
 @app.route('/api/professores/<int:id>', methods=['GET'])
+@versioned('professores')
 def get_professor(id):
     conn = get_db()
     cursor = conn.cursor()
@@ -460,6 +1466,8 @@ def update_professor(id):
         )
         conn.commit()
         conn.close()
+        # O e-mail liga o professor ao usuário
+        professor_turmas_cache.clear()
         return jsonify({'message': 'Professor atualizado com sucesso'})
     except Exception as e:
         conn.close()
@@ -474,37 +1482,50 @@ def delete_professor(id):
     cursor.execute('DELETE FROM professores WHERE id = ?', (id,))
     conn.commit()
     conn.close()
+    professor_turmas_cache.clear()
     return jsonify({'message': 'Professor excluído com sucesso'})
 
 # CRUD Turmas
 @app.route('/api/turmas', methods=['GET'])
+@require_auth
+@require_permission('view_turmas')
+@versioned('turmas', 'professores')
 def get_turmas():
     conn = get_db()
     cursor = conn.cursor()
     
     search = request.args.get('search', '')
+    page = get_page_args()
     
-    if search:
-        turmas = cursor.execute(
-            '''SELECT t.*, p.nome as professor_nome 
+    query = '''SELECT t.*, p.nome as professor_nome 
                FROM turmas t 
-               LEFT JOIN professores p ON t.professor_id = p.id 
-               WHERE t.nome LIKE ? OR t.ano LIKE ? OR t.turno LIKE ? 
-               ORDER BY t.nome''',
-            (f'%{search}%', f'%{search}%', f'%{search}%')
-        ).fetchall()
+               LEFT JOIN professores p ON t.professor_id = p.id'''
+    params = []
+    ordem = 't.nome'
+    
+    if search:
+        join, condicao, params, relevancia = search_filter(cursor, 'turmas', 't', search)
+        query += join + ' WHERE 1=1' + condicao
+        ordem = f'{relevancia}, t.nome' if relevancia else ordem
     else:
-        turmas = cursor.execute(
-            '''SELECT t.*, p.nome as professor_nome 
-               FROM turmas t 
-               LEFT JOIN professores p ON t.professor_id = p.id 
-               ORDER BY t.nome'''
-        ).fetchall()
+        query += ' WHERE 1=1'
     
+    # Professor: apenas as suas turmas
+    condicao, escopo = turma_scope('t.id')
+    query += condicao
+    params = list(params) + escopo
+    
+    if page:
+        resultado = fetch_page(cursor, query, params, [('t.nome', 'nome'), ('t.id', 'id')], page)
+        conn.close()
+        return jsonify(resultado)
+    
+    response = list_response(cursor, query + ' ORDER BY ' + ordem, params)
     conn.close()
-    return jsonify([dict(turma) for turma in turmas])
+    return response
 
 @app.route('/api/turmas/<int:id>', methods=['GET'])
+@versioned('turmas', 'professores')
 def get_turma(id):
     conn = get_db()
     cursor = conn.cursor()
@@ -536,6 +1557,7 @@ def create_turma():
         conn.commit()
         turma_id = cursor.lastrowid
         conn.close()
+        professor_turmas_cache.clear()
         return jsonify({'id': turma_id, 'message': 'Turma criada com sucesso'}), 201
     except Exception as e:
         conn.close()
@@ -555,6 +1577,8 @@ def update_turma(id):
         )
         conn.commit()
         conn.close()
+        # Pode ter trocado o professor: recalcula as turmas de cada professor
+        professor_turmas_cache.clear()
         return jsonify({'message': 'Turma atualizada com sucesso'})
     except Exception as e:
         conn.close()
@@ -567,24 +1591,34 @@ def delete_turma(id):
     cursor.execute('DELETE FROM turmas WHERE id = ?', (id,))
     conn.commit()
     conn.close()
+    professor_turmas_cache.clear()
     return jsonify({'message': 'Turma excluída com sucesso'})
 
 # CRUD Matrículas
 @app.route('/api/matriculas', methods=['GET'])
+@versioned('matriculas', 'alunos', 'turmas')
 def get_matriculas():
     conn = get_db()
     cursor = conn.cursor()
     
-    matriculas = cursor.execute(
-        '''SELECT m.*, a.nome as aluno_nome, t.nome as turma_nome 
-           FROM matriculas m 
-           JOIN alunos a ON m.aluno_id = a.id 
-           JOIN turmas t ON m.turma_id = t.id 
-           ORDER BY m.data_matricula DESC'''
-    ).fetchall()
+    page = get_page_args()
     
+    query = '''SELECT m.*, a.nome as aluno_nome, t.nome as turma_nome 
+               FROM matriculas m 
+               JOIN alunos a ON m.aluno_id = a.id 
+               JOIN turmas t ON m.turma_id = t.id 
+               WHERE 1=1'''
+    
+    if page:
+        resultado = fetch_page(
+            cursor, query, [], [('m.data_matricula', 'data_matricula'), ('m.id', 'id')], page, descending=True
+        )
+        conn.close()
+        return jsonify(resultado)
+    
+    response = list_response(cursor, query + ' ORDER BY m.data_matricula DESC')
     conn.close()
-    return jsonify([dict(matricula) for matricula in matriculas])
+    return response
 
 @app.route('/api/matriculas', methods=['POST'])
 def create_matricula():
@@ -634,14 +1668,20 @@ def delete_matricula(id):
 
 # CRUD Frequência
 @app.route('/api/frequencia', methods=['GET'])
+@require_auth
+@require_permission('view_frequencia')
+@versioned('frequencia', 'matriculas', 'alunos', 'turmas')
 def get_frequencia():
+    try:
+        intervalo = month_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     conn = get_db()
     cursor = conn.cursor()
     
     turma_id = request.args.get('turma_id')
     data = request.args.get('data')
-    mes = request.args.get('mes')
-    ano = request.args.get('ano')
     
     query = '''
         SELECT f.*, m.aluno_id, a.nome as aluno_nome, t.nome as turma_nome, t.id as turma_id
@@ -651,7 +1691,9 @@ def get_frequencia():
         JOIN turmas t ON m.turma_id = t.id 
         WHERE 1=1
     '''
-    params = []
+    # Professor: apenas as suas turmas
+    condicao, params = turma_scope('t.id')
+    query += condicao
     
     if turma_id:
         query += ' AND t.id = ?'
@@ -661,17 +1703,18 @@ def get_frequencia():
         query += ' AND f.data = ?'
         params.append(data)
     
-    if mes and ano:
-        query += ' AND strftime("%m", f.data) = ? AND strftime("%Y", f.data) = ?'
-        params.extend([f'{int(mes):02d}', ano])
+    if intervalo:
+        query += ' AND f.data >= ? AND f.data < ?'
+        params.extend(intervalo)
     
     query += ' ORDER BY a.nome, f.data'
     
-    frequencias = cursor.execute(query, params).fetchall()
+    response = list_response(cursor, query, params)
     conn.close()
-    return jsonify([dict(freq) for freq in frequencias])
+    return response
 
 @app.route('/api/frequencia/turma/<int:turma_id>/data/<data>', methods=['GET'])
+@versioned('frequencia', 'matriculas', 'alunos')
 def get_frequencia_turma_data(turma_id, data):
     conn = get_db()
     cursor = conn.cursor()
@@ -730,36 +1773,100 @@ def create_frequencia():
         conn.close()
         return jsonify({'error': str(e)}), 400
 
+def normalize_presente(valor):
+    return 1 if valor in (True, 1, '1', 'true') else 0
+
 @app.route('/api/frequencia/lote', methods=['POST'])
 def save_frequencia_lote():
+    """Salva a chamada de uma ou mais turmas/datas.
+
+    Aceita {turma_id, data, frequencias: [...]} ou, para sincronizar várias
+    chamadas de uma vez, {chamadas: [{turma_id, data, frequencias: [...]}, ...]}.
+    Cada chamada substitui a frequência da turma na data: só as linhas que
+    mudaram são gravadas, e alunos ausentes da lista têm o registro removido.
+    Matrículas que não são da turma, repetidas ou com id não inteiro, e chamadas
+    repetidas (mesma turma e data) recusam o lote inteiro com 400.
+    """
     data = request.json
     conn = get_db()
     cursor = conn.cursor()
     
     try:
-        turma_id = data['turma_id']
-        data_aula = data['data']
-        frequencias = data['frequencias']
+        chamadas = data['chamadas'] if 'chamadas' in data else [data]
         
-        # Remover frequências existentes para a data/turma
-        cursor.execute(
-            '''DELETE FROM frequencia 
-               WHERE matricula_id IN (
-                   SELECT m.id FROM matriculas m WHERE m.turma_id = ?
-               ) AND data = ?''',
-            (turma_id, data_aula)
-        )
+        cursor.execute('BEGIN IMMEDIATE')
+        gravar = []
+        remover = []
+        inseridos = atualizados = inalterados = 0
+        vistas = set()
         
-        # Inserir novas frequências
-        for freq in frequencias:
-            cursor.execute(
-                'INSERT INTO frequencia (matricula_id, data, presente) VALUES (?, ?, ?)',
-                (freq['matricula_id'], data_aula, freq['presente'])
-            )
+        for chamada in chamadas:
+            turma_id = chamada['turma_id']
+            data_aula = chamada['data']
+            if isinstance(turma_id, bool) or not isinstance(turma_id, int):
+                raise ValueError(f'turma_id deve ser um número inteiro: {turma_id!r}')
+            if (turma_id, data_aula) in vistas:
+                raise ValueError(f'Chamada da turma {turma_id} em {data_aula} repetida no lote')
+            vistas.add((turma_id, data_aula))
+            
+            matriculas = {
+                row[0] for row in cursor.execute(
+                    'SELECT id FROM matriculas WHERE turma_id = ?', (turma_id,)
+                )
+            }
+            novos = {}
+            for freq in chamada['frequencias']:
+                matricula_id = freq.get('matricula_id')
+                if isinstance(matricula_id, bool) or not isinstance(matricula_id, int):
+                    raise ValueError(f'matricula_id deve ser um número inteiro: {matricula_id!r}')
+                if matricula_id not in matriculas:
+                    raise ValueError(f'Matrícula {matricula_id!r} não pertence à turma {turma_id}')
+                if matricula_id in novos:
+                    raise ValueError(f'Matrícula {matricula_id} repetida na chamada de {data_aula}')
+                novos[matricula_id] = normalize_presente(freq.get('presente', 1))
+            
+            # Estado atual da chamada em uma única consulta
+            existentes = dict(cursor.execute(
+                '''SELECT f.matricula_id, f.presente
+                   FROM frequencia f 
+                   JOIN matriculas m ON f.matricula_id = m.id
+                   WHERE m.turma_id = ? AND f.data = ?''',
+                (turma_id, data_aula)
+            ).fetchall())
+            
+            for matricula_id, presente in novos.items():
+                atual = existentes.pop(matricula_id, None)
+                if atual is None:
+                    inseridos += 1
+                elif atual != presente:
+                    atualizados += 1
+                else:
+                    inalterados += 1
+                    continue
+                gravar.append((matricula_id, data_aula, presente))
+            
+            remover.extend((matricula_id, data_aula) for matricula_id in existentes)
+        
+        # Uma linha gravada neste lote nunca é apagada por ele
+        gravadas = {(matricula_id, data_aula) for matricula_id, data_aula, _ in gravar}
+        remover = [chave for chave in remover if chave not in gravadas]
+        
+        cursor.executemany(
+            '''INSERT INTO frequencia (matricula_id, data, presente) VALUES (?, ?, ?)
+               ON CONFLICT (matricula_id, data) DO UPDATE SET presente = excluded.presente''',
+            gravar
+        )
+        cursor.executemany('DELETE FROM frequencia WHERE matricula_id = ? AND data = ?', remover)
         
         conn.commit()
         conn.close()
-        return jsonify({'message': 'Frequências salvas com sucesso'}), 201
+        return jsonify({
+            'message': 'Frequências salvas com sucesso',
+            'inseridos': inseridos,
+            'atualizados': atualizados,
+            'inalterados': inalterados,
+            'removidos': len(remover)
+        }), 201
     except Exception as e:
         conn.close()
         return jsonify({'error': str(e)}), 400
@@ -793,13 +1900,17 @@ def delete_frequencia(id):
 
 # CRUD Eventos
 @app.route('/api/eventos', methods=['GET'])
+@versioned('eventos', 'turmas', 'professores')
 def get_eventos():
+    try:
+        intervalo = month_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     conn = get_db()
     cursor = conn.cursor()
     
     # Parâmetros de filtro
-    mes = request.args.get('mes')
-    ano = request.args.get('ano')
     tipo = request.args.get('tipo')
     
     query = '''
@@ -811,9 +1922,9 @@ def get_eventos():
     '''
     params = []
     
-    if mes and ano:
-        query += ' AND strftime("%m", e.data_inicio) = ? AND strftime("%Y", e.data_inicio) = ?'
-        params.extend([f'{int(mes):02d}', ano])
+    if intervalo:
+        query += ' AND e.data_inicio >= ? AND e.data_inicio < ?'
+        params.extend(intervalo)
     
     if tipo:
         query += ' AND e.tipo = ?'
@@ -821,11 +1932,12 @@ def get_eventos():
     
     query += ' ORDER BY e.data_inicio, e.hora_inicio'
     
-    eventos = cursor.execute(query, params).fetchall()
+    response = list_response(cursor, query, params)
     conn.close()
-    return jsonify([dict(evento) for evento in eventos])
+    return response
 
 @app.route('/api/eventos/<int:id>', methods=['GET'])
+@versioned('eventos', 'turmas', 'professores')
 def get_evento(id):
     conn = get_db()
     cursor = conn.cursor()
@@ -899,6 +2011,7 @@ def delete_evento(id):
 
 # Eventos próximos para o dashboard
 @app.route('/api/eventos/proximos', methods=['GET'])
+@versioned('eventos', 'turmas', 'professores', por_dia=True)
 def get_eventos_proximos():
     conn = get_db()
     cursor = conn.cursor()
@@ -908,7 +2021,7 @@ def get_eventos_proximos():
            FROM eventos e 
            LEFT JOIN turmas t ON e.turma_id = t.id 
            LEFT JOIN professores p ON e.professor_id = p.id 
-           WHERE e.status = "ativo" AND date(e.data_inicio) >= date('now')
+           WHERE e.status = "ativo" AND e.data_inicio >= date('now')
            ORDER BY e.data_inicio, e.hora_inicio 
            LIMIT 5'''
     ).fetchall()
@@ -918,6 +2031,9 @@ def get_eventos_proximos():
 
 # CRUD Notas
 @app.route('/api/notas', methods=['GET'])
+@require_auth
+@require_permission('view_notas')
+@versioned('notas', 'matriculas', 'alunos', 'turmas')
 def get_notas():
     conn = get_db()
     cursor = conn.cursor()
@@ -936,7 +2052,9 @@ def get_notas():
         JOIN turmas t ON m.turma_id = t.id 
         WHERE 1=1
     '''
-    params = []
+    # Professor: apenas as suas turmas
+    condicao, params = turma_scope('t.id')
+    query += condicao
     
     if turma_id:
         query += ' AND t.id = ?'
@@ -956,11 +2074,12 @@ def get_notas():
     
     query += ' ORDER BY a.nome, n.disciplina, n.bimestre'
     
-    notas = cursor.execute(query, params).fetchall()
+    response = list_response(cursor, query, params)
     conn.close()
-    return jsonify([dict(nota) for nota in notas])
+    return response
 
 @app.route('/api/notas/<int:id>', methods=['GET'])
+@versioned('notas', 'matriculas', 'alunos', 'turmas')
 def get_nota(id):
     conn = get_db()
     cursor = conn.cursor()
@@ -986,16 +2105,7 @@ def create_nota():
     cursor = conn.cursor()
     
     try:
-        # Verificar se já existe nota para esta matrícula/disciplina/bimestre
-        existing = cursor.execute(
-            'SELECT id FROM notas WHERE matricula_id = ? AND disciplina = ? AND bimestre = ?',
-            (data['matricula_id'], data['disciplina'], data['bimestre'])
-        ).fetchone()
-        
-        if existing:
-            conn.close()
-            return jsonify({'error': 'Já existe nota para esta disciplina e bimestre'}), 400
-        
+        # O índice único em (matrícula, disciplina, bimestre) impede duplicatas
         cursor.execute(
             'INSERT INTO notas (matricula_id, disciplina, nota, bimestre) VALUES (?, ?, ?, ?)',
             (data['matricula_id'], data['disciplina'], data['nota'], data['bimestre'])
@@ -1004,6 +2114,107 @@ def create_nota():
         nota_id = cursor.lastrowid
         conn.close()
         return jsonify({'id': nota_id, 'message': 'Nota criada com sucesso'}), 201
+    except sqlite3.IntegrityError as e:
+        conn.close()
+        if 'UNIQUE' in str(e):
+            return jsonify({'error': 'Já existe nota para esta disciplina e bimestre'}), 400
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        conn.close()
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/notas/lote', methods=['POST'])
+def save_notas_lote():
+    """Salva a grade de notas de uma turma em uma disciplina e bimestre.
+
+    Recebe {turma_id, disciplina, bimestre, notas: [{matricula_id, nota}]};
+    nota nula remove a nota existente. Retorna o resultado de cada célula.
+    """
+    data = request.json
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    try:
+        turma_id = data['turma_id']
+        disciplina = data['disciplina']
+        bimestre = data['bimestre']
+        
+        cursor.execute('BEGIN IMMEDIATE')
+        matriculas = {
+            row[0] for row in cursor.execute(
+                'SELECT id FROM matriculas WHERE turma_id = ?', (turma_id,)
+            )
+        }
+        existentes = dict(cursor.execute(
+            '''SELECT n.matricula_id, n.nota FROM notas n
+               JOIN matriculas m ON n.matricula_id = m.id
+               WHERE m.turma_id = ? AND n.disciplina = ? AND n.bimestre = ?''',
+            (turma_id, disciplina, bimestre)
+        ).fetchall())
+        
+        resultados = []
+        gravar = []
+        remover = []
+        for celula in data['notas']:
+            matricula_id = celula.get('matricula_id')
+            nota = celula.get('nota')
+            resultado = {'matricula_id': matricula_id}
+            resultados.append(resultado)
+            
+            if matricula_id not in matriculas:
+                resultado.update(status='erro', error='Matrícula não pertence à turma')
+                continue
+            if nota is None:
+                if matricula_id in existentes:
+                    remover.append((matricula_id, disciplina, bimestre))
+                    resultado['status'] = 'removida'
+                else:
+                    resultado['status'] = 'inalterada'
+                existentes.pop(matricula_id, None)
+                continue
+            if isinstance(nota, bool) or not isinstance(nota, (int, float)) or not 0 <= nota <= 10:
+                resultado.update(status='erro', error='A nota deve estar entre 0 e 10')
+                continue
+            
+            atual = existentes.get(matricula_id)
+            if atual is None:
+                resultado['status'] = 'inserida'
+            elif atual != nota:
+                resultado['status'] = 'atualizada'
+            else:
+                resultado['status'] = 'inalterada'
+                continue
+            existentes[matricula_id] = nota
+            gravar.append((matricula_id, disciplina, nota, bimestre))
+        
+        cursor.executemany(
+            '''INSERT INTO notas (matricula_id, disciplina, nota, bimestre) VALUES (?, ?, ?, ?)
+               ON CONFLICT (matricula_id, disciplina, bimestre) DO UPDATE SET nota = excluded.nota''',
+            gravar
+        )
+        cursor.executemany(
+            'DELETE FROM notas WHERE matricula_id = ? AND disciplina = ? AND bimestre = ?',
+            remover
+        )
+        
+        # Identificadores das notas gravadas, em uma única consulta
+        ids = dict(cursor.execute(
+            '''SELECT n.matricula_id, n.id FROM notas n
+               JOIN matriculas m ON n.matricula_id = m.id
+               WHERE m.turma_id = ? AND n.disciplina = ? AND n.bimestre = ?''',
+            (turma_id, disciplina, bimestre)
+        ).fetchall())
+        conn.commit()
+        conn.close()
+        
+        for resultado in resultados:
+            if resultado['status'] in ('inserida', 'atualizada', 'inalterada'):
+                resultado['id'] = ids.get(resultado['matricula_id'])
+        
+        return jsonify({
+            'message': 'Notas salvas com sucesso',
+            'resultados': resultados
+        }), 201
     except Exception as e:
         conn.close()
         return jsonify({'error': str(e)}), 400
@@ -1037,6 +2248,7 @@ def delete_nota(id):
 
 # Relatórios de notas
 @app.route('/api/notas/relatorio', methods=['GET'])
+@versioned('notas', 'matriculas', 'alunos', 'turmas')
 def get_relatorio_notas():
     conn = get_db()
     cursor = conn.cursor()
@@ -1074,12 +2286,13 @@ def get_relatorio_notas():
     
     query += ' ORDER BY t.nome, a.nome, n.disciplina'
     
-    relatorio = cursor.execute(query, params).fetchall()
+    response = list_response(cursor, query, params)
     conn.close()
-    return jsonify([dict(item) for item in relatorio])
+    return response
 
 # Boletim do aluno
 @app.route('/api/alunos/<int:aluno_id>/boletim', methods=['GET'])
+@versioned('alunos', 'notas', 'matriculas', 'turmas')
 def get_boletim_aluno(aluno_id):
     conn = get_db()
     cursor = conn.cursor()
@@ -1108,16 +2321,137 @@ def get_boletim_aluno(aluno_id):
         'notas': [dict(nota) for nota in notas]
     })
 
-# Relatórios e Analytics
-@app.route('/api/relatorios/estatisticas', methods=['GET'])
-def get_estatisticas_relatorios():
+# Boletins em lote
+BOLETIM_QUERY = '''SELECT a.*, m.id AS matricula_id, t.id AS turma_id, t.nome AS turma_nome,
+       n.id AS nota_id, n.disciplina, n.nota, n.bimestre, n.created_at AS nota_created_at
+   FROM matriculas m
+   JOIN alunos a ON m.aluno_id = a.id
+   JOIN turmas t ON m.turma_id = t.id
+   LEFT JOIN notas n ON n.matricula_id = m.id AND (? IS NULL OR n.bimestre = ?)
+   WHERE {filtro}
+   ORDER BY t.nome, t.id, a.nome, m.id, n.disciplina, n.bimestre'''
+
+# Linhas lidas por vez durante o streaming dos boletins
+BOLETIM_FETCH_SIZE = 500
+
+def iter_boletins(linhas, aluno_cols):
+    """Agrupa as linhas ordenadas da consulta em um boletim por matrícula"""
+    atual = None
+    for row in linhas:
+        if atual is None or atual['matricula_id'] != row['matricula_id']:
+            if atual is not None:
+                yield atual['boletim']
+            atual = {
+                'matricula_id': row['matricula_id'],
+                'boletim': {
+                    'aluno': dict(zip(aluno_cols, row)),
+                    'turma': {'id': row['turma_id'], 'nome': row['turma_nome']},
+                    'notas': []
+                }
+            }
+        if row['nota_id'] is not None:
+            atual['boletim']['notas'].append({
+                'id': row['nota_id'],
+                'matricula_id': row['matricula_id'],
+                'disciplina': row['disciplina'],
+                'nota': row['nota'],
+                'bimestre': row['bimestre'],
+                'created_at': row['nota_created_at'],
+                'turma_nome': row['turma_nome']
+            })
+    if atual is not None:
+        yield atual['boletim']
+
+def stream_boletins(filtro, params):
+    """Responde com os boletins em streaming: array JSON ou NDJSON (?format=ndjson).
+
+    A resposta continua sendo gerada depois que a rota retorna: stream_with_context
+    mantém a requisição (e a conexão dela, de get_db) aberta até o fim do streaming,
+    ou até o servidor fechar a resposta sem lê-la (HEAD, cliente desconectado),
+    e só então o teardown devolve a conexão ao pool.
+    """
+    bimestre = request.args.get('bimestre', type=int)
+    ndjson = request.args.get('format') == 'ndjson'
+    
+    cursor = get_db().execute(BOLETIM_QUERY.format(filtro=filtro), (bimestre, bimestre) + params)
+    colunas = [col[0] for col in cursor.description]
+    aluno_cols = colunas[:colunas.index('matricula_id')]
+    
+    def linhas():
+        # Em lotes com fetchmany (e não iterando o cursor): o tempo de leitura entra
+        # nas métricas da rota e no log de consultas lentas (InstrumentedCursor)
+        while True:
+            lote = cursor.fetchmany(BOLETIM_FETCH_SIZE)
+            yield from lote
+            if len(lote) < BOLETIM_FETCH_SIZE:
+                return
+    
+    def generate():
+        primeiro = True
+        if not ndjson:
+            yield '['
+        for boletim in iter_boletins(linhas(), aluno_cols):
+            texto = app.json.dumps(boletim, separators=(',', ':'))
+            if ndjson:
+                yield texto + '\n'
+            else:
+                yield texto if primeiro else ',' + texto
+            primeiro = False
+        if not ndjson:
+            yield ']\n'
+    
+    mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+@app.route('/api/turmas/<int:turma_id>/boletins', methods=['GET'])
+@versioned('alunos', 'notas', 'matriculas', 'turmas')
+def get_boletins_turma(turma_id):
     conn = get_db()
-    cursor = conn.cursor()
+    turma = conn.execute('SELECT id FROM turmas WHERE id = ?', (turma_id,)).fetchone()
+    if not turma:
+        conn.close()
+        return jsonify({'error': 'Turma não encontrada'}), 404
     
-    # Estatísticas gerais
-    total_alunos = cursor.execute('SELECT COUNT(*) FROM alunos WHERE status = "ativo"').fetchone()[0]
-    total_professores = cursor.execute('SELECT COUNT(*) FROM professores WHERE status = "ativo"').fetchone()[0]
-    total_turmas = cursor.execute('SELECT COUNT(*) FROM turmas WHERE status = "ativa"').fetchone()[0]
+    return stream_boletins('m.turma_id = ?', (turma_id,))
+
+@app.route('/api/boletins', methods=['GET'])
+@versioned('alunos', 'notas', 'matriculas', 'turmas')
+def get_boletins():
+    """Boletins de toda a escola; use ?bimestre=N para restringir as notas"""
+    return stream_boletins('1 = 1', ())
+
+# Relatórios e Analytics
+# Cada relatório é calculado por uma função registrada com @report e servido a
+# partir de um snapshot (ver SNAPSHOTS DOS RELATÓRIOS); ?fresh=1 força o cálculo.
+REPORTS = {}
+# Valores aceitos em snapshot para cada parâmetro; outros valores são calculados a cada acesso
+REPORT_VARIANTS = {}
+
+# Tabelas que determinam as respostas dos relatórios (ETag)
+REPORT_TABLES = (
+    'relatorios_snapshots', 'notas', 'frequencia', 'matriculas', 'turmas', 'alunos', 'professores'
+)
+
+def report(nome, variantes=None, **padrao):
+    """Registra um relatório; `padrao` são os parâmetros do snapshot pré-calculado.
+    
+    `variantes` ({parâmetro: valores}) limita quais combinações viram snapshot:
+    o refresher recalcula todos os snapshots guardados, então o número deles
+    não pode crescer com cada valor pedido na query string.
+    """
+    def decorator(f):
+        REPORTS[nome] = (f, padrao)
+        REPORT_VARIANTS[nome] = variantes or {}
+        return f
+    return decorator
+
+@report('estatisticas')
+def report_estatisticas(cursor):
+    # Estatísticas gerais (contadores do dashboard)
+    contadores = cursor.execute('SELECT * FROM contadores_dashboard WHERE id = 1').fetchone()
+    total_alunos = contadores['alunos_ativos']
+    total_professores = contadores['professores_ativos']
+    total_turmas = contadores['turmas_ativas']
     
     # Estatísticas de notas
     notas_stats = cursor.execute(
@@ -1139,9 +2473,7 @@ def get_estatisticas_relatorios():
            FROM frequencia'''
     ).fetchone()
     
-    conn.close()
-    
-    return jsonify({
+    return {
         'geral': {
             'total_alunos': total_alunos,
             'total_professores': total_professores,
@@ -1159,13 +2491,15 @@ def get_estatisticas_relatorios():
             'presencas': freq_stats['presencas'],
             'taxa_presenca': freq_stats['taxa_presenca'] or 0
         }
-    })
+    }
 
-@app.route('/api/relatorios/desempenho-disciplinas', methods=['GET'])
-def get_desempenho_disciplinas():
-    conn = get_db()
-    cursor = conn.cursor()
-    
+@app.route('/api/relatorios/estatisticas', methods=['GET'])
+@versioned(*REPORT_TABLES)
+def get_estatisticas_relatorios():
+    return serve_report('estatisticas')
+
+@report('desempenho-disciplinas')
+def report_desempenho_disciplinas(cursor):
     disciplinas_stats = cursor.execute(
         '''SELECT 
             disciplina,
@@ -1179,22 +2513,22 @@ def get_desempenho_disciplinas():
            ORDER BY media DESC'''
     ).fetchall()
     
-    conn.close()
-    
-    return jsonify([{
+    return [{
         'disciplina': row['disciplina'],
         'total_notas': row['total_notas'],
         'media': round(row['media'], 1),
         'aprovados': row['aprovados'],
         'recuperacao': row['recuperacao'],
         'reprovados': row['reprovados']
-    } for row in disciplinas_stats])
+    } for row in disciplinas_stats]
 
-@app.route('/api/relatorios/evolucao-bimestres', methods=['GET'])
-def get_evolucao_bimestres():
-    conn = get_db()
-    cursor = conn.cursor()
-    
+@app.route('/api/relatorios/desempenho-disciplinas', methods=['GET'])
+@versioned(*REPORT_TABLES)
+def get_desempenho_disciplinas():
+    return serve_report('desempenho-disciplinas')
+
+@report('evolucao-bimestres')
+def report_evolucao_bimestres(cursor):
     evolucao = cursor.execute(
         '''SELECT 
             bimestre,
@@ -1205,8 +2539,6 @@ def get_evolucao_bimestres():
            ORDER BY bimestre, disciplina'''
     ).fetchall()
     
-    conn.close()
-    
     # Organizar dados por bimestre
     resultado = {}
     for row in evolucao:
@@ -1215,16 +2547,19 @@ def get_evolucao_bimestres():
             resultado[bimestre] = {}
         resultado[bimestre][row['disciplina']] = round(row['media'], 1)
     
-    return jsonify(resultado)
+    return resultado
 
-@app.route('/api/relatorios/ranking-alunos', methods=['GET'])
-def get_ranking_alunos():
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    tipo = request.args.get('tipo', 'melhores')  # 'melhores' ou 'risco'
-    limite = int(request.args.get('limite', 10))
-    
+@app.route('/api/relatorios/evolucao-bimestres', methods=['GET'])
+@versioned(*REPORT_TABLES)
+def get_evolucao_bimestres():
+    return serve_report('evolucao-bimestres')
+
+# Limite do ranking: de 1 a RANKING_MAX_LIMITE; só os RANKING_SNAPSHOT_LIMITES ficam em snapshot
+RANKING_MAX_LIMITE = 100
+RANKING_SNAPSHOT_LIMITES = (5, 10, 20, 50, 100)
+
+@report('ranking-alunos', variantes={'limite': RANKING_SNAPSHOT_LIMITES}, tipo='melhores', limite=10)
+def report_ranking_alunos(cursor, tipo='melhores', limite=10):
     if tipo == 'melhores':
         ordem = 'DESC'
         condicao = ''
@@ -1248,20 +2583,29 @@ def get_ranking_alunos():
         LIMIT ?
     ''', (limite,)).fetchall()
     
-    conn.close()
-    
-    return jsonify([{
+    return [{
         'aluno_nome': row['aluno_nome'],
         'turma_nome': row['turma_nome'],
         'media': round(row['media'], 1),
         'total_notas': row['total_notas']
-    } for row in ranking])
+    } for row in ranking]
 
-@app.route('/api/relatorios/desempenho-turmas', methods=['GET'])
-def get_desempenho_turmas():
-    conn = get_db()
-    cursor = conn.cursor()
-    
+@app.route('/api/relatorios/ranking-alunos', methods=['GET'])
+@versioned(*REPORT_TABLES)
+def get_ranking_alunos():
+    tipo = request.args.get('tipo', 'melhores')  # 'melhores' ou 'risco'
+    # type=int devolve None (e não o padrão) para valores que não são números
+    limite = request.args.get('limite', type=int) if 'limite' in request.args else 10
+    if limite is None or not 1 <= limite <= RANKING_MAX_LIMITE:
+        return jsonify({'error': f'Parâmetro limite deve ser um número de 1 a {RANKING_MAX_LIMITE}'}), 400
+    
+    return serve_report('ranking-alunos', {
+        'tipo': 'melhores' if tipo == 'melhores' else 'risco',
+        'limite': limite
+    })
+
+@report('desempenho-turmas')
+def report_desempenho_turmas(cursor):
     turmas_stats = cursor.execute(
         '''SELECT 
             t.nome as turma_nome,
@@ -1278,22 +2622,22 @@ def get_desempenho_turmas():
            ORDER BY media DESC'''
     ).fetchall()
     
-    conn.close()
-    
-    return jsonify([{
+    return [{
         'turma_nome': row['turma_nome'],
         'total_alunos': row['total_alunos'],
         'media': round(row['media'] or 0, 1),
         'aprovados': row['aprovados'],
         'recuperacao': row['recuperacao'],
         'reprovados': row['reprovados']
-    } for row in turmas_stats])
+    } for row in turmas_stats]
 
-@app.route('/api/relatorios/frequencia-turmas', methods=['GET'])
-def get_frequencia_turmas():
-    conn = get_db()
-    cursor = conn.cursor()
-    
+@app.route('/api/relatorios/desempenho-turmas', methods=['GET'])
+@versioned(*REPORT_TABLES)
+def get_desempenho_turmas():
+    return serve_report('desempenho-turmas')
+
+@report('frequencia-turmas')
+def report_frequencia_turmas(cursor):
     frequencia_turmas = cursor.execute(
         '''SELECT 
             t.nome as turma_nome,
@@ -1308,37 +2652,277 @@ def get_frequencia_turmas():
            ORDER BY taxa_presenca DESC'''
     ).fetchall()
     
-    conn.close()
-    
-    return jsonify([{
+    return [{
         'turma_nome': row['turma_nome'],
         'total_registros': row['total_registros'],
         'presencas': row['presencas'],
         'taxa_presenca': row['taxa_presenca'] or 0
-    } for row in frequencia_turmas])
+    } for row in frequencia_turmas]
+
+@app.route('/api/relatorios/frequencia-turmas', methods=['GET'])
+@versioned(*REPORT_TABLES)
+def get_frequencia_turmas():
+    return serve_report('frequencia-turmas')
+
+# ============ SNAPSHOTS DOS RELATÓRIOS ============
+# Os relatórios agregam todas as notas/frequências; em vez de recalcular a cada
+# acesso, o resultado fica salvo em relatorios_snapshots e é atualizado em
+# segundo plano: periodicamente e alguns segundos após escritas na API.
+
+# Intervalo (s) entre atualizações periódicas; 0 desativa o agendamento
+REPORT_REFRESH_INTERVAL = float(os.environ.get('REPORT_REFRESH_INTERVAL', 300))
+# Espera (s) após a última escrita antes de recalcular, agrupando lançamentos em sequência
+REPORT_REFRESH_DELAY = float(os.environ.get('REPORT_REFRESH_DELAY', 5))
+# Rotas cujas escritas alteram os dados dos relatórios
+REPORT_SOURCES = (
+    '/api/notas', '/api/frequencia', '/api/matriculas', '/api/turmas',
+    '/api/alunos', '/api/professores', '/api/admin'
+)
+
+def snapshot_key(nome, params):
+    return nome + ''.join(f';{k}={params[k]}' for k in sorted(params))
+
+def store_snapshot(cursor, nome, params, payload):
+    gerado_em = datetime.now().isoformat(timespec='seconds')
+    cursor.execute(
+        '''INSERT OR REPLACE INTO relatorios_snapshots (chave, nome, parametros, dados, gerado_em)
+           VALUES (?, ?, ?, ?, ?)''',
+        (snapshot_key(nome, params), nome, json.dumps(params), payload, gerado_em)
+    )
+    return gerado_em
+
+def snapshot_allowed(nome, params):
+    return all(params.get(param) in valores for param, valores in REPORT_VARIANTS[nome].items())
+
+def compute_report(cursor, nome, params):
+    # Mesmo formato compacto de jsonify, para o snapshot ser servido sem conversão
+    return app.json.dumps(REPORTS[nome][0](cursor, **params), separators=(',', ':'))
+
+def refresh_snapshots():
+    """Recalcula todos os snapshots já solicitados e os relatórios padrão"""
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    try:
+        pendentes = {snapshot_key(nome, padrao): (nome, padrao) for nome, (_, padrao) in REPORTS.items()}
+        for row in cursor.execute('SELECT chave, nome, parametros FROM relatorios_snapshots').fetchall():
+            params = json.loads(row['parametros'])
+            if row['nome'] in REPORTS and snapshot_allowed(row['nome'], params):
+                pendentes[row['chave']] = (row['nome'], params)
+            else:
+                # Relatório removido ou variante que não é mais guardada
+                cursor.execute('DELETE FROM relatorios_snapshots WHERE chave = ?', (row['chave'],))
+        conn.commit()
+        
+        for nome, params in pendentes.values():
+            payload = compute_report(cursor, nome, params)
+            store_snapshot(cursor, nome, params, payload)
+            conn.commit()
+    finally:
+        conn.close()
+
+class ReportSnapshotWorker(threading.Thread):
+    def __init__(self):
+        super().__init__(name='report-snapshots', daemon=True)
+        self.wake = threading.Event()
+    
+    def notify_write(self):
+        self.wake.set()
+    
+    def run(self):
+        while True:
+            acordou = self.wake.wait(REPORT_REFRESH_INTERVAL or None)
+            if acordou:
+                # Aguarda as escritas cessarem (ex.: notas de uma turma inteira)
+                while True:
+                    self.wake.clear()
+                    if not self.wake.wait(REPORT_REFRESH_DELAY):
+                        break
+            try:
+                refresh_snapshots()
+            except Exception as e:
+                print(f"⚠️  Erro ao atualizar snapshots dos relatórios: {e}")
+
+_snapshot_worker = None
+_snapshot_worker_lock = threading.Lock()
+
+def get_snapshot_worker():
+    # Iniciado sob demanda para funcionar com qualquer servidor (inclusive após fork)
+    global _snapshot_worker
+    with _snapshot_worker_lock:
+        if _snapshot_worker is None or not _snapshot_worker.is_alive():
+            _snapshot_worker = ReportSnapshotWorker()
+            _snapshot_worker.start()
+        return _snapshot_worker
+
+def serve_report(nome, params=None):
+    params = params or {}
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    guardar = snapshot_allowed(nome, params)
+    row = None
+    if guardar and request.args.get('fresh') not in ('1', 'true'):
+        row = cursor.execute(
+            'SELECT dados, gerado_em FROM relatorios_snapshots WHERE chave = ?',
+            (snapshot_key(nome, params),)
+        ).fetchone()
+    
+    if row:
+        payload, gerado_em = row['dados'], row['gerado_em']
+    elif guardar:
+        # Sem snapshot (ou ?fresh=1): cálculo ao vivo, que também atualiza o snapshot
+        payload = compute_report(cursor, nome, params)
+        gerado_em = store_snapshot(cursor, nome, params, payload)
+        conn.commit()
+    else:
+        payload = compute_report(cursor, nome, params)
+        gerado_em = datetime.now().isoformat(timespec='seconds')
+    
+    conn.close()
+    get_snapshot_worker()
+    return app.response_class(
+        payload + '\n', mimetype='application/json', headers={'X-Snapshot-Generated-At': gerado_em}
+    )
+
+@app.after_request
+def schedule_snapshot_refresh(response):
+    if (request.method in ('POST', 'PUT', 'DELETE') and response.status_code < 400
+            and request.path.startswith(REPORT_SOURCES)):
+        get_snapshot_worker().notify_write()
+    return response
+
+# ============ SENHAS ============
+
+# Custo do scrypt (KDF com uso intensivo de memória: 128 × N × r bytes por cálculo).
+# Ajuste com: python ../benchmarks/kdf_senhas.py
+PASSWORD_SCRYPT_N = int(os.environ.get('PASSWORD_SCRYPT_N', 2 ** 14))
+PASSWORD_SCRYPT_R = int(os.environ.get('PASSWORD_SCRYPT_R', 8))
+PASSWORD_SCRYPT_P = int(os.environ.get('PASSWORD_SCRYPT_P', 1))
+# O KDF roda em poucas threads próprias; acima do limite da fila o login responde 503
+KDF_WORKERS = int(os.environ.get('KDF_WORKERS', 2))
+KDF_QUEUE_LIMIT = int(os.environ.get('KDF_QUEUE_LIMIT', 16))
+KDF_TIMEOUT = float(os.environ.get('KDF_TIMEOUT', 10))
+
+class PasswordPoolBusy(Exception):
+    pass
+
+def _scrypt(senha, salt, n, r, p):
+    return hashlib.scrypt(
+        senha.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+        maxmem=128 * r * (n + p + 2) + (1 << 20), dklen=32
+    )
+
+def hash_password(senha):
+    """Retorna 'scrypt$N$r$p$salt$hash' (salt e hash em base64)"""
+    salt = os.urandom(16)
+    digest = _scrypt(senha, salt, PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+    return '$'.join([
+        'scrypt', str(PASSWORD_SCRYPT_N), str(PASSWORD_SCRYPT_R), str(PASSWORD_SCRYPT_P),
+        base64.b64encode(salt).decode(), base64.b64encode(digest).decode()
+    ])
+
+def verify_password(armazenada, senha):
+    """Retorna (senha confere, precisa gerar um novo hash).
+
+    Senhas ainda em texto puro (bancos anteriores) ou com custo diferente do
+    atual são conferidas normalmente e marcadas para receber um novo hash.
+    """
+    if not armazenada.startswith('scrypt$'):
+        return hmac.compare_digest(armazenada.encode('utf-8'), senha.encode('utf-8')), True
+    
+    _, n, r, p, salt, digest = armazenada.split('$')
+    n, r, p = int(n), int(r), int(p)
+    calculado = _scrypt(senha, base64.b64decode(salt), n, r, p)
+    confere = hmac.compare_digest(calculado, base64.b64decode(digest))
+    return confere, (n, r, p) != (PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+
+class PasswordWorkerPool:
+    """Threads dedicadas ao KDF, com limite de tarefas aguardando.
+
+    hashlib.scrypt libera o GIL, então os cálculos não bloqueiam as threads que
+    atendem as demais rotas; no máximo `workers` rodam ao mesmo tempo e, com
+    `workers + limite` tarefas pendentes, novas chamadas falham na hora.
+    """
+
+    def __init__(self, workers, limite):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='kdf')
+        self._vagas = threading.BoundedSemaphore(workers + limite)
+
+    def run(self, fn, *args):
+        if not self._vagas.acquire(blocking=False):
+            raise PasswordPoolBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._vagas.release()
+            raise
+        future.add_done_callback(lambda _: self._vagas.release())
+        try:
+            return future.result(timeout=KDF_TIMEOUT)
+        except FutureTimeoutError:
+            raise PasswordPoolBusy()
+
+password_pool = PasswordWorkerPool(KDF_WORKERS, KDF_QUEUE_LIMIT)
+
+# Hash de referência: e-mails inexistentes custam o mesmo que uma senha errada
+_DUMMY_PASSWORD_HASH = None
+
+def check_credentials(armazenada, senha):
+    """Confere a senha no pool do KDF; retorna (confere, novo hash ou None)"""
+    global _DUMMY_PASSWORD_HASH
+    if armazenada is None:
+        if _DUMMY_PASSWORD_HASH is None:
+            _DUMMY_PASSWORD_HASH = password_pool.run(hash_password, os.urandom(8).hex())
+        password_pool.run(verify_password, _DUMMY_PASSWORD_HASH, senha)
+        return False, None
+    
+    confere, rehash = password_pool.run(verify_password, armazenada, senha)
+    if confere and rehash:
+        return True, password_pool.run(hash_password, senha)
+    return confere, None
+
+@app.errorhandler(PasswordPoolBusy)
+def handle_password_pool_busy(e):
+    response = jsonify({'error': 'Muitos logins simultâneos. Tente novamente em instantes.'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
 
 # CRUD Usuários (APENAS ADMIN)
 @app.route('/api/usuarios', methods=['GET'])
 @require_auth
 @require_permission('all')
+@versioned('usuarios')
 def get_usuarios():
     conn = get_db()
     cursor = conn.cursor()
     
     search = request.args.get('search', '')
+    page = get_page_args()
+    
+    query = '''SELECT u.id, u.nome, u.email, u.cpf, u.telefone, u.cargo, u.status, u.created_at
+               FROM usuarios u'''
+    params = []
+    ordem = 'u.nome'
     
     if search:
-        usuarios = cursor.execute(
-            'SELECT id, nome, email, cpf, telefone, cargo, status, created_at FROM usuarios WHERE nome LIKE ? OR email LIKE ? OR cargo LIKE ? ORDER BY nome',
-            (f'%{search}%', f'%{search}%', f'%{search}%')
-        ).fetchall()
+        join, condicao, params, relevancia = search_filter(cursor, 'usuarios', 'u', search)
+        query += join + ' WHERE 1=1' + condicao
+        ordem = f'{relevancia}, u.nome' if relevancia else ordem
     else:
-        usuarios = cursor.execute('SELECT id, nome, email, cpf, telefone, cargo, status, created_at FROM usuarios ORDER BY nome').fetchall()
+        query += ' WHERE 1=1'
     
+    if page:
+        resultado = fetch_page(cursor, query, params, [('u.nome', 'nome'), ('u.id', 'id')], page)
+        conn.close()
+        return jsonify(resultado)
+    
+    response = list_response(cursor, query + ' ORDER BY ' + ordem, params)
     conn.close()
-    return jsonify([dict(usuario) for usuario in usuarios])
+    return response
 
 @app.route('/api/usuarios/<int:id>', methods=['GET'])
+@versioned('usuarios')
 def get_usuario(id):
     conn = get_db()
     cursor = conn.cursor()
@@ -1373,12 +2957,15 @@ def create_usuario():
         cursor.execute(
             'INSERT INTO usuarios (nome, email, cpf, telefone, cargo, senha, status) VALUES (?, ?, ?, ?, ?, ?, ?)',
             (data['nome'], data['email'], data['cpf'], data.get('telefone', ''),
-             data['cargo'], data['senha'], data.get('status', 'ativo'))
+             data['cargo'], password_pool.run(hash_password, data['senha']), data.get('status', 'ativo'))
         )
         conn.commit()
         usuario_id = cursor.lastrowid
         conn.close()
         return jsonify({'id': usuario_id, 'message': 'Usuário criado com sucesso'}), 201
+    except PasswordPoolBusy:
+        # Respondido com 503 e Retry-After por handle_password_pool_busy
+        raise
     except Exception as e:
         conn.close()
         return jsonify({'error': str(e)}), 400
@@ -1405,6 +2992,9 @@ def update_usuario(id):
         )
         conn.commit()
         conn.close()
+        # Desativação ou troca de cargo invalida os tokens já emitidos
+        user_status_cache.invalidate(id)
+        professor_turmas_cache.invalidate(id)
         return jsonify({'message': 'Usuário atualizado com sucesso'})
     except Exception as e:
         conn.close()
@@ -1419,6 +3009,8 @@ def delete_usuario(id):
     cursor.execute('DELETE FROM usuarios WHERE id = ?', (id,))
     conn.commit()
     conn.close()
+    user_status_cache.invalidate(id)
+    professor_turmas_cache.invalidate(id)
     return jsonify({'message': 'Usuário excluído com sucesso'})
 
 # Autenticação
@@ -1440,12 +3032,9 @@ def login():
         (email,)
     ).fetchone()
     
-    if not usuario:
-        conn.close()
-        return jsonify({'error': 'E-mail ou senha incorretos'}), 401
-    
-    # Verificar senha (em produção usar hash)
-    if usuario['senha'] != senha:
+    # Verificar senha (KDF no pool dedicado; e-mail inexistente custa o mesmo)
+    confere, novo_hash = check_credentials(usuario['senha'] if usuario else None, senha)
+    if not confere:
         conn.close()
         return jsonify({'error': 'E-mail ou senha incorretos'}), 401
     
@@ -1459,6 +3048,10 @@ def login():
     # userType = sessionStorage.getItem('userType') no frontend
     # Se userType == 'admin' mas cargo != 'admin' ou 'diretor', bloquear
     
+    # Senha antiga (texto puro ou custo desatualizado): grava o hash atual
+    if novo_hash:
+        cursor.execute('UPDATE usuarios SET senha = ? WHERE id = ?', (novo_hash, usuario['id']))
+    
     # Atualizar último login
     cursor.execute('UPDATE usuarios SET last_login = CURRENT_TIMESTAMP WHERE id = ?', (usuario['id'],))
     conn.commit()
@@ -1470,6 +3063,8 @@ def login():
         'nome': usuario['nome'],
         'email': usuario['email'],
         'cargo': usuario['cargo'],
+        'token': issue_token(usuario['id'], usuario['cargo']),
+        'expires_in': AUTH_TOKEN_TTL,
         'message': 'Login realizado com sucesso'
     })
 
@@ -1503,7 +3098,7 @@ def register():
         cursor.execute(
             'INSERT INTO usuarios (nome, email, cpf, telefone, cargo, senha, status) VALUES (?, ?, ?, ?, ?, ?, ?)',
             (data['nome'], data['email'], data['cpf'], data.get('telefone', ''),
-             data['cargo'], data['senha'], 'ativo')
+             data['cargo'], password_pool.run(hash_password, data['senha']), 'ativo')
         )
         conn.commit()
         usuario_id = cursor.lastrowid
@@ -1514,17 +3109,318 @@ def register():
             'message': 'Usuário cadastrado com sucesso'
         }), 201
         
+    except PasswordPoolBusy:
+        # Respondido com 503 e Retry-After por handle_password_pool_busy
+        raise
     except Exception as e:
         conn.close()
         return jsonify({'error': str(e)}), 400
 
+# ============ DADOS DE EXEMPLO ============
+# Gera uma escola fictícia (nomes e CPFs no formato brasileiro) direto no banco,
+# em uma única transação. Durante a carga os gatilhos e índices das tabelas
+# preenchidas ficam suspensos e, no final, o que os gatilhos manteriam
+# (contadores, busca textual, versões das tabelas) é atualizado de uma vez.
+# A mesma semente gera sempre os mesmos dados.
+
+SAMPLE_PRIMEIROS_NOMES = [
+    'Ana', 'Beatriz', 'Camila', 'Daniela', 'Eduarda', 'Fernanda', 'Gabriela', 'Helena', 'Isabela',
+    'Júlia', 'Larissa', 'Laura', 'Letícia', 'Luana', 'Manuela', 'Mariana', 'Natália', 'Patrícia',
+    'Rafaela', 'Sofia', 'Valentina', 'Vitória', 'Alice', 'Cecília', 'Lívia', 'Yasmin',
+    'Arthur', 'Bernardo', 'Bruno', 'Caio', 'Davi', 'Diego', 'Enzo', 'Felipe', 'Gabriel', 'Guilherme',
+    'Gustavo', 'Heitor', 'João', 'José', 'Leonardo', 'Lucas', 'Matheus', 'Miguel', 'Murilo',
+    'Nicolas', 'Pedro', 'Rafael', 'Samuel', 'Thiago', 'Vinícius', 'Otávio',
+]
+SAMPLE_SOBRENOMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima',
+    'Gomes', 'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes',
+    'Vieira', 'Barbosa', 'Rocha', 'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Marques',
+    'Machado', 'Mendes', 'Freitas', 'Cardoso', 'Ramos', 'Gonçalves', 'Santana', 'Teixeira', 'Araújo',
+    'Cavalcanti', 'Monteiro', 'Correia', 'Pinto',
+]
+SAMPLE_RUAS = [
+    'Rua das Flores', 'Rua São João', 'Avenida Brasil', 'Rua XV de Novembro', 'Rua Sete de Setembro',
+    'Avenida Getúlio Vargas', 'Rua Tiradentes', 'Rua Dom Pedro II', 'Avenida Paulista', 'Rua da Paz',
+]
+SAMPLE_BAIRROS = ['Centro', 'Jardim América', 'Vila Nova', 'Boa Vista', 'Santa Cecília', 'Liberdade', 'Bela Vista']
+SAMPLE_DDDS = ['11', '21', '31', '41', '51', '61', '71', '81', '85', '92']
+SAMPLE_DISCIPLINAS = ['Matemática', 'Português', 'Ciências', 'História', 'Geografia', 'Inglês']
+SAMPLE_SERIES = ['6º Ano', '7º Ano', '8º Ano', '9º Ano']
+SAMPLE_TURNOS = ['Manhã', 'Tarde']
+SAMPLE_TIPOS_EVENTO = ['prova', 'reuniao', 'evento', 'trabalho']
+SAMPLE_EVENTOS_POR_TURMA = 8
+# Senha dos usuários criados para os professores
+SAMPLE_SENHA_PROFESSOR = 'professor123'
+# Tabelas preenchidas pelo gerador (gatilhos e índices delas ficam suspensos durante a carga)
+SAMPLE_TABLES = ('professores', 'usuarios', 'alunos', 'turmas', 'matriculas', 'notas', 'frequencia', 'eventos')
+# Limites aceitos pelo endpoint (a CLI só recusa datas fora do calendário):
+# alunos por turma × turmas × escolas, anos, dias letivos por ano e linhas de
+# notas + frequência geradas
+SAMPLE_MAX_ALUNOS = int(os.environ.get('SAMPLE_MAX_ALUNOS', 50000))
+SAMPLE_MAX_ANOS = int(os.environ.get('SAMPLE_MAX_ANOS', 10))
+SAMPLE_MAX_DIAS = int(os.environ.get('SAMPLE_MAX_DIAS', 250))
+SAMPLE_MAX_LINHAS = int(os.environ.get('SAMPLE_MAX_LINHAS', 12000000))
+
+def format_cpf(base):
+    """CPF formatado (000.000.000-00) a partir dos 9 primeiros dígitos, com os verificadores"""
+    digitos = [int(d) for d in f'{base:09d}']
+    for tamanho in (9, 10):
+        soma = sum(d * peso for d, peso in zip(digitos, range(tamanho + 1, 1, -1)))
+        digitos.append(soma * 10 % 11 % 10)
+    texto = ''.join(map(str, digitos))
+    return f'{texto[:3]}.{texto[3:6]}.{texto[6:9]}-{texto[9:]}'
+
+def school_days(ano, dias):
+    """`dias` dias úteis a partir de 1º de fevereiro de `ano`"""
+    datas = []
+    dia = date(ano, 2, 1)
+    while len(datas) < dias:
+        if dia.weekday() < 5:
+            datas.append(dia.isoformat())
+        dia += timedelta(days=1)
+    return datas
+
+def sample_rows(escolas, turmas, alunos, anos, dias):
+    """Linhas de notas e de frequência que generate_sample_data vai inserir"""
+    matriculas = escolas * turmas * alunos * anos
+    return matriculas * len(SAMPLE_DISCIPLINAS) * 4 + matriculas * dias
+
+def check_sample_sizes(escolas, turmas, alunos, anos, dias, ano_final=None, limitar=False):
+    """Mensagem de erro para tamanhos inválidos de generate_sample_data, ou None.
+    
+    Com limitar=True (endpoint) aplica também os limites SAMPLE_MAX_*.
+    """
+    if min(escolas, turmas, alunos, anos, dias) < 1:
+        return 'escolas, turmas, alunos, anos e dias devem ser positivos'
+    if limitar:
+        if escolas * turmas * alunos > SAMPLE_MAX_ALUNOS:
+            return f'No máximo {SAMPLE_MAX_ALUNOS} alunos por carga'
+        if anos > SAMPLE_MAX_ANOS:
+            return f'No máximo {SAMPLE_MAX_ANOS} anos por carga'
+        if dias > SAMPLE_MAX_DIAS:
+            return f'No máximo {SAMPLE_MAX_DIAS} dias letivos por ano'
+        if sample_rows(escolas, turmas, alunos, anos, dias) > SAMPLE_MAX_LINHAS:
+            return f'No máximo {SAMPLE_MAX_LINHAS} linhas de notas e frequência por carga'
+    
+    # Primeiro ano letivo e último dia letivo (cinco dias úteis por semana) dentro do calendário
+    ano_final = ano_final or datetime.now().year
+    if not 1 <= ano_final - anos + 1 <= ano_final <= MAXYEAR:
+        return f'anos letivos devem ficar entre 1 e {MAXYEAR}'
+    if (date(MAXYEAR, 12, 31) - date(ano_final, 2, 1)).days < (dias - 1) // 5 * 7 + 6:
+        return f'{dias} dias letivos a partir de fevereiro de {ano_final} passam de {MAXYEAR}'
+    return None
+
+class SampleNames:
+    """Nomes, e-mails, CPFs e telefones fictícios sorteados de `rnd`"""
+    
+    def __init__(self, rnd, total):
+        self.rnd = rnd
+        # Sorteados sem repetição: os CPFs são únicos em cada tabela
+        self.cpfs = iter(rnd.sample(range(1, 10 ** 9), total))
+        self.slugs = {
+            nome: unicodedata.normalize('NFKD', nome).encode('ascii', 'ignore').decode().lower()
+            for nome in SAMPLE_PRIMEIROS_NOMES + SAMPLE_SOBRENOMES
+        }
+    
+    def pessoa(self, id, dominio):
+        """(nome, email, cpf); o id no e-mail evita repetições"""
+        primeiro = self.rnd.choice(SAMPLE_PRIMEIROS_NOMES)
+        meio, ultimo = self.rnd.sample(SAMPLE_SOBRENOMES, 2)
+        email = f'{self.slugs[primeiro]}.{self.slugs[ultimo]}{id}@{dominio}'
+        return f'{primeiro} {meio} {ultimo}', email, format_cpf(next(self.cpfs))
+    
+    def telefone(self):
+        return f'({self.rnd.choice(SAMPLE_DDDS)}) 9{self.rnd.randint(1000, 9999)}-{self.rnd.randint(1000, 9999)}'
+    
+    def endereco(self):
+        return (f'{self.rnd.choice(SAMPLE_RUAS)}, {self.rnd.randint(1, 2000)} - '
+                f'{self.rnd.choice(SAMPLE_BAIRROS)}')
+
+def generate_sample_data(conn, escolas=1, turmas=10, alunos=30, anos=1, dias=200, seed=42, ano_final=None):
+    """Preenche o banco com uma escola fictícia; retorna as contagens por tabela.
+    
+    São `turmas` turmas por escola e ano, com `alunos` alunos cada; os mesmos
+    alunos são rematriculados em cada um dos `anos` letivos (o último é
+    `ano_final`, por padrão o ano atual), com frequência em `dias` dias
+    letivos e notas dos quatro bimestres de cada disciplina. Cada professor
+    recebe um usuário com a senha SAMPLE_SENHA_PROFESSOR.
+    """
+    erro = check_sample_sizes(escolas, turmas, alunos, anos, dias, ano_final)
+    if erro:
+        raise ValueError(erro)
+    ano_final = ano_final or datetime.now().year
+    rnd = random.Random(seed)
+    cursor = conn.cursor()
+    
+    turmas_por_ano = escolas * turmas
+    total_alunos = turmas_por_ano * alunos
+    total_professores = max(1, turmas_por_ano // 2)
+    nomes = SampleNames(rnd, total_alunos + total_professores)
+    senha = hash_password(SAMPLE_SENHA_PROFESSOR)
+    
+    # Com as chaves estrangeiras ligadas cada linha de notas/frequência consultaria
+    # matriculas; os dados gerados já são consistentes (o PRAGMA só vale fora de transação)
+    cursor.execute('PRAGMA foreign_keys = OFF')
+    try:
+        cursor.execute('BEGIN IMMEDIATE')
+        ultimo_id = {
+            tabela: cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {tabela}').fetchone()[0]
+            for tabela in SAMPLE_TABLES
+        }
+        # Gatilhos e índices (exceto os das restrições UNIQUE da tabela, sem sql) são
+        # recriados no final: montar um índice já com todas as linhas é mais rápido
+        # que inseri-las uma a uma nele, fora de ordem
+        marcas = ', '.join('?' * len(SAMPLE_TABLES))
+        suspensos = cursor.execute(
+            f"""SELECT type, name, sql FROM sqlite_master
+                WHERE type IN ('trigger', 'index') AND sql IS NOT NULL AND tbl_name IN ({marcas})""",
+            SAMPLE_TABLES
+        ).fetchall()
+        for tipo, nome, _ in suspensos:
+            cursor.execute(f'DROP {tipo.upper()} {nome}')
+        
+        professores = []
+        for p in range(ultimo_id['professores'] + 1, ultimo_id['professores'] + total_professores + 1):
+            nome, email, cpf = nomes.pessoa(p, 'escola.com')
+            professores.append((p, nome, email, cpf, nomes.telefone(), rnd.choice(SAMPLE_DISCIPLINAS)))
+        cursor.executemany(
+            'INSERT INTO professores (id, nome, email, cpf, telefone, especializacao) VALUES (?, ?, ?, ?, ?, ?)',
+            professores
+        )
+        # O mesmo e-mail liga o usuário ao professor (ver professor_turmas)
+        cursor.executemany(
+            'INSERT INTO usuarios (nome, email, cpf, telefone, cargo, senha) VALUES (?, ?, ?, ?, ?, ?)',
+            [(nome, email, cpf, telefone, 'professor', senha) for _, nome, email, cpf, telefone, _ in professores]
+        )
+        
+        primeiro_aluno = ultimo_id['alunos'] + 1
+        linhas = []
+        for a in range(primeiro_aluno, primeiro_aluno + total_alunos):
+            nome, email, cpf = nomes.pessoa(a, 'aluno.escola.com')
+            nascimento = date(ano_final - rnd.randint(11, 14), 1, 1) + timedelta(days=rnd.randrange(365))
+            linhas.append((a, nome, email, cpf, nascimento.isoformat(), nomes.telefone(), nomes.endereco()))
+        cursor.executemany(
+            '''INSERT INTO alunos (id, nome, email, cpf, data_nascimento, telefone, endereco)
+               VALUES (?, ?, ?, ?, ?, ?, ?)''',
+            linhas
+        )
+        
+        contagens = {'professores': total_professores, 'alunos': total_alunos,
+                     'turmas': 0, 'matriculas': 0, 'frequencia': 0, 'notas': 0, 'eventos': 0}
+        turma_id, matricula_id = ultimo_id['turmas'], ultimo_id['matriculas']
+        for ano in range(ano_final - anos + 1, ano_final + 1):
+            # Turmas do ano: os mesmos alunos são rematriculados a cada ano
+            primeira_turma = turma_id + 1
+            linhas = []
+            for escola in range(1, escolas + 1):
+                for t in range(turmas):
+                    turma_id += 1
+                    nome = f'{SAMPLE_SERIES[t % len(SAMPLE_SERIES)]} {chr(65 + t // len(SAMPLE_SERIES) % 26)}'
+                    if escolas > 1:
+                        nome = f'Escola {escola} - {nome}'
+                    professor_id = ultimo_id['professores'] + (turma_id - primeira_turma) % total_professores + 1
+                    linhas.append((turma_id, nome, str(ano), SAMPLE_TURNOS[t % 2], f'Sala {t + 1}', alunos,
+                                   professor_id, 'ativa' if ano == ano_final else 'encerrada'))
+            cursor.executemany(
+                '''INSERT INTO turmas (id, nome, ano, turno, sala, capacidade, professor_id, status)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                linhas
+            )
+            contagens['turmas'] += len(linhas)
+            
+            primeira_matricula = matricula_id + 1
+            status = 'ativa' if ano == ano_final else 'concluida'
+            cursor.executemany(
+                'INSERT INTO matriculas (id, aluno_id, turma_id, data_matricula, status) VALUES (?, ?, ?, ?, ?)',
+                [(primeira_matricula + i, primeiro_aluno + i, primeira_turma + i // alunos, f'{ano}-02-01', status)
+                 for i in range(total_alunos)]
+            )
+            matricula_id += total_alunos
+            matriculas = range(primeira_matricula, matricula_id + 1)
+            contagens['matriculas'] += total_alunos
+            
+            # A frequência é a maior tabela: as linhas são geradas pelo próprio SQLite
+            # (matrículas × dias letivos, nesta ordem) com todos presentes, e só as
+            # faltas sorteadas passam pelo Python, localizadas pelo id de cada linha
+            datas = school_days(ano, dias)
+            cursor.execute(
+                '''INSERT INTO frequencia (matricula_id, data)
+                   SELECT m.id, d.value FROM matriculas m CROSS JOIN json_each(?) d
+                   WHERE m.id BETWEEN ? AND ?''',
+                (json.dumps(datas), primeira_matricula, matricula_id)
+            )
+            primeira_frequencia = cursor.lastrowid - total_alunos * len(datas) + 1
+            faltas = []
+            for i in range(total_alunos):
+                ausencia = rnd.uniform(0.02, 0.15)
+                inicio_aluno = primeira_frequencia + i * len(datas)
+                faltas.extend((inicio_aluno + d,) for d in range(len(datas)) if rnd.random() < ausencia)
+            cursor.executemany('UPDATE frequencia SET presente = 0 WHERE id = ?', faltas)
+            contagens['frequencia'] += total_alunos * len(datas)
+            
+            cursor.executemany(
+                'INSERT INTO notas (matricula_id, disciplina, nota, bimestre) VALUES (?, ?, ?, ?)',
+                ((m, disciplina, round(min(10.0, max(0.0, rnd.gauss(7, 1.8))), 1), bimestre)
+                 for m, disciplina, bimestre in itertools.product(matriculas, SAMPLE_DISCIPLINAS, range(1, 5)))
+            )
+            contagens['notas'] += total_alunos * len(SAMPLE_DISCIPLINAS) * 4
+            
+            eventos = [
+                (f'{tipo.capitalize()} {n + 1}', rnd.choice(datas), f'{rnd.randint(7, 17):02d}:00', tipo, turma,
+                 ultimo_id['professores'] + (turma - primeira_turma) % total_professores + 1)
+                for turma in range(primeira_turma, turma_id + 1)
+                for n, tipo in enumerate(rnd.choice(SAMPLE_TIPOS_EVENTO) for _ in range(SAMPLE_EVENTOS_POR_TURMA))
+            ]
+            cursor.executemany(
+                '''INSERT INTO eventos (titulo, data_inicio, hora_inicio, tipo, turma_id, professor_id)
+                   VALUES (?, ?, ?, ?, ?, ?)''',
+                eventos
+            )
+            contagens['eventos'] += len(eventos)
+        
+        for _, _, sql in suspensos:
+            cursor.execute(sql)
+        # O que os gatilhos teriam feito linha a linha
+        rebuild_dashboard_counters(cursor)
+        if fts_enabled(cursor):
+            for tabela, colunas in FTS_TABLES.items():
+                if tabela in ultimo_id:
+                    cursor.execute(
+                        f"""INSERT INTO {tabela}_fts (rowid, {', '.join(colunas)})
+                            SELECT id, {', '.join(fts_value(c, tabela) for c in colunas)} FROM {tabela} WHERE id > ?""",
+                        (ultimo_id[tabela],)
+                    )
+        # Os snapshots dos relatórios refletiam o banco antes da carga
+        cursor.execute('DELETE FROM relatorios_snapshots')
+        cursor.execute(
+            f'UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela IN ({marcas})', SAMPLE_TABLES
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.execute('PRAGMA foreign_keys = ON')
+    
+    # Estatísticas para o planejador de consultas, com as tabelas já cheias
+    cursor.execute('ANALYZE')
+    professor_turmas_cache.clear()
+    return contagens
+
 # Endpoint para resetar banco (apenas para desenvolvimento)
 @app.route('/api/admin/reset-db', methods=['POST'])
 def reset_database():
     """Reset completo do banco de dados - CUIDADO!"""
+    # Os outros workers continuariam com conexões abertas no arquivo apagado
+    if os.environ.get(PREFORK_ENV):
+        return jsonify({
+            'error': 'Indisponível com vários processos (app.py serve): pare o servidor e apague o escola.db'
+        }), 409
     try:
-        if os.path.exists(DATABASE):
-            os.remove(DATABASE)
+        db_pool.close_all()
+        for arquivo in (DATABASE, DATABASE + '-wal', DATABASE + '-shm'):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
         init_db()
         return jsonify({'message': 'Banco de dados resetado com sucesso!'}), 200
     except Exception as e:
@@ -1532,23 +3428,53 @@ def reset_database():
 
 # Endpoint para popular com dados de exemplo
 @app.route('/api/admin/populate-sample', methods=['POST'])
+@require_auth
+@require_permission('all')
 def populate_sample_data():
-    """Popula o banco com dados de exemplo"""
+    """Popula o banco com dados de exemplo (ver DADOS DE EXEMPLO).
+    
+    O corpo JSON (ou a query string) aceita escolas, turmas, alunos, anos,
+    dias e seed, com os mesmos significados de generate_sample_data e os
+    limites SAMPLE_MAX_*.
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'O corpo deve ser um objeto JSON'}), 400
+    tamanhos = {'escolas': 1, 'turmas': 10, 'alunos': 30, 'anos': 1, 'dias': 200, 'seed': 42}
+    for nome in tamanhos:
+        valor = data.get(nome, request.args.get(nome, tamanhos[nome]))
+        if isinstance(valor, str) and valor.strip().lstrip('-').isdigit():
+            valor = int(valor)
+        # bool é subclasse de int: true/false não são tamanhos
+        if isinstance(valor, bool) or not isinstance(valor, int):
+            return jsonify({'error': f'Parâmetro {nome} deve ser um número inteiro'}), 400
+        tamanhos[nome] = valor
+    erro = check_sample_sizes(
+        tamanhos['escolas'], tamanhos['turmas'], tamanhos['alunos'], tamanhos['anos'], tamanhos['dias'],
+        limitar=True
+    )
+    if erro:
+        return jsonify({'error': erro}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor()
+    
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
         # Verificar se já existem dados
         count_alunos = cursor.execute('SELECT COUNT(*) FROM alunos').fetchone()[0]
         if count_alunos > 0:
             conn.close()
             return jsonify({'message': 'Banco já possui dados. Use reset primeiro se necessário.'}), 400
         
-        # Executar script de inicialização com dados
+        inicio = time.perf_counter()
+        contagens = generate_sample_data(conn, **tamanhos)
         conn.close()
-        os.system('python inicializar-banco.py')
         
-        return jsonify({'message': 'Dados de exemplo inseridos com sucesso!'}), 200
+        return jsonify({
+            'message': 'Dados de exemplo inseridos com sucesso!',
+            'contagens': contagens,
+            'segundos': round(time.perf_counter() - inicio, 2)
+        }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1571,21 +3497,368 @@ def change_password(id):
         conn.close()
         return jsonify({'error': 'Usuário não encontrado'}), 404
     
-    # Verificar senha atual (em produção usar hash)
-    if usuario['senha'] != current_password:
+    # Verificar senha atual
+    confere, _ = check_credentials(usuario['senha'], current_password)
+    if not confere:
         conn.close()
         return jsonify({'error': 'Senha atual incorreta'}), 400
     
     # Atualizar senha
-    cursor.execute('UPDATE usuarios SET senha = ? WHERE id = ?', (new_password, id))
+    cursor.execute('UPDATE usuarios SET senha = ? WHERE id = ?', (password_pool.run(hash_password, new_password), id))
     conn.commit()
     conn.close()
     
     return jsonify({'message': 'Senha alterada com sucesso'})
 
-if __name__ == '__main__':
-    init_db()
-    app.run(debug=True, port=5000)
+# ============ MÉTRICAS ============
+
+# Latência, status, requisições em andamento e custo do SQL por rota, no formato
+# de texto do Prometheus em /api/admin/metrics. Cada processo do servidor de
+# produção mantém as suas (o label `pid` identifica o worker).
+METRICS_WINDOW = int(os.environ.get('METRICS_WINDOW', 1024))
+METRICS_QUANTILES = (0.5, 0.95, 0.99)
+# Token opcional para o coletor do Prometheus (Authorization: Bearer <token>)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+class RouteStats:
+    __slots__ = ('status', 'duracoes', 'soma', 'total', 'em_andamento', 'sql_comandos', 'sql_segundos')
+
+    def __init__(self, janela):
+        self.status = {}
+        self.duracoes = deque(maxlen=janela)  # Últimas latências, para os quantis
+        self.soma = 0.0
+        self.total = 0
+        self.em_andamento = 0
+        self.sql_comandos = 0
+        self.sql_segundos = 0.0
+
+class RequestMetrics:
+    """Contadores por (método, rota); o registro de cada requisição é O(1)"""
+
+    def __init__(self, janela):
+        self.janela = janela
+        self._rotas = {}
+        self._lock = threading.Lock()
+        self.inicio = time.time()
+
+    def _stats(self, chave):
+        stats = self._rotas.get(chave)
+        if stats is None:
+            stats = self._rotas.setdefault(chave, RouteStats(self.janela))
+        return stats
+
+    def start(self, chave):
+        with self._lock:
+            self._stats(chave).em_andamento += 1
+
+    def finish(self, chave, status, duracao, sql_comandos, sql_segundos):
+        with self._lock:
+            stats = self._stats(chave)
+            stats.em_andamento -= 1
+            stats.status[status] = stats.status.get(status, 0) + 1
+            stats.duracoes.append(duracao)
+            stats.soma += duracao
+            stats.total += 1
+            stats.sql_comandos += sql_comandos
+            stats.sql_segundos += sql_segundos
+
+    def render(self):
+        """Texto no formato de exposição do Prometheus (versão 0.0.4)"""
+        with self._lock:
+            rotas = [
+                (chave, dict(stats.status), sorted(stats.duracoes), stats.soma, stats.total,
+                 stats.em_andamento, stats.sql_comandos, stats.sql_segundos)
+                for chave, stats in sorted(self._rotas.items())
+            ]
+        
+        pid = os.getpid()
+        def labels(metodo, rota, **extra):
+            pares = [('method', metodo), ('route', rota), ('pid', pid)] + list(extra.items())
+            valores = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pares)
+            return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pares, valores)) + '}'
+        
+        linhas = [
+            '# HELP escola_process_start_time_seconds Início do processo (epoch)',
+            '# TYPE escola_process_start_time_seconds gauge',
+            f'escola_process_start_time_seconds{{pid="{pid}"}} {self.inicio:.3f}',
+        ]
+        def metrica(nome, tipo, ajuda, amostras):
+            linhas.append(f'# HELP {nome} {ajuda}')
+            linhas.append(f'# TYPE {nome} {tipo}')
+            linhas.extend(amostras)
+        
+        metrica('escola_http_requests_total', 'counter', 'Requisições atendidas por rota e status', [
+            f'escola_http_requests_total{labels(m, r, status=st)} {n}'
+            for (m, r), status, *_ in rotas for st, n in sorted(status.items())
+        ])
+        duracao = []
+        for (m, r), _, duracoes, soma, total, *_ in rotas:
+            for q in METRICS_QUANTILES:
+                valor = f'{duracoes[min(len(duracoes) - 1, int(q * len(duracoes)))]:.6f}' if duracoes else 'NaN'
+                duracao.append(f'escola_http_request_duration_seconds{labels(m, r, quantile=q)} {valor}')
+            duracao.append(f'escola_http_request_duration_seconds_sum{labels(m, r)} {soma:.6f}')
+            duracao.append(f'escola_http_request_duration_seconds_count{labels(m, r)} {total}')
+        metrica('escola_http_request_duration_seconds', 'summary',
+                f'Latência das requisições (quantis das últimas {self.janela} por rota)', duracao)
+        metrica('escola_http_requests_in_flight', 'gauge', 'Requisições em andamento', [
+            f'escola_http_requests_in_flight{labels(m, r)} {em_andamento}'
+            for (m, r), _, _, _, _, em_andamento, _, _ in rotas
+        ])
+        metrica('escola_sql_statements_total', 'counter', 'Comandos SQL executados pelas requisições', [
+            f'escola_sql_statements_total{labels(m, r)} {comandos}'
+            for (m, r), *_, comandos, _ in rotas
+        ])
+        metrica('escola_sql_duration_seconds_total', 'counter', 'Tempo gasto no SQL pelas requisições', [
+            f'escola_sql_duration_seconds_total{labels(m, r)} {segundos:.6f}'
+            for (m, r), *_, segundos in rotas
+        ])
+        return '\n'.join(linhas) + '\n'
+
+request_metrics = RequestMetrics(METRICS_WINDOW)
+
+def metrics_key():
+    # A regra da rota (ex.: /api/alunos/<int:id>), não a URL: número limitado de séries
+    return (request.method, request.url_rule.rule if request.url_rule else 'desconhecida')
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_inicio = time.perf_counter()
+    g.metrics_chave = metrics_key()
+    request_metrics.start(g.metrics_chave)
+
+@app.after_request
+def capture_response_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exception):
+    chave = g.pop('metrics_chave', None)
+    if chave is None:
+        return
+    conn = g.get('db')
+    request_metrics.finish(
+        chave, g.get('metrics_status', 500), time.perf_counter() - g.metrics_inicio,
+        conn.sql_statements if conn is not None else 0,
+        conn.sql_seconds if conn is not None else 0.0
+    )
+
+@app.route('/api/admin/metrics', methods=['GET'])
+def get_metrics():
+    """Métricas no formato do Prometheus: administradores ou METRICS_TOKEN"""
+    cabecalho = request.headers.get('Authorization', '')
+    if not (METRICS_TOKEN and hmac.compare_digest(cabecalho, f'Bearer {METRICS_TOKEN}')):
+        usuario = authenticate()
+        if not usuario:
+            return jsonify({'error': 'Autenticação necessária'}), 401
+        if usuario[1] not in ['admin', 'diretor']:
+            return jsonify({'error': 'Acesso negado. Você não tem permissão para esta ação.'}), 403
+    
+    return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# ============ CONSULTAS LENTAS ============
+
+@app.route('/api/admin/slow-queries', methods=['GET'])
+@require_auth
+@require_permission('all')
+def get_slow_queries():
+    """Consultas lentas agrupadas pelo SQL normalizado, das que mais custaram no total.
+
+    ?alerta=1 traz só as que varrem tabelas grandes; ?recentes=N inclui os N
+    últimos registros completos. Valores inválidos usam o padrão; ambos vão até 500.
+    """
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+    recentes = max(0, min(request.args.get('recentes', 0, type=int), 500))
+    
+    entradas = slow_query_log.read()
+    if request.args.get('alerta') == '1':
+        entradas = [e for e in entradas if e.get('alerta')]
+    
+    grupos = {}
+    for entrada in entradas:
+        grupo = grupos.get(entrada['sql'])
+        if grupo is None:
+            grupo = grupos[entrada['sql']] = {
+                'sql': entrada['sql'], 'ocorrencias': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                'rotas': set(), 'parametros': [], 'varreduras': [], 'alerta': False, 'plano': []
+            }
+        grupo['ocorrencias'] += 1
+        grupo['total_ms'] += entrada['duracao_ms']
+        grupo['max_ms'] = max(grupo['max_ms'], entrada['duracao_ms'])
+        if entrada['rota']:
+            grupo['rotas'].add(entrada['rota'])
+        if entrada['parametros'] not in grupo['parametros']:
+            grupo['parametros'].append(entrada['parametros'])
+        # Plano e varreduras do registro mais recente
+        grupo['plano'] = entrada['plano']
+        grupo['varreduras'] = entrada['varreduras']
+        grupo['alerta'] = grupo['alerta'] or entrada['alerta']
+    
+    consultas = sorted(grupos.values(), key=lambda grupo: grupo['total_ms'], reverse=True)
+    for grupo in consultas:
+        grupo['rotas'] = sorted(grupo['rotas'])
+        grupo['media_ms'] = round(grupo['total_ms'] / grupo['ocorrencias'], 2)
+        grupo['total_ms'] = round(grupo['total_ms'], 2)
+    
+    return jsonify({
+        'limite_ms': SLOW_QUERY_MS,
+        'arquivo': slow_query_log.caminho or None,
+        'registros': len(entradas),
+        'consultas': consultas[:limit],
+        'recentes': entradas[-recentes:] if recentes > 0 else []
+    })
+
+# ============ SERVIDOR DE PRODUÇÃO ============
+
+# `python app.py serve`: vários processos (prefork) com threads, via gunicorn
+SERVER_BIND = os.environ.get('SERVER_BIND', '0.0.0.0:5000')
+SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', min((os.cpu_count() or 1) * 2 + 1, 8)))
+SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 4))
+# Cada worker é reciclado após SERVER_MAX_REQUESTS (+ até SERVER_MAX_REQUESTS_JITTER) requisições
+SERVER_MAX_REQUESTS = int(os.environ.get('SERVER_MAX_REQUESTS', 1000))
+SERVER_MAX_REQUESTS_JITTER = int(os.environ.get('SERVER_MAX_REQUESTS_JITTER', 100))
+SERVER_GRACEFUL_TIMEOUT = int(os.environ.get('SERVER_GRACEFUL_TIMEOUT', 30))
+# Definida para os workers do gunicorn (herdam o ambiente do mestre)
+PREFORK_ENV = 'ESCOLA_PREFORK'
+
+def run_production_server(bind=SERVER_BIND, app_uri='app:app'):
+    """Sobe a API com gunicorn: SERVER_WORKERS processos × SERVER_THREADS threads.
+
+    Os workers importam `app_uri` depois do fork e abrem as próprias conexões.
+    `kill -HUP <pid do mestre>` troca os workers (recarregando o código) sem
+    derrubar requisições em andamento; `kill -TERM` encerra aguardando até
+    SERVER_GRACEFUL_TIMEOUT segundos. Sem gunicorn (por exemplo, no Windows),
+    usa o servidor do Werkzeug em um único processo com threads.
+    """
+    # Nenhuma conexão aberta no processo mestre deve ser herdada pelos workers
+    db_pool.close_all()
+    
+    try:
+        from gunicorn.app.base import BaseApplication
+        from gunicorn.util import import_app
+    except ImportError:
+        print("⚠️  gunicorn não encontrado (pip install gunicorn): usando um único processo com threads")
+        host, _, port = bind.rpartition(':')
+        app.run(host=host or '0.0.0.0', port=int(port), threaded=True)
+        return
+    
+    class ProductionServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', [bind])
+            self.cfg.set('workers', SERVER_WORKERS)
+            self.cfg.set('threads', SERVER_THREADS)
+            self.cfg.set('max_requests', SERVER_MAX_REQUESTS)
+            self.cfg.set('max_requests_jitter', SERVER_MAX_REQUESTS_JITTER)
+            self.cfg.set('graceful_timeout', SERVER_GRACEFUL_TIMEOUT)
+            self.cfg.set('preload_app', False)
+        
+        def load(self):
+            return import_app(app_uri)
+    
+    print(f"🚀 Servidor de produção em {bind}: {SERVER_WORKERS} workers × {SERVER_THREADS} threads")
+    os.environ[PREFORK_ENV] = '1'
+    ProductionServer().run()
+
+# ============ VERIFICAÇÃO DOS PLANOS DE CONSULTA ============
+# Executa as rotas de leitura, captura o SQL gerado e roda EXPLAIN QUERY PLAN,
+# apontando varreduras completas (SCAN sem índice) nas tabelas da API.
+
+PLAN_CHECK_URLS = [
+    '/api/stats',
+    '/api/atividades',
+    '/api/alunos',
+    '/api/alunos?search=silva',
+    '/api/alunos?search=joao&limit=20',
+    '/api/professores?search=mat',
+    '/api/turmas?search=9',
+    '/api/usuarios?search=admin',
+    '/api/alunos?limit=20&after=WyJNYXJpYSIsMTBd&total=1',
+    '/api/alunos/1',
+    '/api/alunos/1/boletim',
+    '/api/turmas/1/boletins',
+    '/api/boletins?bimestre=1',
+    '/api/professores',
+    '/api/professores/1',
+    '/api/turmas',
+    '/api/turmas/1',
+    '/api/matriculas',
+    '/api/matriculas?limit=20&after=WyIyMDI1LTAyLTAxIiwxMF0',
+    '/api/frequencia?turma_id=1',
+    '/api/frequencia?turma_id=1&data=2025-03-10',
+    '/api/frequencia?turma_id=1&mes=3&ano=2025',
+    '/api/frequencia?mes=12&ano=2025',
+    '/api/frequencia/turma/1/data/2025-03-10',
+    '/api/eventos',
+    '/api/eventos?mes=3&ano=2025&tipo=prova',
+    '/api/eventos/1',
+    '/api/eventos/proximos',
+    '/api/notas?turma_id=1',
+    '/api/notas?turma_id=1&disciplina=Matemática&bimestre=1',
+    '/api/notas?aluno_id=1',
+    '/api/notas/1',
+    '/api/notas/relatorio?turma_id=1&bimestre=1',
+    '/api/relatorios/estatisticas?fresh=1',
+    '/api/relatorios/desempenho-disciplinas?fresh=1',
+    '/api/relatorios/evolucao-bimestres?fresh=1',
+    '/api/relatorios/ranking-alunos?fresh=1',
+    '/api/relatorios/desempenho-turmas?fresh=1',
+    '/api/relatorios/frequencia-turmas?fresh=1',
+    '/api/usuarios',
+    '/api/usuarios?limit=20',
+    '/api/usuarios/1',
+]
+
+def explain_route_queries(urls=PLAN_CHECK_URLS, tabelas=None):
+    """Retorna {url: [(sql, linha do plano)]} com as varreduras completas encontradas.
+    
+    O SQL é capturado em todas as conexões do pool, inclusive o que as rotas
+    de streaming (boletins) consultam enquanto a resposta é lida. Com
+    `tabelas`, só as varreduras dessas tabelas contam.
+    """
+    capturadas = []
+    
+    # As conexões abertas daqui em diante (e só elas) passam pelo rastreamento
+    db_pool.close_all()
+    db_pool.trace_callback = capturadas.append
+    # Os planos são consultados numa conexão à parte, fora do rastreamento
+    explicar = sqlite3.connect(db_pool.database)
+    
+    client = app.test_client()
+    # Token de um administrador fictício (a situação vai direto para o cache)
+    user_status_cache.put(0, ('ativo', 'admin'))
+    headers = {'Authorization': 'Bearer ' + issue_token(0, 'admin')}
+    problemas = {}
+    
+    try:
+        for url in urls:
+            capturadas.clear()
+            # Lê o corpo inteiro: as rotas de streaming consultam até o fim da resposta
+            client.get(url, headers=headers).get_data()
+            
+            for sql in list(capturadas):
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    continue
+                apelidos = table_aliases(sql)
+                for row in explicar.execute('EXPLAIN QUERY PLAN ' + sql).fetchall():
+                    detalhe = row[3]
+                    # Ignora tabelas internas do SQLite/FTS5, as tabelas virtuais, que são
+                    # percorridas pelo próprio índice textual, e a tabela de versões (ETag),
+                    # lida por inteiro de propósito
+                    if (detalhe.startswith(('SCAN sqlite_', 'SCAN main.', 'SCAN versoes_tabelas'))
+                            or 'VIRTUAL TABLE' in detalhe):
+                        continue
+                    scan = _PLAN_SCAN_RE.match(detalhe)
+                    if scan is None or ' USING ' in detalhe:
+                        continue
+                    if tabelas is None or apelidos.get(scan.group(1), scan.group(1)) in tabelas:
+                        problemas.setdefault(url, []).append((' '.join(sql.split()), detalhe))
+    finally:
+        db_pool.trace_callback = None
+        db_pool.close_all()
+        explicar.close()
+        user_status_cache.invalidate(0)
+    
+    return problemas
 
 # Rotas de Relatórios
 @app.route('/api/relatorios/estatisticas', methods=['GET'])
@@ -1604,4 +3877,54 @@ def relatorios_estatisticas():
         'total_alunos': total_alunos,
         'total_notas': total_notas,
         'media_geral': round(media_geral, 1)
-    })
\ No newline at end of file
+    })
+
+if __name__ == '__main__':
+    # python app.py migrate [--dry-run] aplica (ou simula) as migrações sem subir o servidor
+    if len(sys.argv) > 1 and sys.argv[1] == 'migrate':
+        migrate_db(dry_run='--dry-run' in sys.argv)
+    # python app.py explain falha (código 1) se alguma rota fizer varredura completa
+    elif len(sys.argv) > 1 and sys.argv[1] == 'explain':
+        init_db()
+        problemas = explain_route_queries()
+        for url, scans in problemas.items():
+            print(f"❌ {url}")
+            for sql, detalhe in scans:
+                print(f"   {detalhe}: {sql}")
+        if problemas:
+            sys.exit(1)
+        print(f"✅ Nenhuma varredura completa em {len(PLAN_CHECK_URLS)} rotas verificadas.")
+    # python app.py populate [--alunos 30] [--seed 42] ... gera dados de exemplo (ver DADOS DE EXEMPLO)
+    elif len(sys.argv) > 1 and sys.argv[1] == 'populate':
+        import argparse
+        parser = argparse.ArgumentParser(prog='app.py populate', description='Popula o banco com dados de exemplo')
+        parser.add_argument('--escolas', type=int, default=1)
+        parser.add_argument('--turmas', type=int, default=10, help='turmas por escola e ano')
+        parser.add_argument('--alunos', type=int, default=30, help='alunos por turma')
+        parser.add_argument('--anos', type=int, default=1, help='anos letivos')
+        parser.add_argument('--dias', type=int, default=200, help='dias letivos por ano')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--ano-final', type=int, help='último ano letivo (padrão: o atual)')
+        args = parser.parse_args(sys.argv[2:])
+        erro = check_sample_sizes(args.escolas, args.turmas, args.alunos, args.anos, args.dias, args.ano_final)
+        if erro:
+            parser.error(erro)
+        init_db()
+        conn = get_db()
+        if conn.execute('SELECT COUNT(*) FROM alunos').fetchone()[0] > 0:
+            conn.close()
+            sys.exit("❌ Banco já possui dados. Use reset primeiro se necessário.")
+        print("🏫 Gerando dados de exemplo...")
+        inicio = time.perf_counter()
+        contagens = generate_sample_data(conn, **vars(args))
+        conn.close()
+        for tabela, total in contagens.items():
+            print(f"   {tabela:<12}{total:>12}")
+        print(f"✅ Dados de exemplo inseridos em {time.perf_counter() - inicio:.1f}s")
+    # python app.py serve sobe o servidor de produção (ver SERVIDOR DE PRODUÇÃO)
+    elif len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        init_db()
+        run_production_server()
+    else:
+        init_db()
+        app.run(debug=True, port=5000)
@@ -0,0 +1,45 @@
+"""
+Fixtures dos testes do backend
+
+`escola` aponta o db_pool do backend para uma escola gerada com
+generate_sample_data num banco temporário (um por módulo de teste), e
+`cliente` é o cliente de teste do Flask com o token do administrador.
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+with contextlib.redirect_stdout(io.StringIO()):
+    import app as backend  # noqa: E402
+
+@pytest.fixture(scope='module')
+def escola(tmp_path_factory):
+    """db_pool do backend apontando para uma escola gerada (10 turmas de 30 alunos, 200 dias)"""
+    caminho = str(tmp_path_factory.mktemp('escola') / 'escola.db')
+    anteriores = backend.db_pool, backend.slow_query_log
+    backend.db_pool = backend.ConnectionPool(caminho, backend.DB_POOL_SIZE)
+    backend.slow_query_log = backend.SlowQueryLog('', 0, 0)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            backend.migrate_db()
+        conn = backend.db_pool.acquire()
+        try:
+            backend.generate_sample_data(conn, escolas=1, turmas=10, alunos=30, anos=1, dias=200, ano_final=2025)
+        finally:
+            backend.db_pool.release(conn)
+        yield backend.db_pool
+    finally:
+        backend.db_pool.close_all()
+        backend.db_pool, backend.slow_query_log = anteriores
+
+@pytest.fixture(scope='module')
+def cliente(escola):
+    """(cliente de teste, headers com o token do administrador padrão)"""
+    client = backend.app.test_client()
+    resposta = client.post('/api/auth/login', json={'email': 'admin@escola.com', 'password': 'admin123'})
+    return client, {'Authorization': 'Bearer ' + resposta.get_json()['token']}
@@ -0,0 +1,52 @@
+"""
+Streaming dos boletins: a conexão da requisição volta ao pool mesmo quando o
+corpo da resposta não é lido (HEAD, cliente que desconecta)
+"""
+
+import json
+
+import app as backend
+
+ROTAS = ['/api/turmas/1/boletins', '/api/boletins?bimestre=1', '/api/boletins?format=ndjson']
+
+def test_head_nao_prende_conexoes(escola, cliente):
+    client, headers = cliente
+    for _ in range(backend.DB_POOL_SIZE * 2):
+        for url in ROTAS:
+            assert client.head(url, headers=headers).status_code == 200
+    assert client.get('/api/alunos', headers=headers).status_code == 200
+
+def test_resposta_fechada_sem_leitura_nao_prende_conexoes(escola, cliente):
+    client, headers = cliente
+    for _ in range(backend.DB_POOL_SIZE * 2):
+        for url in ROTAS:
+            resposta = client.get(url, headers=headers, buffered=False)
+            assert resposta.status_code == 200
+            resposta.close()
+    assert client.get('/api/alunos', headers=headers).status_code == 200
+
+def test_boletins_da_turma_completos(escola, cliente):
+    client, headers = cliente
+    boletins = json.loads(client.get('/api/turmas/1/boletins', headers=headers).get_data())
+    assert len(boletins) == 30
+    assert all(len(boletim['notas']) == len(backend.SAMPLE_DISCIPLINAS) * 4 for boletim in boletins)
+    
+    linhas = client.get('/api/boletins?format=ndjson&bimestre=1', headers=headers).get_data().splitlines()
+    assert len(linhas) == 300
+    assert all(len(json.loads(linha)['notas']) == len(backend.SAMPLE_DISCIPLINAS) for linha in linhas)
+
+def test_consulta_do_streaming_instrumentada(escola, cliente, monkeypatch):
+    client, headers = cliente
+    monkeypatch.setattr(backend, 'SLOW_QUERY_SECONDS', 0)
+    rota = '/api/turmas/<int:turma_id>/boletins'
+    stats = backend.request_metrics._stats(('GET', rota))
+    total, comandos = stats.total, stats.sql_comandos
+    backend.slow_query_log.recentes.clear()
+    
+    # Sem ETag em cache: a rota executa a consulta e o corpo é lido até o fim
+    assert len(client.get('/api/turmas/2/boletins?format=ndjson', headers=headers).get_data().splitlines()) == 30
+    
+    registros = [e for e in backend.slow_query_log.recentes if 'LEFT JOIN notas' in e['sql']]
+    assert [e['rota'] for e in registros] == [f'GET {rota}']
+    assert stats.total == total + 1
+    assert stats.sql_comandos > comandos
@@ -0,0 +1,33 @@
+"""
+ETag das rotas de leitura: depende do usuário autenticado e do banco, não de
+headers que a autenticação ignora
+"""
+
+import app as backend
+
+URL = '/api/alunos?limit=5'
+
+def test_headers_antigos_nao_mudam_a_etag(escola, cliente):
+    client, headers = cliente
+    etag = client.get(URL, headers=headers).headers['ETag']
+    outros = {**headers, 'X-User-Id': '99', 'X-User-Cargo': 'professor'}
+    assert client.get(URL, headers=outros).headers['ETag'] == etag
+    assert client.get(URL, headers={**headers, 'If-None-Match': etag}).status_code == 304
+
+def test_outro_banco_muda_a_etag(escola, cliente):
+    client, headers = cliente
+    etag = client.get(URL, headers=headers).headers['ETag']
+    
+    # Um banco recriado (reset-db) recomeça as versões das tabelas, mas com outra identidade
+    conn = escola.acquire()
+    try:
+        conn.execute(
+            'UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = ?', (backend.DATABASE_ID_ROW,)
+        )
+        conn.commit()
+    finally:
+        escola.release(conn)
+    
+    resposta = client.get(URL, headers={**headers, 'If-None-Match': etag})
+    assert resposta.status_code == 200
+    assert resposta.headers['ETag'] != etag
@@ -0,0 +1,24 @@
+"""
+Filtro mes/ano (comum/filtros.py): valores inválidos respondem 400
+"""
+
+import pytest
+
+from comum.filtros import month_range
+
+def test_intervalo_do_mes():
+    assert month_range(3, 2025) == ('2025-03-01', '2025-04-01')
+    assert month_range(12, 2025) == ('2025-12-01', '2026-01-01')
+
+@pytest.mark.parametrize('consulta', ['mes=abc&ano=2025', 'mes=3&ano=x', 'mes=13&ano=2025', 'mes=0&ano=2025'])
+def test_mes_ano_invalidos(escola, cliente, consulta):
+    client, headers = cliente
+    for url in ('/api/frequencia?turma_id=1&', '/api/eventos?'):
+        assert client.get(url + consulta, headers=headers).status_code == 400
+
+def test_mes_ano_validos_filtram(escola, cliente):
+    client, headers = cliente
+    frequencias = client.get('/api/frequencia?turma_id=1&mes=3&ano=2025', headers=headers).get_json()
+    assert frequencias and all(f['data'].startswith('2025-03-') for f in frequencias)
+    # Sem um dos dois parâmetros o filtro não se aplica
+    assert client.get('/api/eventos?mes=3', headers=headers).status_code == 200
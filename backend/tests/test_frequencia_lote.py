@@ -0,0 +1,90 @@
+"""
+Chamada em lote (POST /api/frequencia/lote): ids inválidos ou repetidos
+recusam o lote sem alterar a frequência gravada
+"""
+
+import app as backend
+
+DATA = '2025-12-20'  # Sábado: fora dos dias letivos gerados
+
+def matriculas_da_turma(turma_id):
+    conn = backend.db_pool.acquire()
+    try:
+        return [row[0] for row in conn.execute(
+            'SELECT id FROM matriculas WHERE turma_id = ? ORDER BY id', (turma_id,)
+        )]
+    finally:
+        backend.db_pool.release(conn)
+
+def frequencia_na_data(turma_id, data):
+    conn = backend.db_pool.acquire()
+    try:
+        return dict(conn.execute(
+            '''SELECT f.matricula_id, f.presente FROM frequencia f
+               JOIN matriculas m ON f.matricula_id = m.id
+               WHERE m.turma_id = ? AND f.data = ?''',
+            (turma_id, data)
+        ).fetchall())
+    finally:
+        backend.db_pool.release(conn)
+
+def salvar(client, corpo):
+    return client.post('/api/frequencia/lote', json=corpo)
+
+def test_chamada_gravada_e_substituida(escola, cliente):
+    client, _ = cliente
+    primeira, segunda, terceira = matriculas_da_turma(1)[:3]
+    
+    resposta = salvar(client, {'turma_id': 1, 'data': DATA, 'frequencias': [
+        {'matricula_id': primeira, 'presente': True}, {'matricula_id': segunda, 'presente': False}
+    ]})
+    assert resposta.status_code == 201
+    assert resposta.get_json()['inseridos'] == 2
+    
+    resposta = salvar(client, {'turma_id': 1, 'data': DATA, 'frequencias': [
+        {'matricula_id': segunda, 'presente': True}, {'matricula_id': terceira, 'presente': True}
+    ]})
+    corpo = resposta.get_json()
+    assert (corpo['inseridos'], corpo['atualizados'], corpo['removidos']) == (1, 1, 1)
+    assert frequencia_na_data(1, DATA) == {segunda: 1, terceira: 1}
+
+def test_matricula_id_em_texto_recusado(escola, cliente):
+    client, _ = cliente
+    antes = frequencia_na_data(1, DATA)
+    matricula_id = matriculas_da_turma(1)[0]
+    
+    resposta = salvar(client, {'turma_id': 1, 'data': DATA, 'frequencias': [
+        {'matricula_id': str(matricula_id), 'presente': True}
+    ]})
+    assert resposta.status_code == 400
+    assert frequencia_na_data(1, DATA) == antes
+
+def test_matricula_de_outra_turma_recusada(escola, cliente):
+    client, _ = cliente
+    antes = frequencia_na_data(1, DATA)
+    
+    resposta = salvar(client, {'turma_id': 1, 'data': DATA, 'frequencias': [
+        {'matricula_id': matriculas_da_turma(2)[0], 'presente': True}
+    ]})
+    assert resposta.status_code == 400
+    assert frequencia_na_data(1, DATA) == antes
+    assert frequencia_na_data(2, DATA) == {}
+
+def test_matricula_repetida_recusada(escola, cliente):
+    client, _ = cliente
+    antes = frequencia_na_data(1, DATA)
+    matricula_id = matriculas_da_turma(1)[0]
+    
+    # Na mesma chamada
+    resposta = salvar(client, {'turma_id': 1, 'data': DATA, 'frequencias': [
+        {'matricula_id': matricula_id, 'presente': True}, {'matricula_id': matricula_id, 'presente': False}
+    ]})
+    assert resposta.status_code == 400
+    
+    # Em duas chamadas da mesma turma e data: a segunda apagaria o que a primeira gravou
+    resposta = salvar(client, {'chamadas': [
+        {'turma_id': 1, 'data': DATA, 'frequencias': [{'matricula_id': matricula_id, 'presente': False}]},
+        {'turma_id': 1, 'data': DATA, 'frequencias': []},
+    ]})
+    assert resposta.status_code == 400
+    assert frequencia_na_data(1, DATA) == antes
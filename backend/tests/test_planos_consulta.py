@@ -0,0 +1,40 @@
+"""
+Planos de consulta das rotas de leitura sobre um banco populado
+
+Gera uma escola com generate_sample_data (as estatísticas do ANALYZE no final
+da carga é que orientam o planejador), executa cada rota de PLAN_CHECK_URLS e
+falha se alguma consulta percorrer por inteiro uma das tabelas grandes,
+inclusive as feitas durante o streaming dos boletins.
+
+Uso: python -m pytest backend/tests
+"""
+
+import pytest
+
+import app as backend
+
+# Tabelas que crescem com o número de alunos, anos e dias letivos
+TABELAS_GRANDES = backend.SLOW_QUERY_SCAN_TABLES + ('alunos', 'eventos')
+
+@pytest.mark.parametrize('url', backend.PLAN_CHECK_URLS)
+def test_rota_sem_varredura_completa(escola, url):
+    problemas = backend.explain_route_queries([url], tabelas=TABELAS_GRANDES)
+    assert problemas == {}
+
+def test_varredura_no_streaming_de_boletins_detectada(escola):
+    # A consulta dos boletins roda enquanto a resposta é lida (streaming):
+    # sem os índices de matrículas ela precisa aparecer como varredura de matriculas
+    conn = escola.acquire()
+    try:
+        conn.execute('DROP INDEX idx_matriculas_turma')
+        conn.execute('DROP INDEX idx_matriculas_aluno')
+        problemas = backend.explain_route_queries(['/api/turmas/1/boletins'], tabelas=TABELAS_GRANDES)
+    finally:
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_matriculas_turma ON matriculas (turma_id, status)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_matriculas_aluno ON matriculas (aluno_id)')
+        conn.execute('ANALYZE matriculas')
+        escola.release(conn)
+    assert any(
+        'FROM matriculas m' in sql and detalhe == 'SCAN m'
+        for sql, detalhe in problemas.get('/api/turmas/1/boletins', [])
+    )
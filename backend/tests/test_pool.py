@@ -0,0 +1,22 @@
+"""
+Pool de conexões esgotado: a API responde 503 com Retry-After e volta a
+atender quando as conexões são devolvidas
+"""
+
+from comum import banco
+
+def test_pool_esgotado_responde_503(escola, cliente, monkeypatch):
+    client, headers = cliente
+    monkeypatch.setattr(banco, 'DB_POOL_TIMEOUT', 0.05)
+    
+    presas = [escola.acquire() for _ in range(escola.size)]
+    try:
+        resposta = client.get('/api/alunos', headers=headers)
+        assert resposta.status_code == 503
+        assert resposta.headers['Retry-After'] == '1'
+        assert 'esgotado' in resposta.get_json()['error']
+    finally:
+        for conn in presas:
+            escola.release(conn)
+    
+    assert client.get('/api/alunos', headers=headers).status_code == 200
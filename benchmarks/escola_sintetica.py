@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Gerador de um escola.db sintético em escala configurável
+
+Cria o banco com as migrações do backend e o preenche com o gerador de dados
+de exemplo do backend (generate_sample_data, em uma única transação):
+escolas × turmas × alunos, com matrículas, notas (todas as disciplinas e
+bimestres) e frequência de cada dia letivo, por um ou mais anos. Os dados são
+determinísticos para a mesma semente.
+
+Uso: python benchmarks/escola_sintetica.py escola.db [--escolas 1] [--turmas 10]
+                                           [--alunos 30] [--anos 1] [--dias 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+import app as backend  # noqa: E402
+
+DISCIPLINAS = backend.SAMPLE_DISCIPLINAS
+# Último ano letivo gerado (as URLs de PLAN_CHECK_URLS usam datas de 2025)
+ANO_FINAL = 2025
+dias_letivos = backend.school_days
+
+def gerar_escola(caminho, escolas=1, turmas=10, alunos=30, anos=1, dias=200, seed=42):
+    """Gera o banco em `caminho` (que não deve existir); retorna as contagens por tabela"""
+    anteriores = backend.db_pool, backend.DATABASE, backend.slow_query_log
+    backend.db_pool = backend.ConnectionPool(caminho, 1)
+    # A carga em si não interessa ao log de consultas lentas
+    backend.slow_query_log = backend.SlowQueryLog('', 0, 0)
+    try:
+        backend.migrate_db()
+        conn = backend.db_pool.acquire()
+        try:
+            return backend.generate_sample_data(conn, escolas, turmas, alunos, anos, dias, seed, ANO_FINAL)
+        finally:
+            backend.db_pool.release(conn)
+    finally:
+        backend.db_pool.close_all()
+        backend.db_pool, backend.DATABASE, backend.slow_query_log = anteriores
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('banco', help='arquivo a criar')
+    parser.add_argument('--escolas', type=int, default=1)
+    parser.add_argument('--turmas', type=int, default=10, help='turmas por escola e ano')
+    parser.add_argument('--alunos', type=int, default=30, help='alunos por turma')
+    parser.add_argument('--anos', type=int, default=1, help='anos letivos')
+    parser.add_argument('--dias', type=int, default=200, help='dias letivos por ano')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if os.path.exists(args.banco):
+        parser.error(f'{args.banco} já existe')
+
+    print("🏫 Gerando escola sintética...")
+    inicio = time.perf_counter()
+    contagens = gerar_escola(args.banco, args.escolas, args.turmas, args.alunos, args.anos, args.dias, args.seed)
+    for tabela, total in contagens.items():
+        print(f"   {tabela:<12}{total:>12}")
+    print(f"✅ {args.banco} gerado em {time.perf_counter() - inicio:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark do filtro por mês de /api/frequencia e /api/eventos
+
+Compara o filtro antigo (strftime sobre a coluna, que impede o uso de índice)
+com o intervalo semiaberto [início, fim) usado hoje, em um banco temporário
+com um ano letivo de frequência.
+
+Uso: python benchmarks/filtro_mes.py [--turmas 50] [--alunos 40] [--dias 200]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from app import MIGRATIONS, month_range  # noqa: E402
+
+CONSULTA_FREQUENCIA = '''
+    SELECT f.*, m.aluno_id, a.nome as aluno_nome, t.nome as turma_nome, t.id as turma_id
+    FROM frequencia f
+    JOIN matriculas m ON f.matricula_id = m.id
+    JOIN alunos a ON m.aluno_id = a.id
+    JOIN turmas t ON m.turma_id = t.id
+    WHERE 1=1 {filtro}
+    ORDER BY a.nome, f.data
+'''
+
+CONSULTA_EVENTOS = '''
+    SELECT e.*, t.nome as turma_nome, p.nome as professor_nome
+    FROM eventos e
+    LEFT JOIN turmas t ON e.turma_id = t.id
+    LEFT JOIN professores p ON e.professor_id = p.id
+    WHERE e.status = "ativo" {filtro}
+    ORDER BY e.data_inicio, e.hora_inicio
+'''
+
+FILTRO_ANTIGO = ' AND strftime("%m", {col}) = ? AND strftime("%Y", {col}) = ?'
+FILTRO_NOVO = ' AND {col} >= ? AND {col} < ?'
+
+def criar_banco(caminho, turmas, alunos_por_turma, dias):
+    conn = sqlite3.connect(caminho)
+    cursor = conn.cursor()
+    for _, _, step in MIGRATIONS:
+        step(cursor)
+    
+    rnd = random.Random(42)
+    cursor.executemany(
+        'INSERT INTO turmas (id, nome, ano, turno, status) VALUES (?, ?, ?, ?, ?)',
+        [(t, f'Turma {t}', '2025', 'Manhã', 'ativa') for t in range(1, turmas + 1)]
+    )
+    total_alunos = turmas * alunos_por_turma
+    cursor.executemany(
+        'INSERT INTO alunos (id, nome, email, cpf, data_nascimento) VALUES (?, ?, ?, ?, ?)',
+        [(a, f'Aluno {a:06d}', f'aluno{a}@escola.com', f'{a:011d}', '2010-01-01')
+         for a in range(1, total_alunos + 1)]
+    )
+    cursor.executemany(
+        'INSERT INTO matriculas (id, aluno_id, turma_id) VALUES (?, ?, ?)',
+        [(a, a, (a - 1) // alunos_por_turma + 1) for a in range(1, total_alunos + 1)]
+    )
+    
+    # Dias letivos: segunda a sexta a partir de fevereiro
+    datas = []
+    dia = date(2025, 2, 3)
+    while len(datas) < dias:
+        if dia.weekday() < 5:
+            datas.append(dia.isoformat())
+        dia += timedelta(days=1)
+    
+    for data in datas:
+        cursor.executemany(
+            'INSERT INTO frequencia (matricula_id, data, presente) VALUES (?, ?, ?)',
+            [(m, data, int(rnd.random() > 0.1)) for m in range(1, total_alunos + 1)]
+        )
+    cursor.executemany(
+        'INSERT INTO eventos (titulo, data_inicio, hora_inicio, turma_id) VALUES (?, ?, ?, ?)',
+        [(f'Evento {i}', rnd.choice(datas), '08:00', rnd.randint(1, turmas)) for i in range(5000)]
+    )
+    conn.commit()
+    return conn, len(datas) * total_alunos
+
+def medir(conn, sql, params, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        linhas = conn.execute(sql, params).fetchall()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos), len(linhas)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--turmas', type=int, default=50)
+    parser.add_argument('--alunos', type=int, default=40, help='alunos por turma')
+    parser.add_argument('--dias', type=int, default=200, help='dias letivos de frequência')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as pasta:
+        print("📊 Gerando banco de teste...")
+        conn, total = criar_banco(os.path.join(pasta, 'bench.db'), args.turmas, args.alunos, args.dias)
+        print(f"   {total} registros de frequência\n")
+        
+        mes, ano = 5, 2025
+        casos = [
+            ('frequencia (mês)', CONSULTA_FREQUENCIA, 'f.data', []),
+            ('frequencia (turma + mês)', CONSULTA_FREQUENCIA.replace('WHERE 1=1', 'WHERE t.id = ?'), 'f.data', [7]),
+            ('eventos (mês)', CONSULTA_EVENTOS, 'e.data_inicio', []),
+        ]
+        
+        print(f"{'consulta':<28}{'strftime (ms)':>15}{'intervalo (ms)':>16}{'ganho':>9}")
+        for nome, consulta, coluna, extra in casos:
+            antigo, n_antigo = medir(
+                conn, consulta.format(filtro=FILTRO_ANTIGO.format(col=coluna)),
+                extra + [f'{mes:02d}', str(ano)], args.repeticoes
+            )
+            novo, n_novo = medir(
+                conn, consulta.format(filtro=FILTRO_NOVO.format(col=coluna)),
+                extra + list(month_range(mes, ano)), args.repeticoes
+            )
+            assert n_antigo == n_novo, f'{nome}: resultados diferentes ({n_antigo} x {n_novo})'
+            print(f"{nome:<28}{antigo:>15.1f}{novo:>16.1f}{antigo / novo:>8.1f}x")
+        
+        conn.close()
+
+if __name__ == '__main__':
+    main()
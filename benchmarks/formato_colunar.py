@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark do formato colunar de /api/frequencia
+
+Compara a resposta padrão (lista de objetos via jsonify) com ?format=columnar,
+com e sem orjson, medindo tempo da requisição e tamanho do corpo em um banco
+temporário com ~100 mil registros de frequência.
+
+Uso: python benchmarks/formato_colunar.py [--turmas 25] [--alunos 40] [--dias 100]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+import app as backend  # noqa: E402
+from filtro_mes import criar_banco  # noqa: E402
+
+def medir(client, url, headers, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resposta = client.get(url, headers=headers)
+        corpo = resposta.get_data()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    assert resposta.status_code == 200, resposta.status_code
+    return statistics.median(tempos), corpo
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--turmas', type=int, default=25)
+    parser.add_argument('--alunos', type=int, default=40, help='alunos por turma')
+    parser.add_argument('--dias', type=int, default=100, help='dias letivos de frequência')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        print("📊 Gerando banco de teste...")
+        caminho = os.path.join(pasta, 'bench.db')
+        conn, total = criar_banco(caminho, args.turmas, args.alunos, args.dias)
+        conn.close()
+        print(f"   {total} registros de frequência\n")
+
+        backend.db_pool = backend.ConnectionPool(caminho, 1)
+        client = backend.app.test_client()
+        orjson = backend.orjson
+
+        # Administrador padrão criado pela migração 1
+        login = client.post('/api/auth/login', json={'email': 'admin@escola.com', 'password': 'admin123'})
+        headers = {'Authorization': 'Bearer ' + login.get_json()['token']}
+
+        casos = [
+            ('lista de objetos', '/api/frequencia', orjson),
+            ('colunar (json)', '/api/frequencia?format=columnar', None),
+            ('colunar (orjson)', '/api/frequencia?format=columnar', orjson),
+        ]
+
+        print(f"{'formato':<20}{'tempo (ms)':>12}{'corpo (KB)':>12}{'gzip (KB)':>11}{'ganho':>8}")
+        base = None
+        referencia = None
+        for nome, url, encoder in casos:
+            if nome.endswith('(orjson)') and orjson is None:
+                print(f"{nome:<20}{'orjson não instalado':>43}")
+                continue
+            backend.orjson = encoder
+            tempo, corpo = medir(client, url, headers, args.repeticoes)
+
+            # Confere que os dois formatos trazem os mesmos dados
+            dados = json.loads(corpo)
+            if isinstance(dados, dict):
+                dados = [dict(zip(dados['columns'], linha)) for linha in dados['rows']]
+            if referencia is None:
+                referencia = dados
+            assert dados == referencia, f'{nome}: resultado diferente'
+
+            base = base or tempo
+            print(f"{nome:<20}{tempo:>12.1f}{len(corpo) / 1024:>12.0f}"
+                  f"{len(gzip.compress(corpo)) / 1024:>11.0f}{base / tempo:>7.1f}x")
+
+        backend.orjson = orjson
+        backend.db_pool.close_all()
+
+if __name__ == '__main__':
+    main()
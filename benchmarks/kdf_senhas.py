@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark do custo do scrypt usado nas senhas (PASSWORD_SCRYPT_N)
+
+Mede, para cada valor de N, o tempo de um cálculo, a memória usada e quantos
+logins por segundo o pool do KDF aguenta com KDF_WORKERS threads. Sugere o
+maior N cujo cálculo fica abaixo do tempo-alvo.
+
+Uso: python benchmarks/kdf_senhas.py [--alvo-ms 100] [--workers 2]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+import app as backend  # noqa: E402
+
+def medir(n, r, p, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        backend._scrypt('senha de teste', os.urandom(16), n, r, p)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+def vazao(n, r, p, workers, total):
+    """Cálculos por segundo com `workers` threads (o scrypt libera o GIL)"""
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda _: backend._scrypt('senha de teste', os.urandom(16), n, r, p), range(total)))
+    return total / (time.perf_counter() - inicio)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--alvo-ms', type=float, default=100, help='tempo máximo aceitável por login')
+    parser.add_argument('--workers', type=int, default=backend.KDF_WORKERS, help='threads do pool do KDF')
+    parser.add_argument('--r', type=int, default=backend.PASSWORD_SCRYPT_R)
+    parser.add_argument('--p', type=int, default=backend.PASSWORD_SCRYPT_P)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"🔐 scrypt com r={args.r}, p={args.p}, {args.workers} workers "
+          f"(atual: N={backend.PASSWORD_SCRYPT_N})\n")
+    print(f"{'N':>8}{'memória (MB)':>14}{'tempo (ms)':>12}{'logins/s':>10}")
+
+    sugerido = None
+    for expoente in range(12, 19):
+        n = 2 ** expoente
+        tempo = medir(n, args.r, args.p, args.repeticoes)
+        logins = vazao(n, args.r, args.p, args.workers, args.workers * args.repeticoes)
+        memoria = 128 * n * args.r / 1024 / 1024
+        marca = ' ◀ atual' if n == backend.PASSWORD_SCRYPT_N else ''
+        print(f"{n:>8}{memoria:>14.0f}{tempo:>12.1f}{logins:>10.1f}{marca}")
+        if tempo <= args.alvo_ms:
+            sugerido = n
+        elif tempo > args.alvo_ms * 4:
+            break
+
+    print()
+    if sugerido:
+        print(f"💡 Sugestão para até {args.alvo_ms:.0f} ms por login: PASSWORD_SCRYPT_N={sugerido}")
+    else:
+        print(f"⚠️  Nenhum N testado fica abaixo de {args.alvo_ms:.0f} ms nesta máquina")
+    print("   Senhas com outro custo recebem o novo hash no próximo login.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Benchmark de ponta a ponta das rotas da API
+
+Gera um escola.db sintético (ver escola_sintetica.py) e exercita todas as rotas
+GET de backend/app.py, as variantes de filtro de PLAN_CHECK_URLS e as gravações
+em lote, pelo cliente de teste do Flask e por HTTP (`app.py serve`), com os
+níveis de concorrência pedidos. Vazão e percentis de latência são comparados
+com uma linha de base em JSON.
+
+Uso: python benchmarks/rotas_api.py [--escolas 1] [--turmas 10] [--alunos 30] [--anos 1]
+                                    [--modos cliente,http] [--concorrencia 1,8]
+                                    [--requisicoes 40] [--rotas REGEX]
+                                    [--baseline benchmarks/baseline.json] [--salvar]
+                                    [--orcamento 25] [--tolerancia-ms 1]
+  Sai com código 1 se alguma rota falhar ou ficar mais lenta que a linha de base
+  além do orçamento (em %, sobre o percentil de --percentil).
+"""
+
+import argparse
+import http.client
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import quote
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.join(PASTA, '..', 'backend')
+sys.path.insert(0, BACKEND)
+import app as backend  # noqa: E402
+from escola_sintetica import DISCIPLINAS, dias_letivos, gerar_escola, ANO_FINAL  # noqa: E402
+
+BASELINE_PADRAO = os.path.join(PASTA, 'baseline.json')
+# Rotas GET que não fazem sentido medir
+IGNORADAS = {'static'}
+ADMIN = {'email': 'admin@escola.com', 'password': 'admin123'}
+
+# ============ CENÁRIOS ============
+
+def cenarios(conn):
+    """(método, url, corpo) de cada rota GET, das variantes e das gravações em lote"""
+    data = dias_letivos(ANO_FINAL, 30)[-1]
+    valores = {'id': 1, 'aluno_id': 1, 'turma_id': 1, 'data': data}
+    adaptador = backend.app.url_map.bind('localhost')
+
+    urls = []
+    for regra in sorted(backend.app.url_map.iter_rules(), key=lambda r: r.rule):
+        if 'GET' not in regra.methods or regra.endpoint in IGNORADAS:
+            continue
+        url = adaptador.build(regra.endpoint, {arg: valores[arg] for arg in regra.arguments}, method='GET')
+        if url not in urls:
+            urls.append(url)
+    for url in backend.PLAN_CHECK_URLS:
+        url = quote(url, safe='/?&=%:,')
+        if url not in urls:
+            urls.append(url)
+    resultado = [('GET', url, None) for url in urls]
+
+    # Gravações idempotentes (UPSERT com os mesmos valores a cada repetição)
+    matriculas = [row[0] for row in conn.execute('SELECT id FROM matriculas WHERE turma_id = 1 ORDER BY id')]
+    resultado.append(('POST', '/api/frequencia/lote', {
+        'turma_id': 1, 'data': data,
+        'frequencias': [{'matricula_id': m, 'presente': m % 7 != 0} for m in matriculas]
+    }))
+    resultado.append(('POST', '/api/notas/lote', {
+        'turma_id': 1, 'disciplina': DISCIPLINAS[0], 'bimestre': 1,
+        'notas': [{'matricula_id': m, 'nota': m % 10} for m in matriculas]
+    }))
+    return resultado
+
+# ============ EXECUÇÃO ============
+
+def percentil(ordenadas, q):
+    return ordenadas[min(len(ordenadas) - 1, int(q * len(ordenadas)))]
+
+def medir(nova_sessao, metodo, url, corpo, concorrencia, total):
+    """Dispara `total` requisições com `concorrencia` threads; retorna as estatísticas"""
+    latencias = []
+    erros = []
+    lock = threading.Lock()
+
+    def trabalhador(quantidade):
+        requisitar = nova_sessao()
+        proprias = []
+        for _ in range(quantidade):
+            inicio = time.perf_counter()
+            status = requisitar(metodo, url, corpo)
+            proprias.append(time.perf_counter() - inicio)
+            if status >= 400:
+                with lock:
+                    erros.append(status)
+        with lock:
+            latencias.extend(proprias)
+
+    partes = [total // concorrencia + (1 if i < total % concorrencia else 0) for i in range(concorrencia)]
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as pool:
+        list(pool.map(trabalhador, [p for p in partes if p]))
+    duracao = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        'requisicoes': total,
+        'vazao': round(total / duracao, 1),
+        'p50': round(percentil(latencias, 0.5) * 1000, 3),
+        'p95': round(percentil(latencias, 0.95) * 1000, 3),
+        'p99': round(percentil(latencias, 0.99) * 1000, 3),
+        'erros': len(erros),
+        'status_erro': sorted(set(erros))
+    }
+
+def sessao_cliente(headers):
+    """Requisições pelo cliente de teste do Flask (um por thread)"""
+    def nova():
+        client = backend.app.test_client()
+        def requisitar(metodo, url, corpo):
+            resposta = client.open(url, method=metodo, json=corpo, headers=headers)
+            resposta.get_data()
+            return resposta.status_code
+        return requisitar
+    return nova
+
+def sessao_http(porta, headers):
+    """Requisições HTTP reais, com uma conexão keep-alive por thread"""
+    def nova():
+        conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=60)
+        def requisitar(metodo, url, corpo):
+            dados = json.dumps(corpo).encode() if corpo is not None else None
+            conexao.request(metodo, url, body=dados, headers={**headers, 'Content-Type': 'application/json'})
+            resposta = conexao.getresponse()
+            resposta.read()
+            return resposta.status
+        return requisitar
+    return nova
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def iniciar_servidor(pasta, porta, workers, threads):
+    """Sobe `app.py serve` no banco da pasta e espera a porta responder"""
+    env = dict(os.environ, SERVER_BIND=f'127.0.0.1:{porta}', SERVER_WORKERS=str(workers),
+               SERVER_THREADS=str(threads), SLOW_QUERY_LOG='')
+    processo = subprocess.Popen(
+        [sys.executable, os.path.abspath(os.path.join(BACKEND, 'app.py')), 'serve'],
+        cwd=pasta, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    limite = time.monotonic() + 30
+    while time.monotonic() < limite:
+        try:
+            conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=2)
+            conexao.request('GET', '/api/stats')
+            conexao.getresponse().read()
+            return processo
+        except OSError:
+            if processo.poll() is not None:
+                break
+            time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError('O servidor de produção não respondeu')
+
+# ============ LINHA DE BASE ============
+
+def comparar(resultados, baseline, percentil_chave, orcamento, tolerancia_ms):
+    """Retorna {chave: variação em %} e a lista de regressões acima do orçamento"""
+    variacoes = {}
+    regressoes = []
+    for chave, atual in resultados.items():
+        anterior = baseline.get(chave)
+        if not anterior or not anterior[percentil_chave]:
+            continue
+        variacao = (atual[percentil_chave] / anterior[percentil_chave] - 1) * 100
+        variacoes[chave] = variacao
+        if variacao > orcamento and atual[percentil_chave] - anterior[percentil_chave] > tolerancia_ms:
+            regressoes.append(chave)
+    return variacoes, regressoes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--escolas', type=int, default=1)
+    parser.add_argument('--turmas', type=int, default=10, help='turmas por escola e ano')
+    parser.add_argument('--alunos', type=int, default=30, help='alunos por turma')
+    parser.add_argument('--anos', type=int, default=1, help='anos letivos de notas e frequência')
+    parser.add_argument('--dias', type=int, default=200, help='dias letivos por ano')
+    parser.add_argument('--banco', help='reaproveita (ou gera e mantém) o banco neste caminho')
+    parser.add_argument('--modos', default='cliente,http', help='cliente, http ou ambos')
+    parser.add_argument('--concorrencia', default='1,8', help='níveis de concorrência, separados por vírgula')
+    parser.add_argument('--requisicoes', type=int, default=40, help='requisições por rota e nível')
+    parser.add_argument('--rotas', help='mede apenas as URLs que casam com esta expressão regular')
+    parser.add_argument('--http-workers', type=int, default=2, help='processos do servidor no modo http')
+    parser.add_argument('--http-threads', type=int, default=4, help='threads por processo no modo http')
+    parser.add_argument('--baseline', default=BASELINE_PADRAO)
+    parser.add_argument('--salvar', action='store_true', help='grava os resultados como nova linha de base')
+    parser.add_argument('--percentil', default='p50', choices=['p50', 'p95', 'p99'])
+    parser.add_argument('--orcamento', type=float, default=25, help='piora máxima aceita, em %%')
+    parser.add_argument('--tolerancia-ms', type=float, default=1,
+                        help='diferenças menores que isso (ms) nunca contam como regressão')
+    args = parser.parse_args()
+
+    modos = [m.strip() for m in args.modos.split(',') if m.strip()]
+    niveis = [int(n) for n in args.concorrencia.split(',')]
+    escala = {k: getattr(args, k) for k in ('escolas', 'turmas', 'alunos', 'anos', 'dias')}
+
+    pasta = tempfile.mkdtemp(prefix='bench-api-')
+    servidor = None
+    try:
+        caminho = os.path.join(pasta, 'escola.db')
+        if args.banco and os.path.exists(args.banco):
+            shutil.copy(args.banco, caminho)
+            print(f"📂 Usando {args.banco}")
+        else:
+            print("🏫 Gerando escola sintética...")
+            contagens = gerar_escola(caminho, **escala)
+            print('   ' + ', '.join(f'{tabela}: {total}' for tabela, total in contagens.items()))
+            if args.banco:
+                shutil.copy(caminho, args.banco)
+
+        # O backend usa o banco gerado (e grava a chave dos tokens ao lado dele)
+        backend.DATABASE = caminho
+        backend.db_pool = backend.ConnectionPool(caminho, backend.DB_POOL_SIZE)
+        backend.slow_query_log = backend.SlowQueryLog('', 0, 0)
+        client = backend.app.test_client()
+        login = client.post('/api/auth/login', json=ADMIN)
+        headers = {'Authorization': 'Bearer ' + login.get_json()['token'], 'Accept-Encoding': 'gzip'}
+
+        conn = backend.db_pool.acquire()
+        lista = cenarios(conn)
+        backend.db_pool.release(conn)
+        if args.rotas:
+            lista = [c for c in lista if re.search(args.rotas, c[1])]
+        print(f"   {len(lista)} cenários, {', '.join(modos)}, concorrência {args.concorrencia}\n")
+
+        resultados = {}
+        for modo in modos:
+            if modo == 'cliente':
+                nova_sessao = sessao_cliente(headers)
+            elif modo == 'http':
+                porta = porta_livre()
+                servidor = iniciar_servidor(pasta, porta, args.http_workers, args.http_threads)
+                nova_sessao = sessao_http(porta, headers)
+            else:
+                parser.error(f'modo desconhecido: {modo}')
+
+            for metodo, url, corpo in lista:
+                # Aquecimento: conexões, caches de planos e snapshots dos relatórios
+                medir(nova_sessao, metodo, url, corpo, 1, 2)
+                for nivel in niveis:
+                    chave = f'{modo} c={nivel} {metodo} {url}'
+                    resultados[chave] = medir(nova_sessao, metodo, url, corpo, nivel, args.requisicoes)
+
+            if servidor is not None:
+                servidor.terminate()
+                servidor.wait(timeout=30)
+                servidor = None
+        backend.db_pool.close_all()
+    finally:
+        if servidor is not None:
+            servidor.kill()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            salva = json.load(f)
+        if salva.get('escala') == escala:
+            baseline = salva['resultados']
+        else:
+            print(f"⚠️  {args.baseline} foi gerada com outra escala ({salva.get('escala')}); sem comparação\n")
+    variacoes, regressoes = comparar(resultados, baseline, args.percentil, args.orcamento, args.tolerancia_ms)
+
+    largura = max(len(chave) for chave in resultados)
+    print(f"{'cenário':<{largura}}{'req/s':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'vs base':>9}")
+    for chave, r in resultados.items():
+        variacao = f'{variacoes[chave]:+.0f}%' if chave in variacoes else '-'
+        marca = ' ❌' if chave in regressoes or r['erros'] else ''
+        print(f"{chave:<{largura}}{r['vazao']:>10.1f}{r['p50']:>10.2f}{r['p95']:>10.2f}{r['p99']:>10.2f}"
+              f"{variacao:>9}{marca}")
+
+    com_erro = [chave for chave, r in resultados.items() if r['erros']]
+    print()
+    for chave in com_erro:
+        print(f"❌ {chave}: {resultados[chave]['erros']} erros (status {resultados[chave]['status_erro']})")
+    for chave in regressoes:
+        print(f"❌ {chave}: {args.percentil} {variacoes[chave]:+.0f}% (orçamento {args.orcamento:.0f}%)")
+
+    if args.salvar:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'gerado_em': datetime.now().isoformat(timespec='seconds'), 'escala': escala,
+                       'resultados': resultados}, f, indent=2, ensure_ascii=False, sort_keys=True)
+        print(f"💾 Linha de base gravada em {args.baseline}")
+
+    if com_erro or regressoes:
+        sys.exit(1)
+    print(f"✅ {len(resultados)} medições dentro do orçamento" if baseline else f"✅ {len(resultados)} medições")
+
+if __name__ == '__main__':
+    main()
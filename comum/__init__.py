@@ -0,0 +1 @@
+"""Código compartilhado pelas APIs (app.py, backend/app.py e api/app.py)"""
@@ -0,0 +1,171 @@
+"""
+Pool de conexões SQLite usado pelas APIs
+
+Cada conexão sai do pool já configurada (WAL, busy_timeout, chaves
+estrangeiras, cache de páginas); dentro de uma requisição a mesma conexão é
+reaproveitada e devolvida ao pool no teardown registrado por init_app.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import weakref
+
+from flask import g, has_app_context, jsonify
+
+# Pool de conexões SQLite (ajustável por variáveis de ambiente)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))
+# Valor negativo = tamanho em KiB (padrão: ~16 MB de cache de páginas por conexão)
+DB_CACHE_SIZE = int(os.environ.get('DB_CACHE_SIZE', -16000))
+
+class PoolExhausted(RuntimeError):
+    """Nenhuma conexão livre no pool dentro de DB_POOL_TIMEOUT (respondido com 503)"""
+
+class PooledConnection(sqlite3.Connection):
+    """Conexão do pool: close() devolve a conexão em vez de fechar o arquivo"""
+    pool = None
+    generation = 0
+    in_pool = False
+
+    def start_request(self):
+        """Chamado quando a conexão passa a atender uma requisição"""
+
+    def close(self):
+        if self.pool is None:
+            return super().close()
+        # Dentro de uma requisição quem devolve a conexão é o teardown
+        if has_app_context() and g.get('db') is self:
+            if self.in_transaction:
+                self.rollback()
+            return
+        self.pool.release(self)
+
+    def discard(self):
+        super().close()
+
+class ConnectionPool:
+    """Conexões SQLite pré-configuradas, reaproveitadas entre requisições e threads"""
+    connection_class = PooledConnection
+
+    def __init__(self, database, size):
+        self.database = database
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._generation = 0
+        _pools.add(self)
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.database,
+            timeout=DB_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            factory=self.connection_class,
+            cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute(f'PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}')
+        conn.execute('PRAGMA foreign_keys = ON')
+        conn.execute(f'PRAGMA cache_size = {DB_CACHE_SIZE}')
+        conn.pool = self
+        conn.generation = self._generation
+        return conn
+
+    def acquire(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            try:
+                conn = self._idle.get(timeout=DB_POOL_TIMEOUT)
+            except queue.Empty:
+                raise PoolExhausted('Pool de conexões esgotado. Tente novamente em instantes.')
+        conn.in_pool = False
+        return conn
+
+    def release(self, conn):
+        if conn.in_pool:
+            return
+        if conn.generation != self._generation:
+            conn.discard()
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        conn.in_pool = True
+        self._idle.put(conn)
+
+    def reset_after_fork(self):
+        """No processo filho: abandona as conexões herdadas do pai sem usá-las nem fechá-las"""
+        _inherited_connections.extend(self._idle.queue)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._generation += 1
+
+    def close_all(self):
+        """Fecha as conexões ociosas; as que estão em uso são fechadas ao serem devolvidas"""
+        with self._lock:
+            self._generation += 1
+            self._created = 0
+        while True:
+            try:
+                self._idle.get_nowait().discard()
+            except queue.Empty:
+                break
+
+# Uma conexão SQLite não pode ser usada (nem fechada) em outro processo após um fork:
+# os filhos mantêm as herdadas aqui e abrem conexões próprias
+_pools = weakref.WeakSet()
+_inherited_connections = []
+
+def _reset_pools_after_fork():
+    for pool in list(_pools):
+        pool.reset_after_fork()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+def request_connection(pool):
+    """Uma conexão por requisição, devolvida ao pool no teardown; fora de uma, uma conexão do pool"""
+    if not has_app_context():
+        return pool.acquire()
+    if 'db' not in g:
+        g.db = pool.acquire()
+        g.db.start_request()
+    return g.db
+
+def init_app(app):
+    """Registra em `app` a devolução da conexão da requisição e as respostas de erro do banco"""
+
+    @app.teardown_appcontext
+    def release_db(exception):
+        conn = g.pop('db', None)
+        if conn is not None:
+            conn.pool.release(conn)
+
+    @app.errorhandler(sqlite3.IntegrityError)
+    def handle_integrity_error(e):
+        # Com foreign_keys ativo, exclusões de registros com dependentes são recusadas
+        return jsonify({'error': f'Operação viola a integridade dos dados: {e}'}), 400
+
+    @app.errorhandler(PoolExhausted)
+    def handle_pool_exhausted(e):
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = '1'
+        return response, 503
@@ -0,0 +1,85 @@
+"""
+Compressão das respostas da API (gzip, ou brotli se instalado)
+
+Respostas de texto/JSON a partir de COMPRESS_MIN_SIZE bytes são comprimidas
+conforme o Accept-Encoding; respostas em streaming, bloco a bloco.
+"""
+
+import os
+import zlib
+
+from flask import request
+
+# Brotli é opcional (pip install brotli); sem ele as respostas usam gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Respostas menores que COMPRESS_MIN_SIZE bytes são enviadas sem compressão
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))  # gzip: 1 a 9
+COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))  # brotli: 0 a 11
+COMPRESS_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/csv', 'text/plain'}
+
+def choose_encoding(accept_encodings):
+    """Escolhe entre br e gzip conforme o Accept-Encoding do cliente"""
+    escolhida, melhor = None, 0
+    for encoding in ('br', 'gzip'):
+        if encoding == 'br' and brotli is None:
+            continue
+        qualidade = accept_encodings.quality(encoding)
+        if qualidade > melhor:
+            escolhida, melhor = encoding, qualidade
+    return escolhida
+
+def make_compressor(encoding):
+    """Retorna (comprimir, finalizar) para compressão incremental"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)  # 31 = formato gzip
+    return compressor.compress, compressor.flush
+
+def compress_response(response):
+    if (request.method == 'HEAD' or response.status_code in (204, 206, 304)
+            or response.direct_passthrough or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    comprimir, finalizar = make_compressor(encoding)
+    
+    if response.is_streamed:
+        # Respostas em streaming são comprimidas bloco a bloco
+        original = response.response
+        blocos = response.iter_encoded()
+        
+        def generate():
+            try:
+                for bloco in blocos:
+                    dados = comprimir(bloco)
+                    if dados:
+                        yield dados
+                yield finalizar()
+            finally:
+                if hasattr(original, 'close'):
+                    original.close()
+        
+        response.response = generate()
+        response.headers.pop('Content-Length', None)
+    else:
+        dados = response.get_data()
+        if len(dados) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(comprimir(dados) + finalizar())
+    
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+def init_app(app):
+    """Registra a compressão como after_request de `app`"""
+    app.after_request(compress_response)
@@ -0,0 +1,33 @@
+"""
+Filtros de período da query string, com as mesmas regras nas APIs
+
+`mes`/`ano` viram um intervalo de datas ISO comparável direto com a coluna,
+o que permite que o SQLite use o índice da data.
+"""
+
+from flask import request
+
+def month_range(mes, ano):
+    """Intervalo [início, fim) de um mês em texto ISO.
+
+    Comparar a coluna diretamente com o intervalo (em vez de strftime(coluna))
+    permite que o SQLite use o índice da data.
+    """
+    inicio = f'{ano:04d}-{mes:02d}-01'
+    fim = f'{ano + mes // 12:04d}-{mes % 12 + 1:02d}-01'
+    return inicio, fim
+
+def month_args():
+    """Filtro mes/ano da query string: o intervalo do mês, ou None sem os dois parâmetros.
+
+    Levanta ValueError (com a mensagem para o cliente) se forem inválidos.
+    """
+    if not request.args.get('mes') or not request.args.get('ano'):
+        return None
+    mes = request.args.get('mes', type=int)
+    ano = request.args.get('ano', type=int)
+    if mes is None or ano is None:
+        raise ValueError('Parâmetros mes e ano devem ser números inteiros')
+    if not 1 <= mes <= 12 or not 1 <= ano <= 9999:
+        raise ValueError('Parâmetro mes deve estar entre 1 e 12 e ano entre 1 e 9999')
+    return month_range(mes, ano)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Script para gerar a versão de produção dos arquivos estáticos
+
+Copia css/ e js/ para dist/ com o hash do conteúdo no nome (ex.:
+css/styles.3f9a2c1b04.css), gera as versões pré-comprimidas .gz e .br,
+reescreve as referências das páginas HTML e grava dist/manifest.json.
+Arquivos que não mudaram desde a última execução são pulados.
+
+Uso: python gerar-assets.py [--saida dist] [--forcar]
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+
+# Brotli é opcional (pip install brotli); sem ele só são geradas as versões .gz
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PASTAS_ASSETS = ['css', 'js']
+TAMANHO_HASH = 10
+MANIFESTO = 'manifest.json'
+
+# href="css/x.css" / src="./js/x.js?v=2" -> caminho do asset (sem ./ e sem query)
+REFERENCIA_RE = re.compile(r'''(\b(?:href|src)=)(["'])(?:\./)?((?:css|js)/[^"'?#]+)(?:[?#][^"']*)?\2''')
+
+def nome_com_hash(caminho, digest):
+    base, extensao = os.path.splitext(caminho)
+    return f"{base}.{digest[:TAMANHO_HASH]}{extensao}"
+
+def gravar(destino, dados):
+    """Grava o arquivo e as versões .gz/.br ao lado dele"""
+    os.makedirs(os.path.dirname(destino) or '.', exist_ok=True)
+    with open(destino, 'wb') as f:
+        f.write(dados)
+    with open(destino + '.gz', 'wb') as f:
+        f.write(gzip.compress(dados, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(destino + '.br', 'wb') as f:
+            f.write(brotli.compress(dados, quality=11))
+
+def saidas_existem(destino):
+    sufixos = ['', '.gz'] + (['.br'] if brotli is not None else [])
+    return all(os.path.exists(destino + sufixo) for sufixo in sufixos)
+
+def carregar_manifesto(saida):
+    try:
+        with open(os.path.join(saida, MANIFESTO), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'assets': {}, 'paginas': {}}
+
+def processar_asset(origem, saida, anterior, forcar):
+    """Gera a cópia com hash de um asset; retorna (entrada do manifesto, se foi regravado)"""
+    stat = os.stat(origem)
+    if (not forcar and anterior and anterior['mtime_ns'] == stat.st_mtime_ns
+            and anterior['tamanho'] == stat.st_size
+            and saidas_existem(os.path.join(saida, anterior['arquivo']))):
+        return anterior, False
+
+    with open(origem, 'rb') as f:
+        dados = f.read()
+    digest = hashlib.sha256(dados).hexdigest()
+    arquivo = nome_com_hash(origem, digest).replace(os.sep, '/')
+    entrada = {'arquivo': arquivo, 'hash': digest, 'mtime_ns': stat.st_mtime_ns, 'tamanho': stat.st_size}
+
+    destino = os.path.join(saida, arquivo)
+    if not forcar and anterior and anterior['hash'] == digest and saidas_existem(destino):
+        return entrada, False  # Só a data mudou
+    gravar(destino, dados)
+    return entrada, True
+
+def reescrever_referencias(conteudo, assets):
+    """Troca as referências a css/ e js/ pelos nomes com hash"""
+    def substituir(match):
+        atributo, aspas, caminho = match.groups()
+        entrada = assets.get(caminho)
+        if entrada is None:
+            return match.group(0)
+        return f"{atributo}{aspas}{entrada['arquivo']}{aspas}"
+    return REFERENCIA_RE.sub(substituir, conteudo)
+
+def processar_pagina(pagina, saida, assets, forcar):
+    """Gera a página com as referências reescritas; retorna True se ela mudou"""
+    with open(pagina, 'r', encoding='utf-8', newline='') as f:
+        conteudo = reescrever_referencias(f.read(), assets).encode('utf-8')
+
+    destino = os.path.join(saida, pagina)
+    if not forcar and saidas_existem(destino):
+        with open(destino, 'rb') as f:
+            if f.read() == conteudo:
+                return False
+    gravar(destino, conteudo)
+    return True
+
+def remover_obsoletos(saida, assets):
+    """Apaga as cópias com hash que não estão mais no manifesto"""
+    atuais = {entrada['arquivo'] for entrada in assets.values()}
+    removidos = 0
+    for pasta in PASTAS_ASSETS:
+        for caminho in glob.glob(os.path.join(saida, pasta, '**', '*'), recursive=True):
+            relativo = os.path.relpath(caminho, saida).replace(os.sep, '/')
+            original = re.sub(r'\.(gz|br)$', '', relativo)
+            if os.path.isfile(caminho) and original not in atuais:
+                os.remove(caminho)
+                removidos += 1
+    return removidos
+
+def gerar(saida='dist', forcar=False):
+    manifesto = carregar_manifesto(saida)
+    assets = {}
+    gerados = 0
+
+    for pasta in PASTAS_ASSETS:
+        for origem in sorted(glob.glob(os.path.join(pasta, '**', '*.*'), recursive=True)):
+            if not os.path.isfile(origem):
+                continue
+            chave = origem.replace(os.sep, '/')
+            entrada, gerado = processar_asset(origem, saida, manifesto['assets'].get(chave), forcar)
+            assets[chave] = entrada
+            gerados += gerado
+
+    paginas = sorted(glob.glob('*.html'))
+    paginas_geradas = sum(processar_pagina(pagina, saida, assets, forcar) for pagina in paginas)
+    removidos = remover_obsoletos(saida, assets)
+
+    with open(os.path.join(saida, MANIFESTO), 'w', encoding='utf-8') as f:
+        json.dump({'assets': assets, 'paginas': paginas}, f, indent=2, sort_keys=True)
+
+    return {
+        'assets': len(assets), 'assets_gerados': gerados,
+        'paginas': len(paginas), 'paginas_geradas': paginas_geradas,
+        'removidos': removidos
+    }
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--saida', default='dist', help='pasta de saída (padrão: dist)')
+    parser.add_argument('--forcar', action='store_true', help='regera tudo, ignorando o manifesto')
+    args = parser.parse_args()
+
+    print("📦 Gerando arquivos estáticos de produção...")
+    if brotli is None:
+        print("⚠️  brotli não instalado (pip install brotli): gerando apenas .gz")
+    print()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    resultado = gerar(args.saida, args.forcar)
+
+    print(f"✅ Assets: {resultado['assets_gerados']}/{resultado['assets']} regerados")
+    print(f"✅ Páginas: {resultado['paginas_geradas']}/{resultado['paginas']} regeradas")
+    if resultado['removidos']:
+        print(f"🧹 {resultado['removidos']} arquivos obsoletos removidos")
+    print(f"📋 Manifesto: {os.path.join(args.saida, MANIFESTO)}")
+
+if __name__ == "__main__":
+    main()
@@ -5,4 +5,5 @@ echo ""
 echo "Iniciando sistema integrado..."
 echo ""
 
-python3 app.py
\ No newline at end of file
+# ./iniciar.sh --producao sobe a API em vários processos (gunicorn)
+python3 app.py "$@"
\ No newline at end of file
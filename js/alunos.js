@@ -6,7 +6,7 @@ let turmas = []
 async function loadAlunos(search = "") {
   try {
     const url = search ? `${API_URL}/alunos?search=${encodeURIComponent(search)}` : `${API_URL}/alunos`
-    const response = await fetch(url)
+    const response = await authManager.fetchWithAuth(url)
     
     if (!response.ok) {
       throw new Error('Erro ao carregar alunos');
@@ -29,7 +29,7 @@ async function loadAlunos(search = "") {
 // Carregar turmas
 async function loadTurmas() {
   try {
-    const response = await fetch(`${API_URL}/turmas`)
+    const response = await authManager.fetchWithAuth(`${API_URL}/turmas`)
     
     if (!response.ok) {
       throw new Error('Erro ao carregar turmas');
@@ -14,8 +14,7 @@ class AuthManager {
         if (!user) return {};
         
         return {
-            'X-User-Id': user.id || '',
-            'X-User-Cargo': user.role || user.cargo || '',
+            'Authorization': user.token ? `Bearer ${user.token}` : '',
             'Content-Type': 'application/json'
         };
     }
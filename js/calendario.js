@@ -23,7 +23,7 @@ class Calendar {
     
     async loadTurmas() {
         try {
-            const response = await fetch('http://localhost:5000/api/turmas');
+            const response = await authManager.fetchWithAuth('http://localhost:5000/api/turmas');
             this.turmas = await response.json();
             this.populateTurmasSelect();
         } catch (error) {
@@ -138,6 +138,7 @@ class DatabaseIntegration {
                 ...options,
                 headers: {
                     'Content-Type': 'application/json',
+                    ...(typeof authManager !== 'undefined' && authManager ? authManager.getAuthHeaders() : {}),
                     ...options.headers
                 }
             });
@@ -209,7 +209,8 @@ class LoginManager {
                     email: result.email,
                     cargo: result.cargo,
                     role: result.cargo,  // Adicionar role também
-                    permissions: this.getPermissionsByRole(result.cargo)
+                    permissions: this.getPermissionsByRole(result.cargo),
+                    token: result.token  // Token assinado enviado no header Authorization
                 };
                 
                 // Salvar dados completos do usuário no localStorage
@@ -258,6 +259,7 @@ class LoginManager {
             role: user.cargo,
             cargo: user.cargo,
             permissions: user.permissions,
+            token: user.token,
             loginTime: Date.now(),
             remember: remember
         };
@@ -39,7 +39,7 @@ class NotasManager {
 
     async loadNotas() {
         try {
-            const response = await fetch(`${this.API_URL}/notas`);
+            const response = await authManager.fetchWithAuth(`${this.API_URL}/notas`);
             if (response.ok) {
                 this.notas = await response.json();
             } else {
@@ -72,7 +72,7 @@ class NotasManager {
 
     async loadTurmas() {
         try {
-            const response = await fetch(`${this.API_URL}/turmas`);
+            const response = await authManager.fetchWithAuth(`${this.API_URL}/turmas`);
             this.turmas = await response.json();
             console.log('Turmas carregadas:', this.turmas.length);
         } catch (error) {
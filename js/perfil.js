@@ -131,8 +131,7 @@ async function updatePerfil() {
             method: 'PUT',
             headers: {
                 'Content-Type': 'application/json',
-                'X-User-Id': currentUser.id,
-                'X-User-Cargo': currentUser.cargo
+                'Authorization': `Bearer ${currentUser.token}`
             },
             body: JSON.stringify({
                 nome: nome,
@@ -195,8 +194,7 @@ async function updateSenha() {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
-                'X-User-Id': currentUser.id,
-                'X-User-Cargo': currentUser.cargo
+                'Authorization': `Bearer ${currentUser.token}`
             },
             body: JSON.stringify({
                 currentPassword: senhaAtual,
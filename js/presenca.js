@@ -7,7 +7,7 @@ let currentData = null
 // Carregar turmas
 async function loadTurmas() {
     try {
-        const response = await fetch(`${API_URL}/turmas`)
+        const response = await authManager.fetchWithAuth(`${API_URL}/turmas`)
         turmas = await response.json()
         populateTurmasSelect()
     } catch (error) {
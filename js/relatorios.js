@@ -35,10 +35,10 @@ class RelatoriosManager {
         try {
             // Carregar dados das APIs reais
             const [notasRes, frequenciaRes, matriculasRes, turmasRes, statsRes] = await Promise.all([
-                fetch(`${this.API_URL}/notas`).catch(() => ({ ok: false })),
-                fetch(`${this.API_URL}/frequencia`).catch(() => ({ ok: false })),
+                authManager.fetchWithAuth(`${this.API_URL}/notas`).catch(() => ({ ok: false })),
+                authManager.fetchWithAuth(`${this.API_URL}/frequencia`).catch(() => ({ ok: false })),
                 fetch(`${this.API_URL}/matriculas`).catch(() => ({ ok: false })),
-                fetch(`${this.API_URL}/turmas`).catch(() => ({ ok: false })),
+                authManager.fetchWithAuth(`${this.API_URL}/turmas`).catch(() => ({ ok: false })),
                 fetch(`${this.API_URL}/relatorios/estatisticas`).catch(() => ({ ok: false }))
             ]);
 
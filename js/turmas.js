@@ -33,8 +33,8 @@ class TurmasManager {
     async loadData() {
         try {
             const [turmasRes, alunosRes, professoresRes] = await Promise.all([
-                fetch(`${API_URL}/turmas`),
-                fetch(`${API_URL}/alunos`),
+                authManager.fetchWithAuth(`${API_URL}/turmas`),
+                authManager.fetchWithAuth(`${API_URL}/alunos`),
                 fetch(`${API_URL}/professores`)
             ]);
 
@@ -248,7 +248,7 @@ class TurmasManager {
 
             // Buscar alunos que não estão matriculados na turma atual
             const [alunosRes, matriculasRes] = await Promise.all([
-                fetch(`${API_URL}/alunos`),
+                authManager.fetchWithAuth(`${API_URL}/alunos`),
                 fetch(`${API_URL}/matriculas`)
             ]);
 
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Script para corrigir e atualizar as páginas HTML em uma única passada
+
+Substitui corrigir-css.py e adicionar-banco-local.py. Cada página é lida e
+analisada uma vez; as transformações registradas com @transformacao marcam
+edições sobre o texto original, aplicadas juntas no final. Páginas cujo
+conteúdo não mudou desde a última execução são puladas e o trabalho é
+dividido entre vários processos.
+
+Uso: python reescrever-html.py [paginas ...] [--verificar] [--processos N]
+                               [--transformacoes a,b] [--forcar]
+  --verificar  apenas informa o que mudaria (código de saída 1 se algo mudar)
+"""
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+CACHE = '.reescrever-html.cache.json'
+# Incrementar ao mudar o comportamento de uma transformação (invalida o cache)
+VERSAO_TRANSFORMACOES = 1
+
+# ============ ANÁLISE DA PÁGINA ============
+
+class Tag:
+    def __init__(self, nome, attrs, inicio, fim):
+        self.nome = nome
+        self.attrs = attrs
+        self.inicio = inicio
+        self.fim = fim
+
+class ColetorTags(HTMLParser):
+    """Registra a posição das tags de abertura e de fechamento da página"""
+
+    def __init__(self, conteudo):
+        super().__init__(convert_charrefs=False)
+        self.conteudo = conteudo
+        self.linhas = [0] + [m.end() for m in re.finditer(r'\n', conteudo)]
+        self.tags = []
+        self.fechamentos = []
+
+    def posicao(self):
+        linha, coluna = self.getpos()
+        return self.linhas[linha - 1] + coluna
+
+    def handle_starttag(self, nome, attrs):
+        inicio = self.posicao()
+        texto = self.get_starttag_text() or ''
+        self.tags.append(Tag(nome, dict(attrs), inicio, inicio + len(texto)))
+
+    def handle_startendtag(self, nome, attrs):
+        self.handle_starttag(nome, attrs)
+
+    def handle_endtag(self, nome):
+        self.fechamentos.append(Tag(nome, {}, self.posicao(), self.posicao()))
+
+class Pagina:
+    """Conteúdo de uma página, suas tags e as edições pedidas pelas transformações"""
+
+    def __init__(self, caminho, conteudo):
+        self.caminho = caminho
+        self.conteudo = conteudo
+        coletor = ColetorTags(conteudo)
+        coletor.feed(conteudo)
+        coletor.close()
+        self.tags = coletor.tags
+        self.fechamentos = coletor.fechamentos
+        self.edicoes = []
+
+    def substituir(self, inicio, fim, texto, origem):
+        self.edicoes.append((inicio, fim, texto, origem))
+
+    def inserir(self, posicao, texto, origem):
+        self.substituir(posicao, posicao, texto, origem)
+
+    def remover_tag(self, tag, origem):
+        # Remove também os espaços e a quebra de linha que seguem a tag
+        fim = tag.fim
+        while fim < len(self.conteudo) and self.conteudo[fim] in ' \t\r\n':
+            fim += 1
+        self.substituir(tag.inicio, fim, '', origem)
+
+    def resultado(self):
+        """Aplica as edições; retorna (novo conteúdo, transformações que mudaram algo)"""
+        partes = []
+        aplicadas = []
+        posicao = 0
+        for inicio, fim, texto, origem in sorted(self.edicoes, key=lambda e: (e[0], e[1])):
+            if inicio < posicao or self.conteudo[inicio:fim] == texto:
+                continue  # Edição sobreposta a outra já aplicada ou sem efeito
+            partes.append(self.conteudo[posicao:inicio])
+            partes.append(texto)
+            posicao = fim
+            if origem not in aplicadas:
+                aplicadas.append(origem)
+        partes.append(self.conteudo[posicao:])
+        return ''.join(partes), aplicadas
+
+# ============ TRANSFORMAÇÕES ============
+
+TRANSFORMACOES = []
+
+def transformacao(nome, paginas=None):
+    """Registra uma transformação; `paginas` restringe a padrões de nome (fnmatch)"""
+    def decorator(f):
+        TRANSFORMACOES.append((nome, paginas, f))
+        return f
+    return decorator
+
+@transformacao('quebras-literais')
+def remover_quebras_literais(pagina):
+    # Sequências `n deixadas por scripts do PowerShell no meio do HTML
+    for match in re.finditer(r'`n\s*', pagina.conteudo):
+        pagina.substituir(match.start(), match.end(), '\n    ', 'quebras-literais')
+
+@transformacao('css-duplicado')
+def remover_css_duplicado(pagina):
+    # Mantém apenas a primeira referência a cada folha de estilo
+    vistas = set()
+    for tag in pagina.tags:
+        if tag.nome != 'link' or (tag.attrs.get('rel') or '').lower() != 'stylesheet':
+            continue
+        href = tag.attrs.get('href')
+        if href in vistas:
+            pagina.remover_tag(tag, 'css-duplicado')
+        vistas.add(href)
+
+@transformacao('banco-local', paginas=[
+    'professores.html', 'turmas.html', 'notas.html', 'presenca.html', 'calendario.html',
+    'relatorios.html', 'perfil.html', 'usuarios.html', 'cadastro.html', 'selecao-tipo.html'
+])
+def adicionar_banco_local(pagina):
+    scripts = [tag for tag in pagina.tags if tag.nome == 'script']
+    if any((tag.attrs.get('src') or '').endswith('local-database.js') for tag in scripts):
+        return
+
+    # Antes do primeiro script de js/, senão do primeiro script, senão de </body>
+    alvo = next((tag for tag in scripts if (tag.attrs.get('src') or '').startswith('js/')), None)
+    alvo = alvo or (scripts[0] if scripts else None)
+    alvo = alvo or next((tag for tag in pagina.fechamentos if tag.nome == 'body'), None)
+    if alvo is None:
+        return
+
+    # Insere no início da linha da tag, preservando o recuo dela
+    inicio_linha = pagina.conteudo.rfind('\n', 0, alvo.inicio) + 1
+    if pagina.conteudo[inicio_linha:alvo.inicio].strip():
+        inicio_linha = alvo.inicio
+    nova_linha = '\r\n' if '\r\n' in pagina.conteudo else '\n'
+    script = ['    <!-- Sistema de Banco Local -->', '    <script src="js/local-database.js"></script>', '    ', '']
+    pagina.inserir(inicio_linha, nova_linha.join(script), 'banco-local')
+
+# ============ PROCESSAMENTO ============
+
+def assinatura(nomes):
+    return f"{VERSAO_TRANSFORMACOES}:{','.join(nomes)}"
+
+def processar(caminho, nomes, verificar):
+    """Aplica as transformações a uma página (executado nos processos do pool).
+
+    Retorna (caminho, hash do conteúdo final, transformações que mudaram algo).
+    """
+    with open(caminho, 'r', encoding='utf-8', newline='') as f:
+        conteudo = f.read()
+
+    pagina = Pagina(caminho, conteudo)
+    nome_arquivo = os.path.basename(caminho)
+    for nome, paginas, f in TRANSFORMACOES:
+        if nome in nomes and (paginas is None or any(fnmatch.fnmatch(nome_arquivo, p) for p in paginas)):
+            f(pagina)
+    novo, aplicadas = pagina.resultado()
+
+    if novo != conteudo and not verificar:
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8', newline='') as f:
+            f.write(novo)
+        os.replace(temporario, caminho)
+
+    return caminho, hashlib.sha256(novo.encode('utf-8')).hexdigest(), aplicadas if novo != conteudo else []
+
+def carregar_cache():
+    try:
+        with open(CACHE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def pendentes(caminhos, cache, chave, forcar):
+    """Páginas que precisam ser processadas: as que mudaram desde a última execução"""
+    resultado = []
+    for caminho in caminhos:
+        anterior = cache.get(caminho)
+        if forcar or not anterior or anterior['assinatura'] != chave:
+            resultado.append(caminho)
+            continue
+        stat = os.stat(caminho)
+        if [stat.st_mtime_ns, stat.st_size] == anterior['stat']:
+            continue
+        with open(caminho, 'rb') as f:
+            if hashlib.sha256(f.read()).hexdigest() != anterior['hash']:
+                resultado.append(caminho)
+            else:
+                anterior['stat'] = [stat.st_mtime_ns, stat.st_size]
+    return resultado
+
+def main():
+    """Função principal"""
+    nomes_disponiveis = [nome for nome, _, _ in TRANSFORMACOES]
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paginas', nargs='*', help='arquivos ou padrões (padrão: *.html)')
+    parser.add_argument('--verificar', action='store_true', help='não grava, apenas informa o que mudaria')
+    parser.add_argument('--processos', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--transformacoes', default=','.join(nomes_disponiveis),
+                        help=f"lista separada por vírgulas (disponíveis: {', '.join(nomes_disponiveis)})")
+    parser.add_argument('--forcar', action='store_true', help='ignora o cache e processa todas as páginas')
+    args = parser.parse_args()
+
+    nomes = [nome.strip() for nome in args.transformacoes.split(',') if nome.strip()]
+    desconhecidas = [nome for nome in nomes if nome not in nomes_disponiveis]
+    if desconhecidas:
+        parser.error(f"transformação desconhecida: {', '.join(desconhecidas)}")
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    caminhos = sorted({c for padrao in (args.paginas or ['*.html']) for c in glob.glob(padrao) if os.path.isfile(c)})
+
+    print("🔧 Verificando páginas HTML..." if args.verificar else "🔧 Atualizando páginas HTML...")
+    print()
+
+    cache = carregar_cache()
+    chave = assinatura(nomes)
+    fila = pendentes(caminhos, cache, chave, args.forcar)
+
+    if args.processos > 1 and len(fila) > 1:
+        with ProcessPoolExecutor(max_workers=args.processos) as pool:
+            resultados = list(pool.map(
+                processar, fila, [nomes] * len(fila), [args.verificar] * len(fila),
+                chunksize=max(1, len(fila) // (args.processos * 4))
+            ))
+    else:
+        resultados = [processar(caminho, nomes, args.verificar) for caminho in fila]
+
+    alteradas = [(caminho, aplicadas) for caminho, _, aplicadas in resultados if aplicadas]
+    for caminho, aplicadas in alteradas:
+        simbolo = "📝" if args.verificar else "✅"
+        print(f"{simbolo} {caminho}: {', '.join(aplicadas)}")
+
+    if not args.verificar:
+        for caminho, digest, _ in resultados:
+            stat = os.stat(caminho)
+            cache[caminho] = {'assinatura': chave, 'hash': digest, 'stat': [stat.st_mtime_ns, stat.st_size]}
+        with open(CACHE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+
+    print()
+    verbo = "mudariam" if args.verificar else "alteradas"
+    print(f"📊 Resultado: {len(alteradas)} {verbo}, {len(fila)} analisadas, "
+          f"{len(caminhos) - len(fila)} sem mudanças desde a última execução")
+
+    if args.verificar and alteradas:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
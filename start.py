@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
 Script simples para iniciar o Sistema de Gestão Escolar
+
+Uso: python start.py [--producao]
+  --producao  API em vários processos com threads (gunicorn), em vez do
+              servidor de desenvolvimento do Flask
 """
 
 import os
@@ -12,6 +16,7 @@ from pathlib import Path
 
 def main():
     print("🎓 Iniciando Sistema de Gestão Escolar...")
+    producao = '--producao' in sys.argv
     
     base_dir = Path(__file__).parent
     backend_dir = base_dir / "backend"
@@ -35,7 +40,11 @@ def main():
     
     # Iniciar backend
     os.chdir(backend_dir)
-    backend = subprocess.Popen([sys.executable, "app.py"])
+    if producao:
+        print("🏭 Modo de produção: vários processos (ver SERVER_* no backend/README.md)")
+        backend = subprocess.Popen([sys.executable, "app.py", "serve"])
+    else:
+        backend = subprocess.Popen([sys.executable, "app.py"])
     
     # Aguardar backend iniciar
     time.sleep(3)